@@ -0,0 +1,110 @@
+"""Benchmark a full configure_app run against the fake APIs.
+
+Starts benchmarks.fake_server in a subprocess with a synthetic org, runs
+the CLI against it in this process and reports repos per second, the
+requests served by endpoint and peak memory. Arguments after `--` are
+passed on to the CLI:
+
+    python -m benchmarks.bench_configure --repos 10000 --latency 0.01 \\
+        -- --concurrency 32 --prefetch-repos
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+from dependabot_access.access import configure_app
+
+
+def parse_arguments(args=None):
+    argument_parser = argparse.ArgumentParser('bench_configure')
+    argument_parser.add_argument('--org', default='fake-org')
+    argument_parser.add_argument('--repos', type=int, default=1000)
+    argument_parser.add_argument('--latency', type=float, default=0)
+    argument_parser.add_argument('--error-rate', type=float, default=0)
+    argument_parser.add_argument('--rate-limit', type=int)
+    argument_parser.add_argument('--tracemalloc', action='store_true')
+    argument_parser.add_argument('cli_args', nargs='*')
+    return argument_parser.parse_args(args)
+
+
+def start_server(arguments):
+    command = [
+        sys.executable, '-m', 'benchmarks.fake_server', '--port', '0',
+        '--org', arguments.org, '--repos', str(arguments.repos),
+        '--latency', str(arguments.latency),
+        '--error-rate', str(arguments.error_rate)
+    ]
+    if arguments.rate_limit is not None:
+        command += ['--rate-limit', str(arguments.rate_limit)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    return server, server.stdout.readline().strip()
+
+
+def write_access(path, repo_count):
+    names = [f'repo-{index:06d}' for index in range(repo_count)]
+    with open(path, 'w') as f:
+        json.dump([
+            {'apps': {'dependabot': True}, 'repos': [
+                name for index, name in enumerate(names) if index % 10
+            ]},
+            {'apps': {'dependabot': False}, 'repos': names[::10]}
+        ], f)
+
+
+def run(arguments, url, access_path):
+    errors = []
+    start = time.perf_counter()
+    configure_app([
+        '--org', arguments.org, '--access', access_path,
+        '--dependabot-id', '1', '--account-id', '1',
+        '--github-url', url, '--dependabot-url', url,
+        '--retry-backoff', '0.01', *arguments.cli_args
+    ], errors.append)
+    return time.perf_counter() - start, errors
+
+
+def report(arguments, seconds, errors, stats):
+    print(f'repos: {arguments.repos}')
+    print(f'seconds: {seconds:.2f}')
+    print(f'repos/second: {arguments.repos / seconds:.1f}')
+    print(f'errors: {len(errors)}')
+    print(f'requests: {sum(stats["requests"].values())}')
+    for endpoint, count in stats['requests'].items():
+        print(f'  {endpoint}: {count}')
+    print(
+        'peak RSS: '
+        f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MB'
+    )
+    if tracemalloc.is_tracing():
+        peak = tracemalloc.get_traced_memory()[1]
+        print(f'peak traced memory: {peak / 1024 / 1024:.1f}MB')
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+    os.environ.setdefault('GITHUB_TOKEN', 'benchmark')
+    if arguments.tracemalloc:
+        tracemalloc.start()
+    server, url = start_server(arguments)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            access_path = os.path.join(directory, 'access.json')
+            write_access(access_path, arguments.repos)
+            seconds, errors = run(arguments, url, access_path)
+        stats = requests.get(f'{url}/_stats').json()
+    finally:
+        server.terminate()
+        server.wait()
+    report(arguments, seconds, errors, stats)
+
+
+if __name__ == '__main__':
+    main()
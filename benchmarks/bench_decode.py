@@ -0,0 +1,95 @@
+"""Benchmark decoding GitHub repo and contents responses.
+
+Compares decoding through response.json() and keeping the whole body, as
+the tool used to, with dependabot_access.decode, which decodes the raw
+bytes (with orjson when it's installed) and keeps only the fields used:
+
+    python -m benchmarks.bench_decode
+"""
+import json
+import time
+
+import requests
+
+from dependabot_access import decode
+from dependabot_access.repository import repository_from_json
+
+ROUNDS = 20000
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = None
+    response._content = json.dumps(body).encode()
+    return response
+
+
+def make_repo_body():
+    return {
+        'id': 1000,
+        'name': 'repo-000001',
+        'full_name': 'fake-org/repo-000001',
+        'private': True,
+        'owner': {'login': 'fake-org', 'id': 1, 'type': 'Organization'},
+        'description': 'A repository used for benchmarking',
+        'archived': False,
+        'permissions': {'admin': True, 'push': True, 'pull': True},
+        'pushed_at': '2024-01-02T03:04:05Z',
+        'default_branch': 'main',
+        **{
+            f'{key}_url': f'https://api.github.com/repos/fake-org/{key}'
+            for key in ('hooks', 'issues', 'pulls', 'tags', 'teams', 'trees')
+        }
+    }
+
+
+def make_contents_body():
+    return [
+        {
+            'name': name,
+            'path': name,
+            'sha': '0' * 40,
+            'size': 100,
+            'type': 'file',
+            'url': f'https://api.github.com/repos/fake-org/r/contents/{name}',
+            '_links': {'self': 'https://api.github.com/'}
+        }
+        for name in (
+            'package.json', 'package-lock.json', 'README.md', 'Dockerfile',
+            'Makefile', 'setup.py', 'requirements.txt', '.gitignore'
+        )
+    ]
+
+
+def timed(function, response):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        function(response)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f'orjson: {"yes" if decode.orjson is not None else "no"}')
+    cases = [
+        ('repo', make_repo_body(), [
+            ('response.json()', lambda r: repository_from_json(r.json())),
+            ('decode', lambda r: decode.decode_repository(r.content))
+        ]),
+        ('contents', make_contents_body(), [
+            ('response.json()', lambda r: [e['name'] for e in r.json()]),
+            ('decode', lambda r: decode.decode_file_names(r.content))
+        ])
+    ]
+    for label, body, functions in cases:
+        response = make_response(body)
+        for name, function in functions:
+            seconds = timed(function, response)
+            print(
+                f'{label} {name}: {ROUNDS / seconds:,.0f}/s '
+                f'({seconds / ROUNDS * 1e6:.1f}us each)'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Memory benchmark for holding an org's repos in memory.
+
+Compares keeping the GitHub JSON for each repo, a dict of namedtuples
+as the tool used to, and the Inventory column store, reporting the
+construction time (measured separately, as tracing slows allocation
+down) and peak and retained traced memory:
+
+    python -m benchmarks.bench_inventory
+"""
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+
+from dependabot_access.inventory import Inventory
+from dependabot_access.repository import repository_from_json
+
+SIZES = (10000, 100000)
+FILES = ['package.json', 'package-lock.json', 'README.md', 'Dockerfile']
+
+RepositoryTuple = namedtuple(
+    'RepositoryTuple', 'id, name, archived, admin, pushed_at, default_branch'
+)
+
+
+def make_repo_json(index):
+    return {
+        'id': 1000 + index,
+        'name': f'repo-{index:06d}',
+        'full_name': f'fake-org/repo-{index:06d}',
+        'archived': index % 97 == 0,
+        'permissions': {'admin': True, 'push': True, 'pull': True},
+        'pushed_at': time.strftime(
+            '%Y-%m-%dT%H:%M:%SZ', time.gmtime(1600000000 + index * 60)
+        ),
+        'default_branch': 'main' if index % 3 else 'master'
+    }
+
+
+def build_json(size):
+    return {
+        f'repo-{index:06d}': (
+            make_repo_json(index), [{'name': name} for name in FILES]
+        )
+        for index in range(size)
+    }
+
+
+def build_tuples(size):
+    repos = {}
+    contents = {}
+    for index in range(size):
+        repo_json = make_repo_json(index)
+        repos[repo_json['name']] = RepositoryTuple(
+            repo_json['id'], repo_json['name'], repo_json['archived'],
+            repo_json['permissions']['admin'], repo_json['pushed_at'],
+            repo_json['default_branch']
+        )
+        contents[repo_json['name']] = [name for name in FILES]
+    return repos, contents
+
+
+def build_inventory(size):
+    inventory = Inventory()
+    for index in range(size):
+        inventory.add(repository_from_json(make_repo_json(index)), FILES)
+    return inventory
+
+
+def measure(build, size):
+    gc.collect()
+    start = time.perf_counter()
+    build(size)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build(size)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, current, peak
+
+
+def main():
+    for size in SIZES:
+        for name, build in (
+            ('json dicts', build_json),
+            ('namedtuples', build_tuples),
+            ('inventory', build_inventory)
+        ):
+            seconds, current, peak = measure(build, size)
+            print(
+                f'{size} repos, {name}: {seconds:.2f}s, '
+                f'retained {current / 1024 / 1024:.1f}MB, '
+                f'peak {peak / 1024 / 1024:.1f}MB'
+            )
+
+
+if __name__ == '__main__':
+    main()
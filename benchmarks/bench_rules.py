@@ -0,0 +1,53 @@
+"""Micro-benchmark for package manager detection on large listings.
+
+Compares the compiled rule engine with checking each rule against the
+whole listing, as Dependabot.has does.
+
+    GITHUB_TOKEN=x python -m benchmarks.bench_rules
+"""
+import random
+import timeit
+
+from dependabot_access.dependabot import Dependabot
+
+LISTING_SIZE = 10000
+REPEAT = 5
+
+
+def make_listing(size):
+    random.seed(0)
+    extensions = ['.py', '.js', '.md', '.json', '.txt', '.go', '.yml']
+    listing = [
+        {'name': f'file{index}{random.choice(extensions)}'}
+        for index in range(size)
+    ]
+    listing[size // 2] = {'name': 'package.json'}
+    listing[-1] = {'name': 'dependabot-access.gemspec'}
+    return listing
+
+
+def per_rule_scan(dependabot, listing):
+    return {
+        package_manager
+        for package_manager_file, package_manager
+        in dependabot.package_managers_files.items()
+        if dependabot.has(package_manager_file, listing)
+    }
+
+
+def main():
+    dependabot = Dependabot(None, None)
+    listing = make_listing(LISTING_SIZE)
+    for name, function in (
+        ('per rule scan', lambda: per_rule_scan(dependabot, listing)),
+        ('compiled rules', lambda: dependabot.get_package_managers(listing))
+    ):
+        seconds = min(timeit.repeat(function, number=1, repeat=REPEAT))
+        print(
+            f'{name}: {seconds * 1000:.2f}ms for {LISTING_SIZE} entries '
+            f'-> {sorted(function())}'
+        )
+
+
+if __name__ == '__main__':
+    main()
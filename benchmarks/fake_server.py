@@ -0,0 +1,385 @@
+"""Local stand-in for the GitHub and Dependabot APIs the tool calls.
+
+Serves a synthetic org whose repos are generated from their index, with
+optional latency, error rate and rate limit, so runs can be measured
+without touching the real APIs. Both APIs are served from one port:
+
+    python -m benchmarks.fake_server --org fake-org --repos 1000 --port 8080
+
+GET /_stats reports the requests served by endpoint and the resulting
+installations and update configs.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from dependabot_access.metrics import endpoint_template
+
+PUSHED_AT = '2020-01-01T00:00:00Z'
+
+REPO_LAYOUTS = [
+    (['package.json', 'package-lock.json', 'README.md'], 'npm_and_yarn'),
+    (['requirements.txt', 'setup.py', 'README.md'], 'pip'),
+    (['Gemfile', 'Gemfile.lock', 'README.md'], 'bundler'),
+    (['pom.xml', 'README.md'], 'maven'),
+    (['Dockerfile', 'Cargo.toml', 'README.md'], 'cargo'),
+    (['composer.json', 'README.md'], 'composer'),
+    ([], None)
+]
+
+GRAPHQL_REPOSITORY = re.compile(
+    r'(\w+): repository\(owner: ("(?:[^"\\]|\\.)*"), '
+    r'name: ("(?:[^"\\]|\\.)*")\)'
+)
+
+FakeRequest = namedtuple('FakeRequest', 'path, query, body, base_url')
+
+
+class FakeAPI:
+    """State and behaviour of the fake APIs, independent of HTTP."""
+
+    def __init__(
+        self, org, repo_count, latency=0, error_rate=0, rate_limit=None,
+        rate_limit_window=60, seed=0, clock=time.time
+    ):
+        self.org = org
+        self.repo_count = repo_count
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.rate_limit_remaining = 0
+        self.rate_limit_reset = 0
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.installed = {
+            repo_id(index) for index in range(0, repo_count, 3)
+        }
+        self.configs = {
+            config_id: {
+                'repo-id': repo_id(index),
+                'package-manager': REPO_LAYOUTS[index % len(REPO_LAYOUTS)][1],
+                'directory': '/'
+            }
+            for config_id, index in enumerate(range(0, repo_count, 5), 1)
+            if repo_files(index)
+        }
+        self.next_config_id = len(self.configs) + 1
+
+    def handle(self, method, path, body, base_url):
+        if path == '/_stats':
+            return 200, {}, self.stats()
+        time.sleep(self.latency)
+        with self.lock:
+            self.requests[f'{method} {endpoint_template(path)}'] += 1
+        headers, exceeded = self.take_rate_limit()
+        status, extra_headers, data = self.fail(exceeded) or self.route(
+            method, path, body, base_url
+        )
+        return status, dict(headers, **extra_headers), data
+
+    def take_rate_limit(self):
+        if self.rate_limit is None:
+            return {}, False
+        with self.lock:
+            now = self.clock()
+            if now >= self.rate_limit_reset:
+                self.rate_limit_reset = now + self.rate_limit_window
+                self.rate_limit_remaining = self.rate_limit
+            exceeded = self.rate_limit_remaining == 0
+            self.rate_limit_remaining -= not exceeded
+            return {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self.rate_limit_remaining),
+                'X-RateLimit-Reset': str(math.ceil(self.rate_limit_reset))
+            }, exceeded
+
+    def fail(self, exceeded):
+        if exceeded:
+            return 403, {}, {'message': 'API rate limit exceeded'}
+        if self.random.random() < self.error_rate:
+            return 502, {}, {'message': 'Bad Gateway'}
+        return None
+
+    def route(self, method, path, body, base_url):
+        url = urlsplit(path)
+        request = FakeRequest(url.path, parse_qs(url.query), body, base_url)
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                return handler(self, request, **match.groupdict())
+        return 404, {}, {'message': 'Not Found'}
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': dict(sorted(self.requests.items())),
+                'installed': len(self.installed),
+                'configs': len(self.configs)
+            }
+
+    def find_repo(self, org, name):
+        match = re.fullmatch(r'repo-(\d+)', name)
+        if org != self.org or not match:
+            return None
+        index = int(match.group(1))
+        return index if index < self.repo_count else None
+
+    def get_org_repos(self, request, org):
+        if org != self.org:
+            return 404, {}, {'message': 'Not Found'}
+        indexes, headers = paginate(range(self.repo_count), request)
+        return 200, headers, [repo_json(index) for index in indexes]
+
+    def get_repo(self, request, org, repo):
+        index = self.find_repo(org, repo)
+        if index is None:
+            return 404, {}, {'message': 'Not Found'}
+        return 200, {}, repo_json(index)
+
+    def get_contents(self, request, org, repo):
+        index = self.find_repo(org, repo)
+        if index is None or not repo_files(index):
+            return 404, {}, {'message': 'This repository is empty.'}
+        return 200, {}, [
+            {'name': name, 'path': name, 'type': 'file'}
+            for name in repo_files(index)
+        ]
+
+    def get_tree(self, request, org, repo, tree):
+        index = self.find_repo(org, repo)
+        if index is None or not repo_files(index):
+            return 409, {}, {'message': 'Git Repository is empty.'}
+        return 200, {}, {
+            'sha': tree,
+            'tree': [
+                {'path': name, 'type': 'blob', 'sha': f'{index:040x}'}
+                for name in repo_files(index)
+            ],
+            'truncated': False
+        }
+
+    def get_installed_repos(self, request, app):
+        ids, headers = paginate(sorted(self.installed), request)
+        return 200, headers, {
+            'total_count': len(self.installed),
+            'repositories': [{'id': repo_id} for repo_id in ids]
+        }
+
+    def install(self, request, app, repo_id):
+        with self.lock:
+            self.installed.add(int(repo_id))
+        return 204, {}, None
+
+    def uninstall(self, request, app, repo_id):
+        with self.lock:
+            self.installed.discard(int(repo_id))
+        return 204, {}, None
+
+    def get_rate_limit(self, request):
+        return 200, {}, {'resources': {'core': {
+            'limit': self.rate_limit or 5000,
+            'remaining': self.rate_limit_remaining or 5000,
+            'reset': math.ceil(self.rate_limit_reset or self.clock())
+        }}}
+
+    def post_graphql(self, request):
+        query = json.loads(request.body)['query']
+        return 200, {}, {'data': {
+            alias: self.graphql_node(json.loads(org), json.loads(name))
+            for alias, org, name in GRAPHQL_REPOSITORY.findall(query)
+        }}
+
+    def graphql_node(self, org, name):
+        index = self.find_repo(org, name)
+        if index is None:
+            return None
+        repo = repo_json(index)
+        return {
+            'databaseId': repo['id'],
+            'name': repo['name'],
+            'isArchived': repo['archived'],
+            'viewerPermission':
+                'ADMIN' if repo['permissions']['admin'] else 'WRITE',
+            'pushedAt': repo['pushed_at'],
+            'defaultBranchRef': {'name': repo['default_branch']},
+            'object': {'entries': [
+                {'name': name} for name in repo_files(index)
+            ]} if repo_files(index) else None
+        }
+
+    def get_update_configs(self, request):
+        with self.lock:
+            configs = sorted(self.configs.items())
+        page, headers = paginate(configs, request)
+        body = {'data': [
+            {'id': str(config_id), 'type': 'update-configs',
+             'attributes': attributes}
+            for config_id, attributes in page
+        ], 'links': {}}
+        if 'Link' in headers:
+            body['links']['next'] = headers['Link'][1:].split('>')[0]
+        return 200, {}, body
+
+    def add_update_config(self, request):
+        attributes = json.loads(request.body)
+        with self.lock:
+            config_id = self.next_config_id
+            self.next_config_id += 1
+            self.configs[config_id] = {
+                key: attributes.get(key)
+                for key in ('repo-id', 'package-manager', 'directory')
+            }
+        return 201, {}, {'data': {'id': str(config_id)}}
+
+    def remove_update_config(self, request, config_id):
+        with self.lock:
+            self.configs.pop(int(config_id), None)
+        return 204, {}, None
+
+
+ROUTES = [
+    (method, re.compile(pattern), handler) for method, pattern, handler in [
+        ('GET', r'^/orgs/(?P<org>[^/]+)/repos$', FakeAPI.get_org_repos),
+        (
+            'GET', r'^/repos/(?P<org>[^/]+)/(?P<repo>[^/]+)$',
+            FakeAPI.get_repo
+        ),
+        (
+            'GET', r'^/repos/(?P<org>[^/]+)/(?P<repo>[^/]+)/contents$',
+            FakeAPI.get_contents
+        ),
+        (
+            'GET',
+            r'^/repos/(?P<org>[^/]+)/(?P<repo>[^/]+)/git/trees/(?P<tree>.+)$',
+            FakeAPI.get_tree
+        ),
+        (
+            'GET', r'^/user/installations/(?P<app>[^/]+)/repositories$',
+            FakeAPI.get_installed_repos
+        ),
+        (
+            'PUT',
+            r'^/user/installations/(?P<app>[^/]+)/repositories/'
+            r'(?P<repo_id>\d+)$',
+            FakeAPI.install
+        ),
+        (
+            'DELETE',
+            r'^/user/installations/(?P<app>[^/]+)/repositories/'
+            r'(?P<repo_id>\d+)$',
+            FakeAPI.uninstall
+        ),
+        ('GET', r'^/rate_limit$', FakeAPI.get_rate_limit),
+        ('POST', r'^/graphql$', FakeAPI.post_graphql),
+        ('GET', r'^/update_configs$', FakeAPI.get_update_configs),
+        ('POST', r'^/update_configs$', FakeAPI.add_update_config),
+        (
+            'DELETE', r'^/update_configs/(?P<config_id>\d+)$',
+            FakeAPI.remove_update_config
+        )
+    ]
+]
+
+
+def repo_id(index):
+    return 1000 + index
+
+
+def repo_files(index):
+    return REPO_LAYOUTS[index % len(REPO_LAYOUTS)][0]
+
+
+def repo_json(index):
+    return {
+        'id': repo_id(index),
+        'name': f'repo-{index:06d}',
+        'archived': index % 97 == 0,
+        'permissions': {'admin': index % 89 != 0},
+        'pushed_at': PUSHED_AT,
+        'default_branch': 'main'
+    }
+
+
+def paginate(items, request):
+    per_page = min(int(request.query.get('per_page', ['30'])[0]), 100)
+    page = int(request.query.get('page', ['1'])[0])
+    start = (page - 1) * per_page
+    headers = {}
+    if start + per_page < len(items):
+        query = {key: values[0] for key, values in request.query.items()}
+        query['page'] = page + 1
+        headers['Link'] = (
+            f'<{request.base_url}{request.path}?{urlencode(query)}>; '
+            'rel="next"'
+        )
+    return items[start:start + per_page], headers
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        status, headers, data = self.server.api.handle(
+            self.command, self.path, self.rfile.read(length),
+            f'http://{self.headers["Host"]}'
+        )
+        payload = b'' if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_POST = do_PUT = do_DELETE = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(api, host='127.0.0.1', port=0):
+    server = ThreadingHTTPServer((host, port), FakeHandler)
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def parse_arguments(args=None):
+    argument_parser = argparse.ArgumentParser('fake_server')
+    argument_parser.add_argument('--org', default='fake-org')
+    argument_parser.add_argument('--repos', type=int, default=1000)
+    argument_parser.add_argument('--port', type=int, default=8080)
+    argument_parser.add_argument('--latency', type=float, default=0)
+    argument_parser.add_argument('--error-rate', type=float, default=0)
+    argument_parser.add_argument('--rate-limit', type=int)
+    argument_parser.add_argument(
+        '--rate-limit-window', type=float, default=60
+    )
+    return argument_parser.parse_args(args)
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+    server = serve(FakeAPI(
+        arguments.org, arguments.repos, arguments.latency,
+        arguments.error_rate, arguments.rate_limit,
+        arguments.rate_limit_window
+    ), port=arguments.port)
+    print(f'http://127.0.0.1:{server.server_address[1]}', flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
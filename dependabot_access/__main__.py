@@ -2,8 +2,13 @@ import sys
 import logging
 
 from . import access
+from .logs import RepoFilter
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(
+    level=logging.INFO, format='%(levelname)s:%(repo)s:%(message)s'
+)
+for log_handler in logging.getLogger().handlers:
+    log_handler.addFilter(RepoFilter())
 
 failed = False
 
@@ -4,11 +4,54 @@ import logging
 import os
 import requests
 
-from collections import namedtuple
+from .cache import ResponseCache
+from .client import ClientFactory
+from .compiler import Shard, compile_access, in_shard, shard_access
+from .decode import decode_file_names, decode_repository
 from .dependabot import Dependabot
+from .graphql import GraphQL
+from .inventory import Inventory
+from .journal import Journal
+from .logs import ErrorTracker, repo_context
+from .metrics import Metrics
+from .plan import Plan, PlanningDependabot, apply_plan
+from .ratelimit import RateLimiter
+from .retry import RetryStats, build_retry
+from .scheduler import Deadline, prioritize
+from .repository import repository_from_json
+from .rules import load_rules
+from .state import State
+from .stream import stream_access
+from .tracing import JSONLinesExporter, OTLPExporter, Tracer, config_names
+from .tree import TreeScan
+from .webhook import Debouncer, WebhookDaemon
+from .workers import run_bounded
 
 logger = logging.getLogger()
 
+INCOMPATIBLE_ARGUMENTS = [
+    ('stream_access', 'graphql_batch_size'),
+    ('async_transport', 'plan'),
+    ('async_transport', 'apply'),
+    ('async_transport', 'scan_tree'),
+    ('async_transport', 'cache_dir'),
+    ('trace_file', 'otlp_endpoint'),
+    ('webhook_port', 'plan'),
+    ('webhook_port', 'apply'),
+    ('webhook_port', 'async_transport'),
+    ('webhook_port', 'prefetch_installations'),
+    ('webhook_port', 'prefetch_repos'),
+    ('webhook_port', 'prefetch_dependabot_configs'),
+    ('webhook_port', 'graphql_batch_size'),
+    ('journal', 'plan'),
+    ('journal', 'webhook_port'),
+    ('deadline', 'webhook_port')
+]
+
+REQUIRED_ARGUMENTS = [
+    ('resume', 'journal')
+]
+
 
 class App():
 
@@ -31,14 +74,63 @@ class App():
         self.github_request_session.headers.update(self.headers)
 
         self.dependabot = dependabot
+        self.installed_repo_ids = None
+        self.repos = Inventory()
+        self.state = State()
+        self.tree_scan = None
+        self.metrics = Metrics()
+        self.tracer = Tracer()
+        self.github_url = 'https://api.github.com'
+        self.shard = None
+        self.journal = Journal()
+        self.deadline = Deadline()
 
-    def configure(self, config_list):
-        for config in config_list:
-            for repo_name in config.get('repos', []):
-                self.configure_app(
-                    repo_name,
-                    config.get('apps', {}).get('dependabot', False)
+    def configure(self, config_list, concurrency=1):
+        access = self.compile(config_list)
+        run_bounded(
+            lambda item: self.reconcile(*item), access.work, concurrency
+        )
+        self.deadline.report()
+
+    def compile(self, config_list):
+        access = shard_access(compile_access(config_list), self.shard)
+        access = access._replace(work=prioritize(
+            access.work, self.state.repos, self.repos
+        ))
+        for repo_name in access.conflicts:
+            with repo_context(repo_name):
+                self.on_error(
+                    f'Repo {repo_name} is listed both with and without '
+                    'dependabot, skipping it'
                 )
+        logger.info(f'Reconciling {len(access.work)} repos')
+        return access
+
+    def reconcile(self, repo_name, dependabot):
+        with repo_context(repo_name):
+            if self.is_journaled(repo_name, dependabot) or \
+                    self.is_past_deadline(repo_name):
+                return
+            self.state.clear_missed(repo_name)
+            self.configure_app(repo_name, dependabot)
+            self.record_reconciled(repo_name, dependabot)
+
+    def is_journaled(self, repo_name, dependabot):
+        if not self.journal.is_done(repo_name, dependabot):
+            return False
+        logger.info(f'Repo {repo_name} was reconciled before the restart')
+        return True
+
+    def is_past_deadline(self, repo_name):
+        if not self.deadline.expired():
+            return False
+        self.deadline.miss(repo_name)
+        self.state.record_missed(repo_name)
+        return True
+
+    def record_reconciled(self, repo_name, dependabot):
+        if not self.state.has_failed(repo_name):
+            self.journal.record(repo_name, dependabot)
 
     def configure_app(self, repo_name, dependabot):
         if dependabot:
@@ -47,50 +139,180 @@ class App():
             self.cease_app_access(repo_name)
 
     def get_repo_contents(self, repo_name):
-        no_repo_contents_status_code = 404
+        repo_files = self.repos.get_files(repo_name)
+        if repo_files is not None:
+            return repo_files
         response = self.github_request_session.request(
-            'GET',
-            f'https://api.github.com/repos/{self.org_name}/'
-            f'{repo_name}/contents'
+            'GET', self.get_repo_url(repo_name) + '/contents'
         )
+        return self.get_repo_contents_from_response(repo_name, response)
+
+    def get_repo_contents_from_response(self, repo_name, response):
+        no_repo_contents_status_code = 404
         if response.status_code == no_repo_contents_status_code:
             logger.info(f'Repo {repo_name} has no content')
             return []
+        if response.status_code != 200:
+            self.on_error(
+                f'Failed to list contents of repo {repo_name}: '
+                f'{response.status_code}'
+            )
+            return None
+        return decode_file_names(response.content)
+
+    def get_repo_url(self, repo_name):
+        return f'{self.github_url}/repos/{self.org_name}/{repo_name}'
+
+    def get_repo_files(self, repo_name, repo):
+        if self.tree_scan is None:
+            return self.get_repo_contents(repo_name)
+        paths = self.get_repo_tree(repo)
+        return None if paths is None else self.tree_scan.group(paths)
+
+    def get_tree(self, repo, tree, recursive=False):
+        response = self.github_request_session.request(
+            'GET',
+            f'{self.github_url}/repos/{self.org_name}/{repo.name}/'
+            f'git/trees/{tree}' + ('?recursive=1' if recursive else '')
+        )
+        if response.status_code == 409:
+            logger.info(f'Repo {repo.name} has no content')
+            return {'tree': []}
+        if response.status_code != 200:
+            self.on_error(
+                f'Failed to read tree {tree} of repo {repo.name}: '
+                f'{response.status_code}'
+            )
+            return None
         return response.json()
 
+    def get_repo_tree(self, repo):
+        branch = repo.default_branch or 'HEAD'
+        tree = self.get_tree(repo, branch, recursive=True)
+        if tree is None:
+            return None
+        if tree.get('truncated'):
+            logger.warning(
+                f'Tree for {repo.name} is truncated, walking it instead'
+            )
+            return self.walk_tree(repo, branch)
+        return [
+            entry['path'] for entry in tree['tree'] if entry['type'] == 'blob'
+        ]
+
+    def walk_tree(self, repo, tree, prefix=''):
+        listing = self.get_tree(repo, tree)
+        if listing is None:
+            return None
+        paths = []
+        for entry in listing['tree']:
+            entry_paths = self.walk_entry(repo, entry, prefix)
+            if entry_paths is None:
+                return None
+            paths.extend(entry_paths)
+        return paths
+
+    def walk_entry(self, repo, entry, prefix):
+        path = prefix + entry['path']
+        if entry['type'] == 'blob':
+            return [path]
+        if self.tree_scan.includes_directory(path):
+            return self.walk_tree(repo, entry['sha'], path + '/')
+        return []
+
     def enforce_app_access(self, repo_name):
-        repo = self.get_github_repo(repo_name)
-        if self.is_repo_not_configurable(repo):
-            return
-        self.install_app_on_repo(self.app_id, repo)
-        repo_files = self.get_repo_contents(repo_name)
+        with self.tracer.span('enforce_app_access') as span:
+            with self.metrics.phase('lookup'):
+                repo = self.get_github_repo(repo_name)
+            if self.is_repo_skipped(repo_name, repo, True):
+                return
+            with self.metrics.phase('install'):
+                self.install_app_on_repo(self.app_id, repo)
+            with self.metrics.phase('contents'):
+                repo_files = self.get_repo_files(repo_name, repo)
+            if repo_files is None:
+                return
+
+            with self.metrics.phase('dependabot'):
+                package_managers = (
+                    self.dependabot.add_configs_to_dependabot(
+                        repo, repo_files
+                    )
+                )
+            span.set_attribute(
+                'package_managers', config_names(package_managers)
+            )
+            self.state.record(repo_name, repo, True, package_managers)
 
-        self.dependabot.add_configs_to_dependabot(repo, repo_files)
+    def load_org_repos(self):
+        for repo_content in self.get_paginated(
+            f'{self.github_url}/orgs/{self.org_name}/repos?per_page=100'
+        ):
+            repo = repository_from_json(repo_content)
+            self.repos.add(repo)
+        logger.info(f'Loaded {len(self.repos)} repos from {self.org_name}')
+
+    def load_repos_with_graphql(self, repo_names, batch_size):
+        graphql = GraphQL(
+            self.org_name, self.github_request_session, batch_size,
+            f'{self.github_url}/graphql'
+        )
+        for repo, file_names in graphql.get_repos(repo_names):
+            self.repos.add(repo, file_names)
 
     def get_github_repo(self, repo_name):
+        repo = self.repos.get(repo_name.lower())
+        if repo is not None:
+            return repo
         logger.info(f'Getting repo: {repo_name}')
         response = self.github_request_session.request(
-            'GET',
-            f'https://api.github.com/repos/{self.org_name}/'
-            f'{repo_name}'
+            'GET', self.get_repo_url(repo_name)
         )
         response.raise_for_status()
-        repo_content = response.json()
-        repo = namedtuple('Repository', 'id, name, archived, admin')(
-            repo_content.get('id'),
-            repo_content.get('name'),
-            repo_content.get('archived'),
-            repo_content.get('permissions').get('admin')
+        return decode_repository(response.content)
+
+    def get_paginated(self, url, key=None):
+        while url:
+            response = self.github_request_session.request('GET', url)
+            response.raise_for_status()
+            page = response.json()
+            yield from page[key] if key else page
+            url = response.links.get('next', {}).get('url')
+
+    def load_installed_repos(self):
+        self.installed_repo_ids = {
+            repo.get('id') for repo in self.get_paginated(
+                f'{self.github_url}/user/installations/{self.app_id}/'
+                'repositories?per_page=100',
+                'repositories'
+            )
+        }
+        logger.info(
+            f'App is installed on {len(self.installed_repo_ids)} repos'
         )
-        return repo
+
+    def is_app_installed(self, repo):
+        if self.installed_repo_ids is None:
+            return None
+        return repo.id in self.installed_repo_ids
 
     def install_app_on_repo(self, app_id, repo):
-        url = (
-            f'https://api.github.com/user/installations/{app_id}/'
+        if self.is_app_installed(repo):
+            logger.info(f'App is already installed on {repo.name}')
+            return
+        logger.info(f'Installing app on {repo.name} in Github')
+        response = self.github_request_session.request(
+            "PUT", self.get_installation_url(app_id, repo)
+        )
+        self.check_installation(repo, response)
+
+    def get_installation_url(self, app_id, repo):
+        return (
+            f'{self.github_url}/user/installations/{app_id}/'
             f'repositories/{repo.id}'
         )
-        logger.info(f'Installing app on {repo.name} in Github')
-        response = self.github_request_session.request("PUT", url)
+
+    def check_installation(self, repo, response):
         if response.status_code != 204:
             self.on_error(
                 f'Failed to add repo {repo.name} to Dependabot'
@@ -98,18 +320,26 @@ class App():
             )
 
     def cease_app_access(self, repo_name):
-        repo = self.get_github_repo(repo_name)
-        if self.is_repo_not_configurable(repo):
-            return
-        self.remove_app_on_repo(self.app_id, repo)
+        with self.tracer.span('cease_app_access'):
+            with self.metrics.phase('lookup'):
+                repo = self.get_github_repo(repo_name)
+            if self.is_repo_skipped(repo_name, repo, False):
+                return
+            with self.metrics.phase('install'):
+                self.remove_app_on_repo(self.app_id, repo)
+            self.state.record(repo_name, repo, False)
 
     def remove_app_on_repo(self, app_id, repo):
-        url = (
-            f'https://api.github.com/user/installations/{app_id}/'
-            f'repositories/{repo.id}'
-        )
+        if self.is_app_installed(repo) is False:
+            logger.info(f'App is not installed on {repo.name}')
+            return
         logger.info(f'Removing app on {repo.name} in Github')
-        response = self.github_request_session.request("DELETE", url)
+        response = self.github_request_session.request(
+            "DELETE", self.get_installation_url(app_id, repo)
+        )
+        self.check_removal(repo, response)
+
+    def check_removal(self, repo, response):
         if response.status_code != 204:
             self.on_error(
                 'Failed to remove Dependabot app installation from '
@@ -119,22 +349,343 @@ class App():
     def is_repo_not_configurable(self, repo):
         return repo.archived or not repo.admin
 
+    def is_repo_skipped(self, repo_name, repo, dependabot):
+        return self.is_repo_not_configurable(repo) or \
+            self.is_repo_unchanged(repo_name, repo, dependabot)
 
-def configure_app(args, handle_error):
+    def get_rate_limit(self):
+        response = self.github_request_session.request(
+            'GET', f'{self.github_url}/rate_limit'
+        )
+        response.raise_for_status()
+        return response.json()['resources']['core']
+
+    def is_repo_unchanged(self, repo_name, repo, dependabot):
+        if not self.state.is_current(repo_name, repo, dependabot):
+            return False
+        logger.info(f'Repo {repo.name} is unchanged since the last run')
+        return True
+
+
+class PlanningApp(App):
+    """App that records installation changes in a plan."""
+
+    plan = None
+
+    def install_app_on_repo(self, app_id, repo):
+        if not self.is_app_installed(repo):
+            self.plan.add('install', repo)
+
+    def remove_app_on_repo(self, app_id, repo):
+        if self.is_app_installed(repo) is not False:
+            self.plan.add('remove', repo)
+
+
+def parse_arguments(args):
     argument_parser = argparse.ArgumentParser('dependabot_access')
     argument_parser.add_argument('--org', required=True)
-    argument_parser.add_argument('--access', required=True)
+    argument_parser.add_argument(
+        '--github-url', default='https://api.github.com'
+    )
+    argument_parser.add_argument(
+        '--dependabot-url', default='https://api.dependabot.com'
+    )
+    argument_parser.add_argument('--access')
+    argument_parser.add_argument('--stream-access', action='store_true')
     argument_parser.add_argument('--dependabot-id', required=True)
     argument_parser.add_argument('--account-id', required=True)
+    argument_parser.add_argument('--concurrency', type=int, default=1)
+    argument_parser.add_argument('--async-transport', action='store_true')
+    argument_parser.add_argument('--max-connections', type=int, default=10)
+    argument_parser.add_argument('--webhook-port', type=int)
+    argument_parser.add_argument('--webhook-host', default='0.0.0.0')
+    argument_parser.add_argument('--debounce', type=float, default=5)
+    argument_parser.add_argument('--shard-index', type=int)
+    argument_parser.add_argument('--shard-count', type=int)
+    argument_parser.add_argument('--state')
+    argument_parser.add_argument('--deadline', type=float)
+    argument_parser.add_argument('--journal')
+    argument_parser.add_argument('--resume', action='store_true')
+    argument_parser.add_argument('--journal-sync-every', type=int, default=50)
+    argument_parser.add_argument('--full', action='store_true')
+    mode = argument_parser.add_mutually_exclusive_group()
+    mode.add_argument('--plan')
+    mode.add_argument('--apply')
+    argument_parser.add_argument(
+        '--seconds-per-request', type=float, default=0.5
+    )
+    argument_parser.add_argument(
+        '--prefetch-installations', action='store_true'
+    )
+    argument_parser.add_argument('--prefetch-repos', action='store_true')
+    argument_parser.add_argument(
+        '--graphql-batch-size', type=int, default=0
+    )
+    argument_parser.add_argument(
+        '--prefetch-dependabot-configs', action='store_true'
+    )
+    argument_parser.add_argument(
+        '--prune-dependabot-configs', action='store_true'
+    )
+    argument_parser.add_argument('--package-manager-rules')
+    argument_parser.add_argument('--scan-tree', action='store_true')
+    argument_parser.add_argument('--tree-max-depth', type=int, default=5)
+    argument_parser.add_argument(
+        '--tree-exclude', action='append', default=[]
+    )
+    argument_parser.add_argument('--retries', type=int, default=3)
+    argument_parser.add_argument('--retry-backoff', type=float, default=0.5)
+    argument_parser.add_argument(
+        '--retry-backoff-max', type=float, default=30
+    )
+    argument_parser.add_argument('--retry-jitter', type=float, default=0.5)
+    argument_parser.add_argument(
+        '--rate-limit-pace-below', type=int, default=100
+    )
+    argument_parser.add_argument('--github-pool-size', type=int)
+    argument_parser.add_argument('--dependabot-pool-size', type=int)
+    argument_parser.add_argument('--pool-block', action='store_true')
+    argument_parser.add_argument('--no-keep-alive', action='store_true')
+    argument_parser.add_argument(
+        '--connect-timeout', type=float, default=10
+    )
+    argument_parser.add_argument('--read-timeout', type=float, default=60)
+    argument_parser.add_argument('--cache-dir')
+    argument_parser.add_argument('--metrics-prom')
+    argument_parser.add_argument('--metrics-json')
+    argument_parser.add_argument('--trace-file')
+    argument_parser.add_argument('--otlp-endpoint')
+    argument_parser.add_argument(
+        '--cache-max-bytes', type=int, default=100 * 1024 * 1024
+    )
 
     arguments = argument_parser.parse_args(args)
+    check_arguments(argument_parser, arguments)
+    return arguments
+
+
+def check_arguments(argument_parser, arguments):
+    if not arguments.access and not arguments.apply:
+        argument_parser.error('--access is required unless using --apply')
+    for first, second in INCOMPATIBLE_ARGUMENTS:
+        if getattr(arguments, first) and getattr(arguments, second):
+            argument_parser.error(
+                f"--{first.replace('_', '-')} cannot be used with "
+                f"--{second.replace('_', '-')}"
+            )
+    check_required(argument_parser, arguments)
+    check_concurrency(argument_parser, arguments)
+    check_shard(argument_parser, arguments)
+    check_webhook(argument_parser, arguments)
+
+
+def check_required(argument_parser, arguments):
+    for argument, required in REQUIRED_ARGUMENTS:
+        if getattr(arguments, argument) and not getattr(arguments, required):
+            argument_parser.error(
+                f"--{argument.replace('_', '-')} requires "
+                f"--{required.replace('_', '-')}"
+            )
+
+
+def check_concurrency(argument_parser, arguments):
+    if arguments.concurrency < 1:
+        argument_parser.error('--concurrency must be at least 1')
+
+
+def check_shard(argument_parser, arguments):
+    if (arguments.shard_index is None) != (arguments.shard_count is None):
+        argument_parser.error(
+            '--shard-index and --shard-count must be used together'
+        )
+    if arguments.shard_count is not None and not (
+        0 <= arguments.shard_index < arguments.shard_count
+    ):
+        argument_parser.error(
+            '--shard-index must be at least 0 and below --shard-count'
+        )
+
+
+def check_webhook(argument_parser, arguments):
+    if arguments.webhook_port and not os.environ.get('GITHUB_WEBHOOK_SECRET'):
+        argument_parser.error(
+            'GITHUB_WEBHOOK_SECRET must be set to use --webhook-port'
+        )
+
+
+def select_classes(arguments):
+    if arguments.plan:
+        return PlanningApp, PlanningDependabot
+    if arguments.async_transport:
+        from .aio import AsyncApp, AsyncDependabot
+        return AsyncApp, AsyncDependabot
+    return App, Dependabot
+
+
+def configure_app(args, handle_error):
+    arguments = parse_arguments(args)
 
     github_token = os.environ['GITHUB_TOKEN']
-    dependabot = Dependabot(arguments.account_id, handle_error)
-    app = App(
+    on_error = ErrorTracker(handle_error)
+    app_class, dependabot_class = select_classes(arguments)
+    dependabot = build_dependabot(
+        dependabot_class, arguments, github_token, on_error
+    )
+    app = app_class(
         arguments.org, github_token, arguments.dependabot_id,
-        arguments.account_id, handle_error, dependabot
+        arguments.account_id, on_error, dependabot
+    )
+    app.state = State(arguments.state, arguments.full, on_error)
+    app.deadline = Deadline(arguments.deadline)
+    app.journal = Journal(
+        arguments.journal, arguments.resume, arguments.journal_sync_every
     )
+    if arguments.scan_tree:
+        app.tree_scan = TreeScan(
+            arguments.tree_max_depth, arguments.tree_exclude
+        )
+    app.plan = dependabot.plan = Plan(arguments.org)
+    app.tracer = dependabot.tracer = Tracer(build_exporter(arguments))
+    app.github_url = arguments.github_url.rstrip('/')
+    app.shard = build_shard(arguments)
+    app.max_connections = arguments.max_connections
+
+    app.client_factory = client_factory = configure_sessions(app, arguments)
+
+    run(app, arguments)
+    logger.info(f'{client_factory.retry.stats.count} requests were retried')
+    client_factory.log_pool_stats()
+    app.metrics.save(arguments.metrics_prom, arguments.metrics_json)
+    app.tracer.shutdown()
+
+
+def run(app, arguments):
+    if arguments.apply:
+        apply_plan(app, Plan.load(arguments.apply), arguments.concurrency)
+    elif arguments.webhook_port:
+        serve_webhooks(app, arguments)
+    else:
+        reconcile_access(app, arguments)
+
+
+def serve_webhooks(app, arguments):
+    WebhookDaemon(
+        app, lambda: load_access(arguments), arguments.access,
+        os.environ['GITHUB_WEBHOOK_SECRET'], Debouncer(arguments.debounce),
+        arguments.concurrency
+    ).serve(arguments.webhook_host, arguments.webhook_port)
+
+
+def build_shard(arguments):
+    if arguments.shard_count is None:
+        return None
+    return Shard(arguments.shard_index, arguments.shard_count)
 
+
+def build_exporter(arguments):
+    if arguments.otlp_endpoint:
+        return OTLPExporter(arguments.otlp_endpoint)
+    if arguments.trace_file:
+        return JSONLinesExporter(arguments.trace_file)
+    return None
+
+
+def build_dependabot(dependabot_class, arguments, github_token, on_error):
+    dependabot = dependabot_class(
+        arguments.account_id, on_error, github_token
+    )
+    dependabot.dependabot_url = arguments.dependabot_url.rstrip('/')
+    if arguments.package_manager_rules:
+        dependabot.add_rules(load_rules(arguments.package_manager_rules))
+    return dependabot
+
+
+def load_access(arguments):
+    if arguments.stream_access:
+        return stream_access(arguments.access)
     with open(arguments.access, 'r') as f:
-        app.configure(json.loads(f.read()))
+        return json.loads(f.read())
+
+
+def reconcile_access(app, arguments):
+    config_list = load_access(arguments)
+
+    prefetch(app, arguments, config_list)
+    try:
+        app.configure(config_list, concurrency=arguments.concurrency)
+    finally:
+        app.journal.close()
+    if arguments.plan:
+        app.plan.save(arguments.plan, app.plan.estimate(
+            app.get_rate_limit(), arguments.seconds_per_request,
+            arguments.concurrency
+        ))
+    else:
+        app.state.save()
+    finish_journal(app.journal, app.deadline)
+
+
+def finish_journal(journal, deadline):
+    if not deadline.missed:
+        journal.remove()
+    elif journal.path is not None:
+        logger.info(f'Keeping journal {journal.path} to --resume from')
+
+
+def build_client_factory(arguments, metrics, tracer):
+    return ClientFactory(
+        build_retry(
+            arguments.retries, arguments.retry_backoff,
+            arguments.retry_backoff_max, arguments.retry_jitter, RetryStats()
+        ),
+        (arguments.connect_timeout, arguments.read_timeout),
+        pool_block=arguments.pool_block,
+        keep_alive=not arguments.no_keep_alive,
+        limiter=RateLimiter(arguments.rate_limit_pace_below),
+        cache=ResponseCache(
+            arguments.cache_dir, arguments.cache_max_bytes
+        ) if arguments.cache_dir else None,
+        metrics=metrics,
+        tracer=tracer if tracer.enabled else None
+    )
+
+
+def configure_sessions(app, arguments):
+    default_pool_size = max(arguments.concurrency, 10)
+    client_factory = build_client_factory(
+        arguments, app.metrics, app.tracer
+    )
+    client_factory.configure(
+        app.github_request_session, arguments.github_url,
+        arguments.github_pool_size or default_pool_size, cached=True
+    )
+    client_factory.configure(
+        app.dependabot.dependabot_request_session, arguments.dependabot_url,
+        arguments.dependabot_pool_size or default_pool_size
+    )
+    return client_factory
+
+
+def prefetch_dependabot(dependabot, arguments):
+    if arguments.prefetch_dependabot_configs or arguments.plan or \
+            arguments.prune_dependabot_configs:
+        dependabot.load_update_configs()
+    dependabot.prune = arguments.prune_dependabot_configs
+
+
+def prefetch(app, arguments, config_list):
+    if arguments.prefetch_installations or arguments.plan:
+        app.load_installed_repos()
+    if arguments.prefetch_repos:
+        app.load_org_repos()
+    prefetch_dependabot(app.dependabot, arguments)
+    if arguments.graphql_batch_size:
+        app.load_repos_with_graphql(
+            list(dict.fromkeys(
+                repo_name
+                for config in config_list
+                for repo_name in config.get('repos', [])
+                if in_shard(repo_name, build_shard(arguments))
+            )),
+            arguments.graphql_batch_size
+        )
@@ -0,0 +1,19 @@
+from requests.adapters import BaseAdapter
+
+
+class WrappingAdapter(BaseAdapter):
+    """Adds behaviour around the adapter a session already uses."""
+
+    def __init__(self, adapter):
+        super().__init__()
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        self.adapter.close()
+
+
+def wrap_session(session, wrapper, *args, prefix='https://'):
+    session.mount(prefix, wrapper(session.get_adapter(prefix), *args))
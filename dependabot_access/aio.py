@@ -0,0 +1,285 @@
+import asyncio
+import logging
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from .access import App
+from .decode import decode_repository
+from .dependabot import Dependabot
+from .logs import repo_context
+from .metrics import endpoint_template
+from .ratelimit import MAX_RATE_LIMIT_WAITS
+from .tracing import OTLP_KIND_CLIENT, Tracer, config_names
+
+logger = logging.getLogger()
+
+AsyncRequest = namedtuple('AsyncRequest', 'method, url, headers, body')
+
+
+class AsyncTransport:
+    """Async HTTP client multiplexing requests over HTTP/2 connections.
+
+    Requests are retried, paced, measured and traced with the settings of
+    the client factory that sets up the default transport. Needs httpx
+    with its http2 extra, which is only imported when an async transport
+    is created.
+    """
+
+    def __init__(self, headers, max_connections, client_factory):
+        import httpx
+
+        connect_timeout, read_timeout = client_factory.timeout
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=client_factory.retry.total,
+                limits=httpx.Limits(max_connections=max_connections)
+            )
+        )
+        self.headers = headers
+        self.retry = client_factory.retry
+        self.limiter = client_factory.limiter
+        self.metrics = client_factory.metrics
+        self.tracer = client_factory.tracer or Tracer()
+
+    async def request(self, method, url, data=None):
+        request = AsyncRequest(method, url, self.headers, data)
+        with self.tracer.span(
+            f'{method} {endpoint_template(url)}', OTLP_KIND_CLIENT,
+            **{'http.method': method, 'http.url': url}
+        ) as span:
+            response = await self.measured(request)
+            span.set_attribute('http.status_code', response.status_code)
+            return response
+
+    async def measured(self, request):
+        start = self.metrics.clock()
+        response = await self.rate_limited(request)
+        self.metrics.observe_request(
+            request, response, self.metrics.clock() - start
+        )
+        return response
+
+    async def rate_limited(self, request):
+        response = await self.paced(request)
+        for _ in range(MAX_RATE_LIMIT_WAITS):
+            delay = self.limiter.retry_delay(response)
+            if delay is None:
+                return response
+            logger.warning(
+                f'Rate limited on {urlparse(request.url).hostname}, '
+                f'waiting {delay:.0f}s'
+            )
+            await asyncio.sleep(delay)
+            response = await self.paced(request)
+        return response
+
+    async def paced(self, request):
+        await asyncio.sleep(self.limiter.reserve(request))
+        response = await self.retried(request)
+        self.limiter.update(request, response)
+        return response
+
+    async def retried(self, request):
+        retry = self.retry
+        while True:
+            response = AsyncResponse(await self.client.request(
+                request.method, request.url, content=request.body
+            ), retry)
+            if not (retry.total and retry.is_retry(
+                request.method, response.status_code,
+                'Retry-After' in response.headers
+            )):
+                return response
+            retry = retry.increment(request.method, request.url, response)
+            await asyncio.sleep(
+                retry.get_retry_after(response) or retry.get_backoff_time()
+            )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class AsyncResponse:
+    """Gives an httpx response the requests attributes the clients read.
+
+    It also stands in for the urllib3 response the retry policy and
+    metrics read, carrying the retries made before it.
+    """
+
+    def __init__(self, response, retries=None):
+        self.response = response
+        self.retries = retries
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    @property
+    def reason(self):
+        return self.response.reason_phrase
+
+    @property
+    def raw(self):
+        return self
+
+    @property
+    def status(self):
+        return self.response.status_code
+
+    def get_redirect_location(self):
+        return False
+
+
+class AsyncDependabot(Dependabot):
+    transport = None
+
+    async def async_add_configs_to_dependabot(self, repo, repo_files):
+        changes = self.get_config_changes(repo, repo_files)
+        for package_manager, directory in changes.missing:
+            await self.async_add_config(repo, package_manager, directory)
+        for package_manager, config_id in changes.stale:
+            await self.async_remove_config(repo, package_manager, config_id)
+        return changes.wanted
+
+    async def async_add_config(self, repo, package_manager, directory='/'):
+        response = await self.transport.request(
+            'POST',
+            f'{self.dependabot_url}/update_configs',
+            data=self.get_config_data(repo, package_manager, directory)
+        )
+        self.check_for_errors(repo, package_manager, response)
+
+    async def async_remove_config(self, repo, package_manager, config_id):
+        logger.info(
+            f'Dependabot: Removing config for repo: {repo.name} '
+            f'with Package manager: {package_manager}'
+        )
+        response = await self.transport.request(
+            'DELETE',
+            f'{self.dependabot_url}/update_configs/{config_id}'
+        )
+        self.check_removal(repo, package_manager, response)
+
+
+class AsyncApp(App):
+    """App reconciling repos as asyncio tasks over an async transport.
+
+    Prefetching still uses the synchronous session, only the per-repo
+    calls go through the async transport.
+    """
+
+    transport = None
+    max_connections = 10
+    client_factory = None
+
+    def configure(self, config_list, concurrency=1):
+        asyncio.run(self.async_configure(config_list, concurrency))
+
+    async def async_configure(self, config_list, concurrency=1):
+        access = self.compile(config_list)
+        self.open_transports()
+        semaphore = asyncio.Semaphore(concurrency)
+        try:
+            await asyncio.gather(*(
+                self.async_reconcile(semaphore, repo_name, dependabot)
+                for repo_name, dependabot in access.work
+            ))
+        finally:
+            await self.transport.aclose()
+            await self.dependabot.transport.aclose()
+        self.deadline.report()
+
+    def open_transports(self):
+        self.transport = AsyncTransport(
+            self.headers, self.max_connections, self.client_factory
+        )
+        self.dependabot.transport = AsyncTransport(
+            self.dependabot.headers, self.max_connections,
+            self.client_factory
+        )
+
+    async def async_reconcile(self, semaphore, repo_name, dependabot):
+        async with semaphore:
+            with repo_context(repo_name):
+                if self.is_journaled(repo_name, dependabot) or \
+                        self.is_past_deadline(repo_name):
+                    return
+                self.state.clear_missed(repo_name)
+                await self.async_configure_app(repo_name, dependabot)
+                self.record_reconciled(repo_name, dependabot)
+
+    async def async_configure_app(self, repo_name, dependabot):
+        if dependabot:
+            await self.async_enforce_app_access(repo_name)
+        else:
+            await self.async_cease_app_access(repo_name)
+
+    async def async_enforce_app_access(self, repo_name):
+        with self.tracer.span('enforce_app_access') as span:
+            repo = await self.async_get_github_repo(repo_name)
+            if self.is_repo_skipped(repo_name, repo, True):
+                return
+            await self.async_install_app_on_repo(self.app_id, repo)
+            repo_files = await self.async_get_repo_contents(repo_name)
+            if repo_files is None:
+                return
+
+            package_managers = (
+                await self.dependabot.async_add_configs_to_dependabot(
+                    repo, repo_files
+                )
+            )
+            span.set_attribute(
+                'package_managers', config_names(package_managers)
+            )
+            self.state.record(repo_name, repo, True, package_managers)
+
+    async def async_cease_app_access(self, repo_name):
+        with self.tracer.span('cease_app_access'):
+            repo = await self.async_get_github_repo(repo_name)
+            if self.is_repo_skipped(repo_name, repo, False):
+                return
+            await self.async_remove_app_on_repo(self.app_id, repo)
+            self.state.record(repo_name, repo, False)
+
+    async def async_get_github_repo(self, repo_name):
+        repo = self.repos.get(repo_name.lower())
+        if repo is not None:
+            return repo
+        logger.info(f'Getting repo: {repo_name}')
+        response = await self.transport.request(
+            'GET', self.get_repo_url(repo_name)
+        )
+        response.raise_for_status()
+        return decode_repository(response.content)
+
+    async def async_get_repo_contents(self, repo_name):
+        repo_files = self.repos.get_files(repo_name)
+        if repo_files is not None:
+            return repo_files
+        response = await self.transport.request(
+            'GET', self.get_repo_url(repo_name) + '/contents'
+        )
+        return self.get_repo_contents_from_response(repo_name, response)
+
+    async def async_install_app_on_repo(self, app_id, repo):
+        if self.is_app_installed(repo):
+            logger.info(f'App is already installed on {repo.name}')
+            return
+        logger.info(f'Installing app on {repo.name} in Github')
+        response = await self.transport.request(
+            'PUT', self.get_installation_url(app_id, repo)
+        )
+        self.check_installation(repo, response)
+
+    async def async_remove_app_on_repo(self, app_id, repo):
+        if self.is_app_installed(repo) is False:
+            logger.info(f'App is not installed on {repo.name}')
+            return
+        logger.info(f'Removing app on {repo.name} in Github')
+        response = await self.transport.request(
+            'DELETE', self.get_installation_url(app_id, repo)
+        )
+        self.check_removal(repo, response)
@@ -0,0 +1,130 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+from .adapters import WrappingAdapter
+
+logger = logging.getLogger()
+
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class ResponseCache:
+    """Least recently used, size bounded store of response bodies on disk."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.sizes = OrderedDict(
+            (entry.name, entry.stat().st_size)
+            for entry in sorted(
+                os.scandir(directory), key=lambda e: e.stat().st_mtime
+            )
+            if entry.name.endswith('.json')
+        )
+        self.total_bytes = sum(self.sizes.values())
+
+    def key(self, request):
+        identity = f"{request.headers.get('Authorization')} {request.url}"
+        return hashlib.sha256(identity.encode()).hexdigest() + '.json'
+
+    def get(self, request):
+        key = self.key(request)
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        with self.lock:
+            self.touch(key, path)
+        return entry
+
+    def touch(self, key, path):
+        if key in self.sizes:
+            self.sizes.move_to_end(key)
+            return
+        # written by another cache on the same directory, or evicted since
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        self.sizes[key] = size
+        self.total_bytes += size
+        self.evict()
+
+    def put(self, request, response):
+        key = self.key(request)
+        path = os.path.join(self.directory, key)
+        data = json.dumps({
+            'headers': {
+                name: response.headers[name]
+                for name in CACHED_HEADERS if name in response.headers
+            },
+            'body': base64.b64encode(response.content).decode()
+        })
+        with open(f'{path}.{threading.get_ident()}.tmp', 'w') as f:
+            f.write(data)
+        os.replace(f'{path}.{threading.get_ident()}.tmp', path)
+        with self.lock:
+            self.total_bytes += len(data) - self.sizes.pop(key, 0)
+            self.sizes[key] = len(data)
+            self.evict()
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes:
+            key, size = self.sizes.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, key))
+            except FileNotFoundError:
+                pass
+
+
+class CachingAdapter(WrappingAdapter):
+    """Makes GET requests conditional, serving cached bodies on 304."""
+
+    def __init__(self, adapter, cache):
+        super().__init__(adapter)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return self.adapter.send(request, **kwargs)
+        entry = self.cache.get(request)
+        add_validators(request, entry)
+        response = self.adapter.send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            return from_cache(response, entry)
+        if response.status_code == 200 and has_validators(response.headers):
+            self.cache.put(request, response)
+        return response
+
+
+def add_validators(request, entry):
+    headers = (entry or {}).get('headers', {})
+    if 'ETag' in headers:
+        request.headers['If-None-Match'] = headers['ETag']
+    if 'Last-Modified' in headers:
+        request.headers['If-Modified-Since'] = headers['Last-Modified']
+
+
+def has_validators(headers):
+    return 'ETag' in headers or 'Last-Modified' in headers
+
+
+def from_cache(response, entry):
+    logger.info(f'Using cached response for {response.url}')
+    response.from_cache = True
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers.update(entry['headers'])
+    response._content = base64.b64decode(entry['body'])
+    return response
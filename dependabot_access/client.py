@@ -0,0 +1,127 @@
+import logging
+import threading
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from .adapters import wrap_session
+from .cache import CachingAdapter
+from .metrics import MetricsAdapter
+from .ratelimit import RateLimitAdapter
+from .tracing import TracingAdapter
+
+logger = logging.getLogger()
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.new_connections = 0
+        self.waits = 0
+        self.lock = threading.Lock()
+
+    def checkout(self, waited):
+        with self.lock:
+            self.checkouts += 1
+            self.waits += waited
+
+    def new_connection(self):
+        with self.lock:
+            self.new_connections += 1
+
+    def as_dict(self):
+        return {
+            'hits': self.checkouts - self.new_connections,
+            'new_connections': self.new_connections,
+            'waits': self.waits
+        }
+
+
+class StatsPoolMixin:
+    """Counts connection checkouts, new connections and waits for one."""
+
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        self.stats.checkout(self.pool is not None and self.pool.empty())
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        self.stats.new_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with a default timeout and pools that record stats."""
+
+    def __init__(self, stats, timeout, **kwargs):
+        self.stats = stats
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type(
+                'StatsHTTPConnectionPool',
+                (StatsPoolMixin, HTTPConnectionPool), {'stats': self.stats}
+            ),
+            'https': type(
+                'StatsHTTPSConnectionPool',
+                (StatsPoolMixin, HTTPSConnectionPool), {'stats': self.stats}
+            )
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+
+class ClientFactory:
+    """Owns the connection pools and request layers of every session.
+
+    Each session gets a pooled adapter for its host with retries and
+    default timeouts, wrapped in rate limiting, for GitHub the response
+    cache, the request metrics and outermost tracing.
+    """
+
+    def __init__(
+        self, retry, timeout, pool_block=False, keep_alive=True,
+        limiter=None, cache=None, metrics=None, tracer=None
+    ):
+        self.retry = retry
+        self.timeout = timeout
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.limiter = limiter
+        self.cache = cache
+        self.metrics = metrics
+        self.tracer = tracer
+        self.pool_stats = {}
+
+    def configure(self, session, base_url, pool_size, cached=False):
+        url = urlsplit(base_url)
+        prefix = f'{url.scheme}://'
+        session.mount(prefix, PooledHTTPAdapter(
+            self.pool_stats.setdefault(url.netloc, PoolStats()),
+            self.timeout,
+            pool_maxsize=pool_size,
+            pool_block=self.pool_block,
+            max_retries=self.retry
+        ))
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        for wrapper, layer in self.layers(cached):
+            if layer is not None:
+                wrap_session(session, wrapper, layer, prefix=prefix)
+
+    def layers(self, cached):
+        return [
+            (RateLimitAdapter, self.limiter),
+            (CachingAdapter, self.cache if cached else None),
+            (MetricsAdapter, self.metrics),
+            (TracingAdapter, self.tracer)
+        ]
+
+    def log_pool_stats(self):
+        for host, stats in sorted(self.pool_stats.items()):
+            logger.info(f'Connection pool for {host}: {stats.as_dict()}')
@@ -0,0 +1,59 @@
+import hashlib
+from collections import namedtuple
+
+CompiledAccess = namedtuple('CompiledAccess', 'work, conflicts')
+Shard = namedtuple('Shard', 'index, count')
+
+
+def compile_access(config_list):
+    """Merges config blocks into one desired state per repo.
+
+    Repos are matched case insensitively, as GitHub does. A repo that
+    blocks disagree about is reported as a conflict and left out of the
+    work list, so the outcome never depends on block order.
+    """
+    desired = {}
+    conflicts = {}
+    for config in config_list:
+        dependabot = bool(config.get('apps', {}).get('dependabot', False))
+        for repo_name in config.get('repos', []):
+            repo_name, previous = desired.setdefault(
+                repo_name.lower(), (repo_name, dependabot)
+            )
+            if previous != dependabot:
+                conflicts[repo_name.lower()] = repo_name
+    return CompiledAccess(
+        [
+            (repo_name, dependabot)
+            for key, (repo_name, dependabot) in desired.items()
+            if key not in conflicts
+        ],
+        sorted(conflicts.values())
+    )
+
+
+def shard_of(repo_name, shard_count):
+    """Picks a repo's shard from a hash of its lower cased name.
+
+    The hash only depends on the name, so adding or removing other repos
+    never moves a repo to another shard.
+    """
+    digest = hashlib.sha256(repo_name.lower().encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def in_shard(repo_name, shard):
+    return shard is None or shard_of(repo_name, shard.count) == shard.index
+
+
+def shard_access(access, shard):
+    return CompiledAccess(
+        [
+            (repo_name, dependabot) for repo_name, dependabot in access.work
+            if in_shard(repo_name, shard)
+        ],
+        [
+            repo_name for repo_name in access.conflicts
+            if in_shard(repo_name, shard)
+        ]
+    )
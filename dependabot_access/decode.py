@@ -0,0 +1,36 @@
+import json
+import sys
+
+from .repository import repository_from_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(content):
+    """Decodes a JSON body from bytes, using orjson when it's installed.
+
+    Decoding the raw bytes also skips the text decoding (and encoding
+    detection) that response.json() does first.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode_repository(content):
+    return repository_from_json(loads(content))
+
+
+def decode_file_names(content):
+    """Keeps just the name of each contents entry, interned.
+
+    GitHub contents listings carry URLs, SHAs and links for every entry,
+    which are dropped as soon as the body is decoded.
+    """
+    entries = loads(content)
+    if not isinstance(entries, list):
+        return []
+    return [sys.intern(entry['name']) for entry in entries]
@@ -3,12 +3,18 @@ import json
 import logging
 import requests
 
+from collections import namedtuple
+from .repository import intern_text
+from .rules import PackageManagerRules
+from .tracing import Tracer
 
 logger = logging.getLogger()
 
+ConfigChanges = namedtuple('ConfigChanges', 'wanted, missing, stale')
+
 
 class Dependabot:
-    def __init__(self, account_id, on_error):
+    def __init__(self, account_id, on_error, github_token=None):
         self.account_id = account_id
         self.on_error = on_error
 
@@ -16,6 +22,7 @@ class Dependabot:
             "Dockerfile": "docker",
             "Gemfile": "bundler",
             "gemspec": "bundler",
+            "*.gemspec": "bundler",
             "package.json": "npm_and_yarn",
             "composer.json": "composer",
             "requirements.txt": "pip",
@@ -28,9 +35,11 @@ class Dependabot:
             "mix.exs": "hex",
             "mix.lock": "hex"
         }
+        self.rules = PackageManagerRules(self.package_managers_files.items())
 
         self.headers = {
-            'Authorization': f"Personal {os.environ['GITHUB_TOKEN']}",
+            'Authorization':
+                f"Personal {github_token or os.environ['GITHUB_TOKEN']}",
             'Cache-Control': 'no-cache',
             'Content-Type': 'application/json'
         }
@@ -38,6 +47,42 @@ class Dependabot:
         self.dependabot_request_session = requests.Session()
         self.dependabot_request_session.headers.update(self.headers)
 
+        self.update_configs = None
+        self.prune = False
+        self.tracer = Tracer()
+        self.dependabot_url = 'https://api.dependabot.com'
+
+    def load_update_configs(self):
+        self.update_configs = {}
+        url = (
+            f'{self.dependabot_url}/update_configs'
+            f'?account-id={self.account_id}&account-type=org'
+        )
+        while url:
+            response = self.dependabot_request_session.request('GET', url)
+            response.raise_for_status()
+            body = response.json()
+            for config in body.get('data', []):
+                self.index_update_config(config)
+            url = body.get('links', {}).get('next')
+        logger.info(
+            f'Dependabot: {len(self.update_configs)} repos have configs'
+        )
+
+    def index_update_config(self, config):
+        attributes = config.get('attributes', {})
+        self.update_configs.setdefault(
+            repo_id_key(attributes.get('repo-id')), {}
+        )[(
+            intern_text(attributes.get('package-manager')),
+            intern_text(attributes.get('directory'))
+        )] = config.get('id')
+
+    def get_update_configs(self, repo):
+        if self.update_configs is None:
+            return {}
+        return self.update_configs.get(repo.id, {})
+
     def has(self, filename, repo_files):
         file_list = []
         for repo_file in repo_files:
@@ -47,36 +92,109 @@ class Dependabot:
                 file_list.append(repo_file.get('name'))
         return filename in file_list
 
+    def add_rules(self, rules):
+        self.package_managers_files.update(rules)
+        self.rules = PackageManagerRules(self.package_managers_files.items())
+
     def get_package_managers(self, repo_files):
-        package_managers = []
-        for (
-            package_manager_file, package_manager
-        ) in self.package_managers_files.items():
-            if self.has(package_manager_file, repo_files):
-                package_managers.append(package_manager)
-        return set(package_managers)
+        return self.rules.classify(
+            repo_file if isinstance(repo_file, str) else repo_file.get('name')
+            for repo_file in repo_files
+        )
 
-    def add_configs_to_dependabot(self, repo, repo_files):
-        for package_manager in self.get_package_managers(repo_files):
-            data = {
-                'repo-id': repo.id,
-                'package-manager': package_manager,
-                'update-schedule': 'daily',
-                'directory': '/',
-                'account-id': self.account_id,
-                'account-type': 'org'
-            }
+    def get_config_changes(self, repo, repo_files):
+        files_by_directory = (
+            repo_files if isinstance(repo_files, dict) else {'/': repo_files}
+        )
+        wanted_configs = {
+            (package_manager, directory)
+            for directory, files in files_by_directory.items()
+            for package_manager in self.get_package_managers(files)
+        }
+        existing_configs = self.get_update_configs(repo)
+        for package_manager, directory in sorted(
+            wanted_configs & existing_configs.keys()
+        ):
             logger.info(
-                f'Dependabot: Updating config for repo: {repo.name} '
-                f'with Package manager: {package_manager}'
-            )
-            response = self.dependabot_request_session.request(
-                'POST',
-                'https://api.dependabot.com/update_configs',
-                data=json.dumps(data)
+                f"Config for repo {repo.name}. "
+                f"Dependabot Package Manager: {package_manager} "
+                f"in {directory} already exists"
             )
+        return ConfigChanges(
+            wanted_configs,
+            sorted(wanted_configs - existing_configs.keys()),
+            self.get_stale_configs(
+                existing_configs, wanted_configs, files_by_directory
+            ) if self.prune else []
+        )
 
-            self.check_for_errors(repo, package_manager, response)
+    def get_stale_configs(
+        self, existing_configs, wanted_configs, scanned_directories
+    ):
+        return [
+            (package_manager, config_id)
+            for (package_manager, directory), config_id
+            in sorted(existing_configs.items())
+            if directory in scanned_directories and
+            (package_manager, directory) not in wanted_configs
+        ]
+
+    def add_configs_to_dependabot(self, repo, repo_files):
+        changes = self.get_config_changes(repo, repo_files)
+        for package_manager, directory in changes.missing:
+            with self.tracer.span(
+                'add_config', package_manager=package_manager,
+                directory=directory
+            ):
+                self.add_config(repo, package_manager, directory)
+        for package_manager, config_id in changes.stale:
+            with self.tracer.span(
+                'remove_config', package_manager=package_manager
+            ):
+                self.remove_config(repo, package_manager, config_id)
+        return changes.wanted
+
+    def get_config_data(self, repo, package_manager, directory):
+        logger.info(
+            f'Dependabot: Updating config for repo: {repo.name} '
+            f'with Package manager: {package_manager} in {directory}'
+        )
+        return json.dumps({
+            'repo-id': repo.id,
+            'package-manager': package_manager,
+            'update-schedule': 'daily',
+            'directory': directory,
+            'account-id': self.account_id,
+            'account-type': 'org'
+        })
+
+    def add_config(self, repo, package_manager, directory='/'):
+        response = self.dependabot_request_session.request(
+            'POST',
+            f'{self.dependabot_url}/update_configs',
+            data=self.get_config_data(repo, package_manager, directory)
+        )
+
+        self.check_for_errors(repo, package_manager, response)
+
+    def remove_config(self, repo, package_manager, config_id):
+        logger.info(
+            f'Dependabot: Removing config for repo: {repo.name} '
+            f'with Package manager: {package_manager}'
+        )
+        response = self.dependabot_request_session.request(
+            'DELETE',
+            f'{self.dependabot_url}/update_configs/{config_id}'
+        )
+        self.check_removal(repo, package_manager, response)
+
+    def check_removal(self, repo, package_manager, response):
+        if response.status_code not in (200, 204):
+            self.on_error(
+                f"Failed to remove config for repo {repo.name}. "
+                f"Dependabot Package Manager: {package_manager} failed. "
+                f"(Status Code: {response.status_code}: {response.text})"
+            )
 
     def check_for_errors(self, repo, package_manager, response):
         if response.status_code == 201 and response.reason == 'Created':
@@ -108,3 +226,7 @@ class Dependabot:
                 f"Dependabot Package Manager: {package_manager} failed. "
                 f"(Status Code: {response.status_code}: {response.text})"
             )
+
+
+def repo_id_key(repo_id):
+    return None if repo_id is None else int(repo_id)
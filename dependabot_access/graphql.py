@@ -0,0 +1,79 @@
+import json
+import logging
+
+from .repository import Repository
+
+logger = logging.getLogger()
+
+REPO_FIELDS = '''
+fragment RepoFields on Repository {
+  databaseId
+  name
+  isArchived
+  viewerPermission
+  pushedAt
+  defaultBranchRef {
+    name
+  }
+  object(expression: "HEAD:") {
+    ... on Tree {
+      entries {
+        name
+      }
+    }
+  }
+}
+'''
+
+
+class GraphQL:
+    def __init__(
+        self, org_name, session, batch_size,
+        url='https://api.github.com/graphql'
+    ):
+        self.org_name = org_name
+        self.url = url
+        self.session = session
+        self.batch_size = batch_size
+
+    def build_query(self, repo_names):
+        aliases = ''.join(
+            f'  r{index}: repository(owner: {json.dumps(self.org_name)}, '
+            f'name: {json.dumps(repo_name)}) {{ ...RepoFields }}\n'
+            for index, repo_name in enumerate(repo_names)
+        )
+        return f'query {{\n{aliases}}}\n{REPO_FIELDS}'
+
+    def get_batch(self, repo_names):
+        logger.info(f'Getting {len(repo_names)} repos with GraphQL')
+        response = self.session.request(
+            'POST',
+            self.url,
+            data=json.dumps({'query': self.build_query(repo_names)})
+        )
+        response.raise_for_status()
+        data = response.json().get('data') or {}
+        return [node for node in data.values() if node is not None]
+
+    def get_repos(self, repo_names):
+        for start in range(0, len(repo_names), self.batch_size):
+            for node in self.get_batch(
+                repo_names[start:start + self.batch_size]
+            ):
+                yield repository_from_node(node), file_names_from_node(node)
+
+
+def repository_from_node(node):
+    return Repository(
+        node.get('databaseId'),
+        node.get('name'),
+        node.get('isArchived'),
+        node.get('viewerPermission') == 'ADMIN',
+        node.get('pushedAt'),
+        (node.get('defaultBranchRef') or {}).get('name')
+    )
+
+
+def file_names_from_node(node):
+    tree = node.get('object') or {}
+    return [entry.get('name') for entry in tree.get('entries', [])]
@@ -0,0 +1,125 @@
+import calendar
+import re
+import sys
+import threading
+import time
+from array import array
+
+from .repository import Repository
+
+ARCHIVED = 1
+ADMIN = 2
+MISSING = -1
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+TIMESTAMP = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)Z')
+
+
+class Inventory:
+    """Column store of the repos and file listings known to a run.
+
+    Each repo is a row across typed arrays, indexed by lower cased name.
+    Repository records are only built when asked for. Push times in
+    GitHub's usual format are stored as seconds, names already in lower
+    case double as their index key, and identical file listings are
+    stored once.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.flags = bytearray()
+        self.pushed_at = array('q')
+        self.names = []
+        self.default_branches = []
+        self.files = []
+        self.pushed_at_text = {}
+        self.listings = {}
+        self.rows_by_name = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, repo, files=None):
+        key = name_key(repo.name)
+        with self.lock:
+            row = self.rows_by_name.get(key)
+            if row is None:
+                row = self.append_row(key)
+            self.write_row(row, repo, files)
+
+    def append_row(self, key):
+        row = len(self.names)
+        self.ids.append(MISSING)
+        self.flags.append(0)
+        self.pushed_at.append(MISSING)
+        self.names.append(None)
+        self.default_branches.append(None)
+        self.files.append(None)
+        self.rows_by_name[key] = row
+        return row
+
+    def write_row(self, row, repo, files):
+        self.ids[row] = MISSING if repo.id is None else repo.id
+        self.flags[row] = (
+            (ARCHIVED if repo.archived else 0) | (ADMIN if repo.admin else 0)
+        )
+        self.pushed_at[row] = self.encode_pushed_at(row, repo.pushed_at)
+        self.names[row] = repo.name
+        self.default_branches[row] = repo.default_branch
+        self.files[row] = None if files is None else self.listing(files)
+
+    def listing(self, files):
+        files = tuple(map(sys.intern, files))
+        return self.listings.setdefault(files, files)
+
+    def encode_pushed_at(self, row, pushed_at):
+        seconds = encode_time(pushed_at)
+        if seconds is None or seconds == MISSING:
+            self.pushed_at_text[row] = pushed_at
+            return MISSING
+        self.pushed_at_text.pop(row, None)
+        return seconds
+
+    def get(self, repo_name, default=None):
+        row = self.rows_by_name.get(repo_name.lower())
+        return default if row is None else self.record(row)
+
+    def get_files(self, repo_name):
+        row = self.rows_by_name.get(repo_name.lower())
+        files = None if row is None else self.files[row]
+        return None if files is None else list(files)
+
+    def record(self, row):
+        return Repository(
+            None if self.ids[row] == MISSING else self.ids[row],
+            self.names[row],
+            bool(self.flags[row] & ARCHIVED),
+            bool(self.flags[row] & ADMIN),
+            self.decode_pushed_at(row),
+            self.default_branches[row]
+        )
+
+    def decode_pushed_at(self, row):
+        if self.pushed_at[row] == MISSING:
+            return self.pushed_at_text.get(row)
+        return format_time(self.pushed_at[row])
+
+
+def name_key(name):
+    return name if name.islower() else name.lower()
+
+
+def encode_time(text):
+    """Seconds for a UTC time in GitHub's format, or None otherwise."""
+    match = TIMESTAMP.fullmatch(text) if isinstance(text, str) else None
+    if match is None:
+        return None
+    try:
+        seconds = calendar.timegm(tuple(map(int, match.groups())))
+    except ValueError:
+        return None
+    return seconds if format_time(seconds) == text else None
+
+
+def format_time(seconds):
+    return time.strftime(TIME_FORMAT, time.gmtime(seconds))
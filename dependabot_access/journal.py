@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger()
+
+
+class Journal:
+    """Append-only log of the repos a run has finished reconciling.
+
+    Entries are written as JSON Lines and fsynced in batches, so a crash
+    loses at most the last batch. Resuming skips the repos already logged
+    with the same desired state; a line torn by a crash is ignored.
+    """
+
+    def __init__(self, path=None, resume=False, sync_every=50):
+        self.path = path
+        self.sync_every = sync_every
+        self.done = self.load() if resume else set()
+        self.file = None
+        self.unsynced = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return set()
+        with open(self.path) as f:
+            entries = [parse_entry(line) for line in f]
+        done = {entry for entry in entries if entry is not None}
+        logger.info(f'Resuming after {len(done)} reconciled repos')
+        return done
+
+    def is_done(self, repo_name, dependabot):
+        return (repo_name.lower(), dependabot) in self.done
+
+    def record(self, repo_name, dependabot):
+        if self.path is None:
+            return
+        line = json.dumps({'repo': repo_name, 'dependabot': dependabot})
+        with self.lock:
+            if self.file is None:
+                self.open_file()
+            self.file.write(line + '\n')
+            self.unsynced += 1
+            if self.unsynced >= self.sync_every:
+                self.sync()
+
+    def open_file(self):
+        if not self.done:
+            self.file = open(self.path, 'w')
+            return
+        torn = not ends_with_newline(self.path)
+        self.file = open(self.path, 'a')
+        if torn:
+            self.file.write('\n')
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.sync()
+                self.file.close()
+                self.file = None
+
+    def remove(self):
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def parse_entry(line):
+    try:
+        entry = json.loads(line)
+        return entry['repo'].lower(), entry['dependabot']
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
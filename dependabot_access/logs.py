@@ -0,0 +1,45 @@
+import logging
+import threading
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+current_repo = ContextVar('current_repo', default='-')
+
+
+class RepoFilter(logging.Filter):
+    """Tags each record with the repo being reconciled by its thread."""
+
+    def filter(self, record):
+        record.repo = current_repo.get()
+        return True
+
+
+@contextmanager
+def repo_context(repo_name):
+    token = current_repo.set(repo_name)
+    try:
+        yield
+    finally:
+        current_repo.reset(token)
+
+
+class ErrorTracker:
+    """Passes errors on, remembering which repos they were reported for."""
+
+    def __init__(self, on_error):
+        self.on_error = on_error
+        self.failed_repos = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, err):
+        with self.lock:
+            self.failed_repos.add(current_repo.get())
+        self.on_error(err)
+
+    def has_failed(self, repo_name):
+        return repo_name in self.failed_repos
+
+    def reset(self, repo_name):
+        with self.lock:
+            self.failed_repos.discard(repo_name)
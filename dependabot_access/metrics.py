@@ -0,0 +1,282 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import chain, starmap
+from urllib.parse import urlsplit
+
+from .adapters import WrappingAdapter
+
+logger = logging.getLogger()
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+ENDPOINT_TEMPLATES = [
+    (re.compile(pattern), template) for pattern, template in [
+        (r'^/repos/[^/]+/[^/]+$', '/repos/{owner}/{repo}'),
+        (r'^/repos/[^/]+/[^/]+/contents', '/repos/{owner}/{repo}/contents'),
+        (
+            r'^/repos/[^/]+/[^/]+/git/trees/',
+            '/repos/{owner}/{repo}/git/trees/{tree}'
+        ),
+        (r'^/orgs/[^/]+/repos$', '/orgs/{org}/repos'),
+        (
+            r'^/user/installations/[^/]+/repositories/[^/]+$',
+            '/user/installations/{app}/repositories/{repo}'
+        ),
+        (
+            r'^/user/installations/[^/]+/repositories$',
+            '/user/installations/{app}/repositories'
+        ),
+        (r'^/update_configs/[^/]+$', '/update_configs/{config}')
+    ]
+]
+
+
+def endpoint_template(url):
+    path = urlsplit(url).path
+    for pattern, template in ENDPOINT_TEMPLATES:
+        if pattern.match(path):
+            return template
+    return path
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            self.counts[i] += value <= bound
+        self.count += 1
+        self.sum += value
+
+
+class Metrics:
+    """Request and phase measurements for one run.
+
+    Requests are grouped by host, method and endpoint template so runs
+    over different orgs and repos produce the same series.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(Histogram)
+        self.bytes = defaultdict(lambda: [0, 0])
+        self.retries = defaultdict(int)
+        self.rate_limit_consumed = defaultdict(int)
+        self.rate_limit_remaining = {}
+        self.phases = defaultdict(lambda: [0, 0.0])
+
+    def observe_request(self, request, response, seconds):
+        url = urlsplit(request.url)
+        key = (url.hostname, request.method, endpoint_template(request.url))
+        status = response_status(response)
+        with self.lock:
+            self.requests[key + (status,)] += 1
+            self.latency[key].observe(seconds)
+            self.bytes[key][0] += len(request.body or b'')
+            self.bytes[key][1] += len(response.content or b'')
+            self.retries[key] += retry_count(response)
+            self.observe_rate_limit(url.hostname, response, status)
+
+    def observe_rate_limit(self, host, response, status):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        self.rate_limit_remaining[host] = int(remaining)
+        self.rate_limit_consumed[host] += status != 304
+
+    @contextmanager
+    def phase(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases[name][0] += 1
+                self.phases[name][1] += self.clock() - start
+
+    def summary(self):
+        with self.lock:
+            return {
+                'requests': [
+                    dict(zip(('host', 'method', 'endpoint', 'status'), key),
+                         count=count)
+                    for key, count in sorted(self.requests.items())
+                ],
+                'endpoints': [
+                    self.endpoint_summary(key) for key in sorted(self.latency)
+                ],
+                'rate_limit': {
+                    host: {
+                        'consumed': consumed,
+                        'remaining': self.rate_limit_remaining.get(host)
+                    }
+                    for host, consumed in sorted(
+                        self.rate_limit_consumed.items()
+                    )
+                },
+                'phases': {
+                    name: {'count': count, 'seconds': seconds}
+                    for name, (count, seconds) in sorted(self.phases.items())
+                }
+            }
+
+    def endpoint_summary(self, key):
+        histogram = self.latency[key]
+        return dict(
+            zip(('host', 'method', 'endpoint'), key),
+            count=histogram.count,
+            seconds=histogram.sum,
+            latency_buckets=dict(zip(
+                map(str, histogram.buckets), histogram.counts
+            )),
+            bytes_sent=self.bytes[key][0],
+            bytes_received=self.bytes[key][1],
+            retries=self.retries[key]
+        )
+
+    def prometheus(self):
+        summary = self.summary()
+        families = defaultdict(list)
+        for family, line in chain(
+            (request_sample(request) for request in summary['requests']),
+            *map(endpoint_samples, summary['endpoints']),
+            *starmap(rate_limit_samples, summary['rate_limit'].items()),
+            *starmap(phase_samples, summary['phases'].items())
+        ):
+            families[family].append(line)
+        return ''.join(
+            f'# TYPE {family[0]} {family[1]}\n' + ''.join(
+                line + '\n' for line in lines
+            )
+            for family, lines in families.items()
+        )
+
+    def save(self, prometheus_path=None, json_path=None):
+        if prometheus_path:
+            write_atomically(prometheus_path, self.prometheus())
+        if json_path:
+            write_atomically(
+                json_path, json.dumps(self.summary(), indent=2) + '\n'
+            )
+
+
+class MetricsAdapter(WrappingAdapter):
+    """Records every request that goes through the session."""
+
+    def __init__(self, adapter, metrics):
+        super().__init__(adapter)
+        self.metrics = metrics
+
+    def send(self, request, **kwargs):
+        start = self.metrics.clock()
+        response = self.adapter.send(request, **kwargs)
+        self.metrics.observe_request(
+            request, response, self.metrics.clock() - start
+        )
+        return response
+
+
+def response_status(response):
+    """Reports responses served from the cache as the 304 they were."""
+    return 304 if getattr(response, 'from_cache', False) else \
+        response.status_code
+
+
+def retry_count(response):
+    retries = getattr(response.raw, 'retries', None)
+    return len(retries.history) if retries is not None else 0
+
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+DURATION = 'dependabot_access_request_duration_seconds'
+
+
+def sample(name, labels, value):
+    label_text = ','.join(
+        f'{key}="{escape_label(value)}"' for key, value in labels.items()
+    )
+    return f'{name}{{{label_text}}} {value}'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def request_sample(request):
+    name = 'dependabot_access_requests_total'
+    return (name, COUNTER), sample(name, {
+        label: request[label]
+        for label in ('host', 'method', 'endpoint', 'status')
+    }, request['count'])
+
+
+def endpoint_samples(endpoint):
+    labels = {
+        name: endpoint[name] for name in ('host', 'method', 'endpoint')
+    }
+    buckets = dict(endpoint['latency_buckets'], **{'+Inf': endpoint['count']})
+    for bound, count in buckets.items():
+        yield (DURATION, HISTOGRAM), sample(
+            f'{DURATION}_bucket', dict(labels, le=bound), count
+        )
+    yield (DURATION, HISTOGRAM), sample(
+        f'{DURATION}_sum', labels, endpoint['seconds']
+    )
+    yield (DURATION, HISTOGRAM), sample(
+        f'{DURATION}_count', labels, endpoint['count']
+    )
+    for direction in ('sent', 'received'):
+        yield counter_sample(
+            'dependabot_access_request_bytes_total',
+            dict(labels, direction=direction), endpoint[f'bytes_{direction}']
+        )
+    yield counter_sample(
+        'dependabot_access_retries_total', labels, endpoint['retries']
+    )
+
+
+def rate_limit_samples(host, rate_limit):
+    yield counter_sample(
+        'dependabot_access_rate_limit_consumed_total', {'host': host},
+        rate_limit['consumed']
+    )
+    if rate_limit['remaining'] is not None:
+        name = 'dependabot_access_rate_limit_remaining'
+        yield (name, GAUGE), sample(
+            name, {'host': host}, rate_limit['remaining']
+        )
+
+
+def phase_samples(name, phase):
+    yield counter_sample(
+        'dependabot_access_phase_runs_total', {'phase': name}, phase['count']
+    )
+    yield counter_sample(
+        'dependabot_access_phase_seconds_total', {'phase': name},
+        phase['seconds']
+    )
+
+
+def counter_sample(name, labels, value):
+    return (name, COUNTER), sample(name, labels, value)
+
+
+def write_atomically(path, data):
+    with open(f'{path}.tmp', 'w') as f:
+        f.write(data)
+    os.replace(f'{path}.tmp', path)
+    logger.info(f'Wrote metrics to {path}')
@@ -0,0 +1,147 @@
+import json
+import logging
+import math
+import time
+
+from .dependabot import Dependabot
+from .logs import repo_context
+from .repository import Repository
+from .workers import run_bounded
+
+logger = logging.getLogger()
+
+GITHUB_ACTIONS = ('install', 'remove')
+
+# the order enforce_app_access and cease_app_access make the calls in
+ACTION_ORDER = {'install': 0, 'add_config': 1, 'remove_config': 2, 'remove': 3}
+
+RATE_LIMIT_WINDOW = 3600
+
+
+class Plan:
+    """Mutating calls a run would make, recorded instead of sent."""
+
+    def __init__(self, org_name, actions=None):
+        self.org_name = org_name
+        self.actions = actions or []
+
+    def add(self, action, repo, **details):
+        self.actions.append(
+            {'action': action, 'repo_id': repo.id, 'repo_name': repo.name,
+             **details}
+        )
+
+    def estimate(self, rate_limit, seconds_per_request, concurrency):
+        github_requests = sum(
+            action['action'] in GITHUB_ACTIONS for action in self.actions
+        )
+        seconds = len(self.actions) * seconds_per_request / concurrency
+        return {
+            'requests': {
+                'github': github_requests,
+                'dependabot': len(self.actions) - github_requests,
+                'total': len(self.actions)
+            },
+            'rate_limit': rate_limit,
+            'seconds': max(seconds, rate_limit_wait(
+                github_requests, rate_limit, time.time()
+            ))
+        }
+
+    def save(self, path, estimate):
+        with open(path, 'w') as f:
+            json.dump({
+                'org': self.org_name,
+                'estimate': estimate,
+                'actions': sorted(self.actions, key=action_order)
+            }, f, indent=2)
+        logger.info(
+            f"Plan: {estimate['requests']['total']} requests, "
+            f"estimated to take {estimate['seconds']:.0f}s, written to {path}"
+        )
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            plan = json.load(f)
+        return cls(plan['org'], plan['actions'])
+
+
+def action_order(action):
+    return action['repo_name'], ACTION_ORDER[action['action']]
+
+
+def rate_limit_wait(github_requests, rate_limit, now):
+    over_budget = github_requests - rate_limit['remaining']
+    if over_budget <= 0:
+        return 0
+    windows = math.ceil(over_budget / rate_limit['limit'])
+    return max(rate_limit['reset'] - now, 0) + (
+        (windows - 1) * RATE_LIMIT_WINDOW
+    )
+
+
+class PlanningDependabot(Dependabot):
+    """Dependabot that records config changes in a plan."""
+
+    plan = None
+
+    def add_config(self, repo, package_manager, directory='/'):
+        self.plan.add(
+            'add_config', repo,
+            package_manager=package_manager, directory=directory
+        )
+
+    def remove_config(self, repo, package_manager, config_id):
+        self.plan.add(
+            'remove_config', repo,
+            package_manager=package_manager, config_id=config_id
+        )
+
+
+APPLY_ACTIONS = {
+    'install': lambda app, repo, action: app.install_app_on_repo(
+        app.app_id, repo
+    ),
+    'remove': lambda app, repo, action: app.remove_app_on_repo(
+        app.app_id, repo
+    ),
+    'add_config': lambda app, repo, action: app.dependabot.add_config(
+        repo, action['package_manager'], action['directory']
+    ),
+    'remove_config': lambda app, repo, action: app.dependabot.remove_config(
+        repo, action['package_manager'], action['config_id']
+    )
+}
+
+
+def apply_plan(app, plan, concurrency):
+    if plan.org_name != app.org_name:
+        app.on_error(
+            f'Plan is for org {plan.org_name}, not {app.org_name}'
+        )
+        return
+    logger.info(f'Applying {len(plan.actions)} planned actions')
+    run_bounded(
+        lambda actions: apply_repo_actions(app, actions),
+        group_by_repo(plan.actions), concurrency
+    )
+
+
+def group_by_repo(actions):
+    """Each repo's actions in order, so repos can be applied in parallel."""
+    repos = {}
+    for action in sorted(actions, key=action_order):
+        repos.setdefault(action['repo_name'], []).append(action)
+    return repos.values()
+
+
+def apply_repo_actions(app, actions):
+    for action in actions:
+        apply_action(app, action)
+
+
+def apply_action(app, action):
+    repo = Repository(action['repo_id'], action['repo_name'], False, True)
+    with repo_context(action['repo_name']):
+        APPLY_ACTIONS[action['action']](app, repo, action)
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import threading
+import time
+
+from urllib.parse import urlparse
+from .adapters import WrappingAdapter
+
+logger = logging.getLogger()
+
+SECONDARY_RATE_LIMIT_WAIT = 60
+MAX_RATE_LIMIT_WAITS = 5
+
+
+class RateLimiter:
+    """Tracks the request budget left per host and token.
+
+    Once fewer than pace_below requests remain, requests are spread
+    evenly over the time left until the budget resets. Each request
+    reserves the next free slot, so concurrent callers queue behind each
+    other rather than all waking together. When the budget runs out,
+    requests wait for the reset.
+    """
+
+    def __init__(self, pace_below, clock=time.time, sleep=time.sleep):
+        self.pace_below = pace_below
+        self.clock = clock
+        self.sleep = sleep
+        self.budgets = {}
+        self.next_allowed = {}
+        self.lock = threading.Lock()
+
+    def key(self, request):
+        token = request.headers.get('Authorization', '')
+        return (
+            urlparse(request.url).hostname,
+            hashlib.sha256(token.encode()).hexdigest()[:12]
+        )
+
+    def wait(self, request):
+        delay = self.reserve(request)
+        if delay > 0:
+            self.sleep(delay)
+
+    def reserve(self, request):
+        with self.lock:
+            delay = self.take(self.key(request))
+        if delay > 0:
+            logger.info(f'Pacing requests, waiting {delay:.1f}s')
+        return delay
+
+    def take(self, key):
+        remaining, reset = self.budgets.get(key, (None, None))
+        if remaining is None or remaining >= self.pace_below:
+            return 0
+        self.budgets[key] = (max(remaining - 1, 0), reset)
+        now = self.clock()
+        interval = max(reset - now, 0) / max(remaining, 1)
+        slot = max(self.next_allowed.get(key, now), now) + interval
+        self.next_allowed[key] = slot
+        return slot - now
+
+    def update(self, request, response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        key = self.key(request)
+        with self.lock:
+            if self.budgets.get(key, (None, None))[1] != int(reset):
+                self.next_allowed.pop(key, None)
+            self.budgets[key] = (int(remaining), int(reset))
+
+    def retry_delay(self, response):
+        if not is_rate_limited(response):
+            return None
+        if 'Retry-After' in response.headers:
+            return float(response.headers['Retry-After'])
+        if 'X-RateLimit-Reset' in response.headers:
+            reset = int(response.headers['X-RateLimit-Reset'])
+            return max(reset - self.clock(), 0) + 1
+        return SECONDARY_RATE_LIMIT_WAIT
+
+
+def is_rate_limited(response):
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        'Retry-After' in response.headers or
+        response.headers.get('X-RateLimit-Remaining') == '0' or
+        'rate limit' in response.text.lower()
+    )
+
+
+class RateLimitAdapter(WrappingAdapter):
+    """Paces requests and waits out rate limits instead of failing."""
+
+    def __init__(self, adapter, limiter, max_waits=MAX_RATE_LIMIT_WAITS):
+        super().__init__(adapter)
+        self.limiter = limiter
+        self.max_waits = max_waits
+
+    def send(self, request, **kwargs):
+        response = self.attempt(request, **kwargs)
+        for _ in range(self.max_waits):
+            delay = self.limiter.retry_delay(response)
+            if delay is None:
+                return response
+            logger.warning(
+                f'Rate limited on {urlparse(request.url).hostname}, '
+                f'waiting {delay:.0f}s'
+            )
+            self.limiter.sleep(delay)
+            response = self.attempt(request, **kwargs)
+        return response
+
+    def attempt(self, request, **kwargs):
+        self.limiter.wait(request)
+        response = self.adapter.send(request, **kwargs)
+        self.limiter.update(request, response)
+        return response
@@ -0,0 +1,54 @@
+import sys
+
+REPOSITORY_FIELDS = (
+    'id', 'name', 'archived', 'admin', 'pushed_at', 'default_branch'
+)
+
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Repository:
+    """Compact record of the repository fields the tool reads.
+
+    Uses slots rather than a per-instance dict, and interns branch names,
+    which repeat across most records. Names are unique, so interning them
+    would only grow the interpreter's intern table.
+    """
+
+    __slots__ = REPOSITORY_FIELDS
+
+    def __init__(
+        self, id, name, archived, admin, pushed_at=None, default_branch=None
+    ):
+        self.id = id
+        self.name = name
+        self.archived = archived
+        self.admin = admin
+        self.pushed_at = pushed_at
+        self.default_branch = intern_text(default_branch)
+
+    def astuple(self):
+        return tuple(getattr(self, field) for field in REPOSITORY_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, Repository):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return 'Repository({})'.format(', '.join(
+            f'{field}={getattr(self, field)!r}' for field in REPOSITORY_FIELDS
+        ))
+
+
+def repository_from_json(repo_content):
+    return Repository(
+        repo_content.get('id'),
+        repo_content.get('name'),
+        repo_content.get('archived'),
+        repo_content.get('permissions').get('admin'),
+        repo_content.get('pushed_at'),
+        repo_content.get('default_branch')
+    )
@@ -0,0 +1,61 @@
+import logging
+import threading
+
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger()
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# POST is retried because the only POST made creates a Dependabot config,
+# and a config created by an earlier attempt is reported as already existing
+RETRY_METHODS = frozenset(['GET', 'PUT', 'DELETE', 'POST'])
+
+
+class RetryStats:
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def increment(self):
+        with self.lock:
+            self.count += 1
+
+
+class LoggingRetry(Retry):
+    """Retry that logs every retry and counts it in shared stats."""
+
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or RetryStats()
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.stats = self.stats
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        retry = super().increment(
+            method, url, response, error, _pool, _stacktrace
+        )
+        self.stats.increment()
+        reason = error or f'status {response.status}'
+        logger.warning(
+            f'Retrying {method} {url} after {reason} '
+            f'(attempt {len(retry.history) + 1})'
+        )
+        return retry
+
+
+def build_retry(retries, backoff, backoff_max, jitter, stats):
+    return LoggingRetry(
+        total=retries,
+        backoff_factor=backoff,
+        backoff_max=backoff_max,
+        backoff_jitter=jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+        stats=stats
+    )
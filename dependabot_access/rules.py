@@ -0,0 +1,79 @@
+import json
+import re
+
+from fnmatch import translate
+
+WILDCARDS = re.compile(r'[*?\[]')
+
+
+class PackageManagerRules:
+    """Filename patterns compiled into exact name, suffix and glob indexes.
+
+    Patterns without wildcards match a filename exactly, patterns of the
+    form "*<suffix>" match on the suffix and anything else is matched as
+    a glob.
+    """
+
+    def __init__(self, rules):
+        self.exact = {}
+        self.suffixes = {}
+        self.globs = []
+        for pattern, package_manager in rules:
+            self.add(pattern, package_manager)
+        self.scans = self.compile_scans()
+
+    def compile_scans(self):
+        scans = []
+        if self.suffixes:
+            scans.append((any_of(
+                re.escape(suffix) + r'\Z' for suffix in self.suffixes
+            ).search, self.match_suffixes))
+        if self.globs:
+            scans.append((any_of(
+                glob.pattern for glob, _ in self.globs
+            ).match, self.match_globs))
+        return scans
+
+    def add(self, pattern, package_manager):
+        if not WILDCARDS.search(pattern):
+            self.exact.setdefault(pattern, set()).add(package_manager)
+        elif pattern.startswith('*') and not WILDCARDS.search(pattern[1:]):
+            self.suffixes.setdefault(pattern[1:], set()).add(package_manager)
+        else:
+            self.globs.append(
+                (re.compile(translate(pattern)), package_manager)
+            )
+
+    def classify(self, names):
+        names = set(names)
+        package_managers = set()
+        for name in names & self.exact.keys():
+            package_managers |= self.exact[name]
+        for prefilter, match in self.scans:
+            for name in filter(prefilter, names):
+                package_managers |= match(name)
+        return package_managers
+
+    def match_suffixes(self, name):
+        return set().union(*(
+            package_managers
+            for suffix, package_managers in self.suffixes.items()
+            if name.endswith(suffix)
+        ))
+
+    def match_globs(self, name):
+        return {
+            package_manager for glob, package_manager in self.globs
+            if glob.match(name)
+        }
+
+
+def any_of(patterns):
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+def load_rules(path):
+    with open(path) as f:
+        return [
+            (rule['pattern'], rule['package-manager']) for rule in json.load(f)
+        ]
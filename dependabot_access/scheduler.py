@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger()
+
+NEVER_CONFIGURED = 16
+MISSED_LAST_RUN = 8
+LAST_RUN_FAILED = 4
+DESIRED_CHANGED = 2
+PUSHED_SINCE_LAST_RUN = 1
+
+
+def priority(entry, dependabot, repo):
+    if entry is None:
+        return NEVER_CONFIGURED
+    return (
+        (MISSED_LAST_RUN if entry.get('missed') else 0) +
+        (LAST_RUN_FAILED if entry.get('failed') else 0) +
+        (DESIRED_CHANGED if entry.get('dependabot') != dependabot else 0) +
+        (PUSHED_SINCE_LAST_RUN if repo is not None and
+            repo.pushed_at != entry.get('pushed_at') else 0)
+    )
+
+
+def prioritize(work, state_repos, repos):
+    """Orders work so the repos most likely to need changes come first.
+
+    Repos the state has no record of come first, then those the last
+    run's deadline stopped it reaching, then those that failed, changed in
+    the access file or were pushed to since the last run.
+    Ties go to the most recently pushed repos, if they were prefetched,
+    and otherwise keep their order in the access file.
+    """
+    def key(item):
+        repo_name, dependabot = item
+        repo = repos.get(repo_name.lower())
+        return (
+            priority(state_repos.get(repo_name.lower()), dependabot, repo),
+            (repo.pushed_at or '') if repo is not None else ''
+        )
+    return sorted(work, key=key, reverse=True)
+
+
+class Deadline:
+    """Time budget for a run, counted from when it is created.
+
+    Repos reached after it has passed are skipped and reported, so they
+    can be picked up by the next run.
+    """
+
+    def __init__(self, seconds=None, clock=time.monotonic):
+        self.clock = clock
+        self.end = None if seconds is None else clock() + seconds
+        self.missed = []
+        self.lock = threading.Lock()
+
+    def expired(self):
+        return self.end is not None and self.clock() >= self.end
+
+    def miss(self, repo_name):
+        with self.lock:
+            self.missed.append(repo_name)
+
+    def report(self):
+        if not self.missed:
+            return
+        logger.warning(
+            f'Deadline reached, {len(self.missed)} repos were not '
+            'reconciled'
+        )
+        for repo_name in self.missed:
+            logger.info(f'Not reconciled: {repo_name}')
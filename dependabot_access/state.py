@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger()
+
+
+class State:
+    """Per-repo record of what the last run applied.
+
+    A repo is skipped while its desired state matches the last applied
+    one and it hasn't been pushed to since. Repos that reported errors
+    are never skipped.
+    """
+
+    def __init__(self, path=None, full=False, errors=None):
+        self.path = path
+        self.full = full
+        self.errors = errors
+        self.lock = threading.Lock()
+        self.repos = self.load()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f).get('repos', {})
+
+    def save(self):
+        if self.path is None:
+            return
+        with self.lock:
+            data = json.dumps({'repos': self.repos}, sort_keys=True)
+        with open(f'{self.path}.tmp', 'w') as f:
+            f.write(data)
+        os.replace(f'{self.path}.tmp', self.path)
+        logger.info(f'Saved state for {len(self.repos)} repos')
+
+    def is_current(self, repo_name, repo, dependabot):
+        entry = self.repos.get(repo_name.lower())
+        return not self.full and entry is not None and (
+            repo.pushed_at is not None and
+            entry.get('dependabot') == dependabot and
+            entry.get('pushed_at') == repo.pushed_at and
+            not entry.get('failed')
+        )
+
+    def record_missed(self, repo_name):
+        with self.lock:
+            entry = self.repos.get(repo_name.lower())
+            if entry is not None:
+                self.repos[repo_name.lower()] = dict(entry, missed=True)
+
+    def clear_missed(self, repo_name):
+        with self.lock:
+            entry = self.repos.get(repo_name.lower())
+            if entry is not None and entry.get('missed'):
+                self.repos[repo_name.lower()] = {
+                    key: value for key, value in entry.items()
+                    if key != 'missed'
+                }
+
+    def forget(self, repo_name):
+        with self.lock:
+            self.repos.pop(repo_name.lower(), None)
+
+    def has_failed(self, repo_name):
+        return self.errors is not None and self.errors.has_failed(repo_name)
+
+    def record(self, repo_name, repo, dependabot, package_managers=()):
+        if self.path is None:
+            return
+        entry = {
+            'dependabot': dependabot,
+            'pushed_at': repo.pushed_at,
+            'package_managers': sorted(package_managers),
+            'failed': self.has_failed(repo_name)
+        }
+        with self.lock:
+            self.repos[repo_name.lower()] = entry
@@ -0,0 +1,79 @@
+import json
+
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+class JSONArrayReader:
+    """Yields the items of a top level JSON array as they are read."""
+
+    def __init__(self, f, chunk_size=64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+
+    def __iter__(self):
+        self.expect('[')
+        if self.peek() == ']':
+            return
+        while True:
+            yield self.read_value()
+            if self.expect(',', ']') == ']':
+                return
+
+    def fill(self, size=None):
+        chunk = self.f.read(size or self.chunk_size)
+        self.buffer += chunk
+        return bool(chunk)
+
+    def peek(self):
+        self.buffer = self.buffer.lstrip()
+        while not self.buffer and self.fill():
+            self.buffer = self.buffer.lstrip()
+        return self.buffer[:1]
+
+    def expect(self, *chars):
+        char = self.peek()
+        if char not in chars or not char:
+            raise ValueError(
+                f"Expected one of {', '.join(chars)} in access file, "
+                f"found {char or 'end of file'}"
+            )
+        self.buffer = self.buffer[1:]
+        return char
+
+    def decode(self):
+        try:
+            return self.decoder.raw_decode(self.buffer)
+        except json.JSONDecodeError:
+            return None
+
+    def read_value(self):
+        """Decodes the next value, reading more until it is complete.
+
+        Each read doubles the buffer, so a value spanning many chunks is
+        decoded a logarithmic number of times rather than once per chunk.
+        """
+        self.peek()
+        decoded = self.decode()
+        while decoded is None or decoded[1] == len(self.buffer):
+            if not self.fill(max(self.chunk_size, len(self.buffer))):
+                break
+            decoded = self.decode()
+        if decoded is None:
+            raise ValueError('Invalid JSON in access file')
+        value, end = decoded
+        self.buffer = self.buffer[end:]
+        return value
+
+
+def read_json_lines(f):
+    return (json.loads(line) for line in f if line.strip())
+
+
+def stream_access(path):
+    with open(path, 'r') as f:
+        if path.endswith(JSON_LINES_SUFFIXES):
+            yield from read_json_lines(f)
+        else:
+            yield from JSONArrayReader(f)
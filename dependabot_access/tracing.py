@@ -0,0 +1,238 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+import requests
+
+from .adapters import WrappingAdapter
+from .logs import current_repo
+from .metrics import endpoint_template
+
+logger = logging.getLogger()
+
+current_span = ContextVar('current_span', default=None)
+
+OTLP_STATUS_ERROR = 2
+OTLP_KIND_INTERNAL = 1
+OTLP_KIND_CLIENT = 3
+
+
+class NoopSpan:
+    """Stands in for a span when tracing is off, doing nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    def __init__(self, tracer, name, kind, attributes):
+        parent = current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent else random_id(128)
+        self.span_id = random_id(64)
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = None
+        self.end_time = None
+        self.error = None
+
+    def __enter__(self):
+        self.start_time = time.time_ns()
+        self.token = current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.end_time = time.time_ns()
+        current_span.reset(self.token)
+        if exc is not None:
+            self.error = f'{exc_type.__name__}: {exc}'
+        self.tracer.exporter.export(self)
+        return False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+
+class Tracer:
+    """Creates spans, or no-op spans when there is no exporter."""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self):
+        return self.exporter is not None
+
+    def span(self, name, kind=OTLP_KIND_INTERNAL, **attributes):
+        if self.exporter is None:
+            return NOOP_SPAN
+        attributes.setdefault('repo', current_repo.get())
+        return Span(self, name, kind, attributes)
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+class JSONLinesExporter:
+    """Appends each finished span to a file as one JSON object."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.as_dict(), sort_keys=True) + '\n'
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a')
+            self.file.write(line)
+
+    def shutdown(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class OTLPExporter:
+    """Sends spans in batches to an OTLP/HTTP collector as JSON."""
+
+    def __init__(
+        self, endpoint, batch_size=512, session=None, timeout=10,
+        service_name='dependabot-access'
+    ):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.batch_size = batch_size
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.service_name = service_name
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def export(self, span):
+        with self.lock:
+            self.spans.append(span)
+            if len(self.spans) < self.batch_size:
+                return
+            spans, self.spans = self.spans, []
+        self.send(spans)
+
+    def shutdown(self):
+        with self.lock:
+            spans, self.spans = self.spans, []
+        if spans:
+            self.send(spans)
+
+    def send(self, spans):
+        try:
+            response = self.session.post(
+                self.url, json=self.payload(spans), timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as err:
+            logger.warning(f'Failed to export {len(spans)} spans: {err}')
+
+    def payload(self, spans):
+        return {'resourceSpans': [{
+            'resource': {'attributes': otlp_attributes({
+                'service.name': self.service_name
+            })},
+            'scopeSpans': [{
+                'scope': {'name': 'dependabot_access'},
+                'spans': [otlp_span(span) for span in spans]
+            }]
+        }]}
+
+
+class TracingAdapter(WrappingAdapter):
+    """Wraps each request in a client span."""
+
+    def __init__(self, adapter, tracer):
+        super().__init__(adapter)
+        self.tracer = tracer
+
+    def send(self, request, **kwargs):
+        with self.tracer.span(
+            f'{request.method} {endpoint_template(request.url)}',
+            OTLP_KIND_CLIENT,
+            **{'http.method': request.method, 'http.url': request.url}
+        ) as span:
+            response = self.adapter.send(request, **kwargs)
+            span.set_attribute('http.status_code', response.status_code)
+            return response
+
+
+def config_names(configs):
+    """Names (package manager, directory) pairs for a span attribute."""
+    return sorted(
+        f'{package_manager}:{directory}'
+        for package_manager, directory in configs
+    )
+
+
+def random_id(bits):
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+def otlp_span(span):
+    data = {
+        'traceId': span.trace_id,
+        'spanId': span.span_id,
+        'name': span.name,
+        'kind': span.kind,
+        'startTimeUnixNano': str(span.start_time),
+        'endTimeUnixNano': str(span.end_time),
+        'attributes': otlp_attributes(span.attributes)
+    }
+    if span.parent_id:
+        data['parentSpanId'] = span.parent_id
+    if span.error:
+        data['status'] = {'code': OTLP_STATUS_ERROR, 'message': span.error}
+    return data
+
+
+def otlp_attributes(attributes):
+    return [
+        {'key': key, 'value': otlp_value(value)}
+        for key, value in attributes.items()
+    ]
+
+
+def otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return {'arrayValue': {
+            'values': [otlp_value(item) for item in sorted(value)]
+        }}
+    return {'stringValue': str(value)}
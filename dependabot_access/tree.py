@@ -0,0 +1,40 @@
+from fnmatch import fnmatch
+
+
+class TreeScan:
+    """Which directories of a repo's git tree to look for manifests in.
+
+    Directories deeper than max_depth (the root is depth 0) are skipped,
+    as are directories where the path or name of the directory itself or
+    one of its parents matches an exclude pattern.
+    """
+
+    def __init__(self, max_depth, exclude=()):
+        self.max_depth = max_depth
+        self.exclude = list(exclude)
+
+    def includes_directory(self, directory):
+        parts = directory.split('/') if directory else []
+        return len(parts) <= self.max_depth and not any(
+            self.is_excluded(parts, depth) for depth in range(len(parts))
+        )
+
+    def is_excluded(self, parts, depth):
+        path = '/'.join(parts[:depth + 1])
+        return any(
+            fnmatch(path, pattern) or fnmatch(parts[depth], pattern)
+            for pattern in self.exclude
+        )
+
+    def group(self, paths):
+        included = {}
+        files_by_directory = {}
+        for path in paths:
+            directory, _, name = path.rpartition('/')
+            if directory not in included:
+                included[directory] = self.includes_directory(directory)
+            if included[directory]:
+                files_by_directory.setdefault(
+                    f'/{directory}', []
+                ).append(name)
+        return files_by_directory
@@ -0,0 +1,221 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import posixpath
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .logs import repo_context
+from .workers import run_bounded
+
+logger = logging.getLogger()
+
+REPOSITORY_ACTIONS = {'created', 'unarchived', 'transferred', 'renamed'}
+
+
+def verify_signature(secret, body, signature):
+    expected = 'sha256=' + hmac.new(
+        secret.encode('utf-8'), body, hashlib.sha256
+    ).hexdigest()
+    return signature is not None and hmac.compare_digest(expected, signature)
+
+
+def repository_event_repos(payload, app):
+    if payload.get('action') not in REPOSITORY_ACTIONS:
+        return []
+    return [payload['repository']['name']]
+
+
+def push_event_repos(payload, app):
+    repository = payload['repository']
+    if payload.get('ref') != f"refs/heads/{repository['default_branch']}":
+        return []
+    paths = {
+        path
+        for commit in payload.get('commits', [])
+        for key in ('added', 'modified', 'removed')
+        for path in commit.get(key, [])
+    }
+    if not touches_manifests(paths, app):
+        return []
+    return [repository['name']]
+
+
+def touches_manifests(paths, app):
+    return bool(app.dependabot.rules.classify(
+        posixpath.basename(path) for path in paths
+        if app.tree_scan is not None or '/' not in path
+    ))
+
+
+def installation_event_repos(payload, app):
+    return [
+        repository['name']
+        for key in ('repositories_added', 'repositories_removed')
+        for repository in payload.get(key, [])
+    ]
+
+
+EVENT_REPOS = {
+    'repository': repository_event_repos,
+    'push': push_event_repos,
+    'installation_repositories': installation_event_repos
+}
+
+
+class Debouncer:
+    """Holds keys back until they have been quiet for a while.
+
+    Each new event for a key pushes its deadline back, up to max_delay
+    after the first one, so a steady stream of events can't starve it.
+    """
+
+    def __init__(self, delay, max_delay=None, clock=time.monotonic):
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else delay * 6
+        self.clock = clock
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def add(self, key):
+        now = self.clock()
+        with self.lock:
+            first, _ = self.pending.get(key, (now, now))
+            self.pending[key] = (first, now)
+
+    def pop_due(self):
+        now = self.clock()
+        with self.lock:
+            due = [
+                key for key, (first, last) in self.pending.items()
+                if min(last + self.delay, first + self.max_delay) <= now
+            ]
+            for key in due:
+                del self.pending[key]
+        return due
+
+
+class WebhookDaemon:
+    """Reconciles the repos named by webhook deliveries as they arrive.
+
+    Only repos in the access file are reconciled. The access file is
+    reloaded when it changes, and repos whose desired state changed are
+    reconciled too. Queued repos are always reconciled, even if the state
+    file says they are unchanged, as events like the app being removed
+    from a repo don't change when it was pushed to.
+    """
+
+    def __init__(
+        self, app, load_access, access_path, secret, debouncer,
+        concurrency=1
+    ):
+        self.app = app
+        self.load_access = load_access
+        self.access_path = access_path
+        self.secret = secret
+        self.debouncer = debouncer
+        self.concurrency = concurrency
+        self.desired = {}
+        self.access_mtime = None
+
+    def handle_delivery(self, event, payload):
+        handler = EVENT_REPOS.get(event)
+        repo_names = handler(payload, self.app) if handler else []
+        for repo_name in repo_names:
+            logger.info(f'Queueing {repo_name} after {event} event')
+            self.debouncer.add(repo_name.lower())
+        return repo_names
+
+    def reload_access(self):
+        mtime = os.stat(self.access_path).st_mtime
+        if mtime == self.access_mtime:
+            return
+        desired = {
+            repo_name.lower(): (repo_name, dependabot)
+            for repo_name, dependabot
+            in self.app.compile(self.load_access()).work
+        }
+        for key, work in desired.items():
+            if self.access_mtime is not None and self.desired.get(key) != work:
+                self.debouncer.add(key)
+        self.desired, self.access_mtime = desired, mtime
+
+    def tick(self):
+        try:
+            self.reload_access()
+        except Exception as err:
+            logger.error(
+                f'Failed to reload {self.access_path}, '
+                f'keeping the access loaded before: {err}'
+            )
+        due = self.debouncer.pop_due()
+        if due:
+            run_bounded(self.reconcile, due, self.concurrency)
+            self.app.state.save()
+
+    def reconcile(self, key):
+        work = self.desired.get(key)
+        if work is None:
+            logger.info(f'Repo {key} is not in the access file, ignoring it')
+            return
+        self.app.state.forget(work[0])
+        self.app.on_error.reset(work[0])
+        try:
+            self.app.reconcile(*work)
+        except Exception as err:
+            with repo_context(work[0]):
+                self.app.on_error(f'Failed to reconcile {work[0]}: {err}')
+
+    def serve(self, host, port, interval=1):
+        self.reload_access()
+        server = ThreadingHTTPServer((host, port), WebhookHandler)
+        server.daemon_threads = True
+        server.webhooks = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f'Listening for webhooks on {host}:{port}')
+        try:
+            while True:
+                time.sleep(interval)
+                self.tick()
+        finally:
+            server.shutdown()
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        webhooks = self.server.webhooks
+        if not verify_signature(
+            webhooks.secret, body, self.headers.get('X-Hub-Signature-256')
+        ):
+            return self.respond(401, 'invalid signature')
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self.respond(400, 'invalid JSON')
+        self.deliver(webhooks, payload)
+
+    def deliver(self, webhooks, payload):
+        try:
+            webhooks.handle_delivery(
+                self.headers.get('X-GitHub-Event'), payload
+            )
+        except (KeyError, TypeError, AttributeError) as err:
+            logger.error(f'Ignoring unexpected webhook payload: {err!r}')
+            return self.respond(400, 'unexpected payload')
+        self.respond(202, 'accepted')
+
+    def respond(self, status, message):
+        payload = json.dumps({'message': message}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
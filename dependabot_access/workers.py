@@ -0,0 +1,36 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def run_bounded(function, items, concurrency):
+    """Calls function on each item using a pool of concurrency threads.
+
+    Items are pulled from the iterable only as workers free up, so lazily
+    produced items are never all held in memory, and one slow item
+    doesn't hold up the rest. The first exception raised cancels the work
+    not yet started and is re-raised.
+    """
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix='repo'
+    ) as executor:
+        pending = set()
+        try:
+            for item in items:
+                pending.add(executor.submit(function, item))
+                pending = drain(pending, concurrency * 2)
+            drain(pending, 0)
+        except BaseException:
+            cancel(pending)
+            raise
+
+
+def drain(pending, limit):
+    while len(pending) > limit:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            future.result()
+    return pending
+
+
+def cancel(pending):
+    for future in pending:
+        future.cancel()
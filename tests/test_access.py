@@ -3,7 +3,8 @@ import os
 import unittest
 from unittest.mock import Mock, patch, mock_open, ANY
 
-from dependabot_access.access import configure_app
+from dependabot_access.access import configure_app, finish_journal
+from dependabot_access.client import PooledHTTPAdapter
 
 
 class TestAccess(unittest.TestCase):
@@ -120,5 +121,307 @@ class TestAccess(unittest.TestCase):
             )
             mocked_open.assert_called_once_with('test-file.json', 'r')
             patch_app.return_value.configure.assert_called_once_with(
-                config
+                config, concurrency=1
             )
+
+    @patch('dependabot_access.access.App')
+    def test_base_urls(self, patch_app):
+        with patch(
+            'dependabot_access.access.open',
+            mock_open(read_data='[]'),
+            create=True
+        ):
+            with patch.dict(
+                'dependabot_access.access.os.environ',
+                {'GITHUB_TOKEN': 'test-github-token'}
+            ):
+                # when
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'test-file.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--github-url', 'http://localhost:8080/',
+                    '--dependabot-url', 'http://localhost:8081'
+                ], 'test-github-token')
+
+        # then
+        app = patch_app.return_value
+        dependabot = patch_app.call_args[0][5]
+        assert app.github_url == 'http://localhost:8080'
+        assert dependabot.dependabot_url == 'http://localhost:8081'
+        prefix, adapter = app.github_request_session.mount.call_args_list[
+            0
+        ][0]
+        assert prefix == 'http://'
+        assert isinstance(adapter, PooledHTTPAdapter)
+
+    @patch('dependabot_access.access.App')
+    def test_prefetch_installations(self, patch_app):
+        with patch(
+            'dependabot_access.access.open',
+            mock_open(read_data='[]'),
+            create=True
+        ):
+            with patch.dict(
+                'dependabot_access.access.os.environ',
+                {'GITHUB_TOKEN': 'test-github-token'}
+            ):
+                # when
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'test-file.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--prefetch-installations'
+                ], 'test-github-token')
+
+        # then
+        patch_app.return_value.load_installed_repos.assert_called_once_with()
+
+    @patch('dependabot_access.access.App')
+    def test_graphql_batch_size(self, patch_app):
+        # given
+        config = [
+            {'repos': ['repo-a', 'repo-b']},
+            {'repos': ['repo-a']}
+        ]
+
+        with patch(
+            'dependabot_access.access.open',
+            mock_open(read_data=json.dumps(config)),
+            create=True
+        ):
+            with patch.dict(
+                'dependabot_access.access.os.environ',
+                {'GITHUB_TOKEN': 'test-github-token'}
+            ):
+                # when
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'test-file.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--graphql-batch-size', '50'
+                ], 'test-github-token')
+
+        # then
+        patch_app.return_value.load_repos_with_graphql.assert_called_once_with(
+            ['repo-a', 'repo-b'], 50
+        )
+
+    @patch('dependabot_access.access.apply_plan')
+    @patch('dependabot_access.access.Plan')
+    @patch('dependabot_access.access.App')
+    def test_apply(self, patch_app, plan, apply_plan):
+        with patch.dict(
+            'dependabot_access.access.os.environ',
+            {'GITHUB_TOKEN': 'test-github-token'}
+        ):
+            # when
+            configure_app([
+                '--org', 'test-org',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--apply', 'plan.json',
+                '--concurrency', '4'
+            ], 'test-github-token')
+
+        # then
+        plan.load.assert_called_once_with('plan.json')
+        apply_plan.assert_called_once_with(
+            patch_app.return_value, plan.load.return_value, 4
+        )
+        patch_app.return_value.configure.assert_not_called()
+
+    def test_access_required_without_apply(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--dependabot-id', '123456',
+                '--account-id', '7890'
+            ], 'test-github-token')
+
+    @patch('dependabot_access.access.State')
+    @patch('dependabot_access.access.Plan')
+    @patch('dependabot_access.access.PlanningApp')
+    @patch('dependabot_access.access.App')
+    def test_plan(self, patch_app, planning_app, plan, state):
+        with patch(
+            'dependabot_access.access.open',
+            mock_open(read_data='[]'),
+            create=True
+        ):
+            with patch.dict(
+                'dependabot_access.access.os.environ',
+                {'GITHUB_TOKEN': 'test-github-token'}
+            ):
+                # when
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'test-file.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--plan', 'plan.json'
+                ], 'test-github-token')
+
+        # then
+        patch_app.assert_not_called()
+        app = planning_app.return_value
+        app.load_installed_repos.assert_called_once_with()
+        app.dependabot.load_update_configs.assert_called_once_with()
+        app.plan.save.assert_called_once_with(
+            'plan.json', app.plan.estimate.return_value
+        )
+        state.return_value.save.assert_not_called()
+
+    @patch('dependabot_access.access.stream_access')
+    @patch('dependabot_access.access.App')
+    def test_stream_access(self, patch_app, stream_access):
+        with patch.dict(
+            'dependabot_access.access.os.environ',
+            {'GITHUB_TOKEN': 'test-github-token'}
+        ):
+            # when
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.jsonl',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--stream-access'
+            ], 'test-github-token')
+
+        # then
+        stream_access.assert_called_once_with('access.jsonl')
+        patch_app.return_value.configure.assert_called_once_with(
+            stream_access.return_value, concurrency=1
+        )
+
+    def test_stream_access_with_graphql(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.jsonl',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--stream-access',
+                '--graphql-batch-size', '50'
+            ], 'test-github-token')
+
+    def test_resume_without_journal(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.json',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--resume'
+            ], 'test-github-token')
+
+    def test_concurrency_below_one(self):
+        for concurrency in ('0', '-1'):
+            with self.assertRaises(SystemExit):
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'access.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--concurrency', concurrency
+                ], 'test-github-token')
+
+    def test_shard_index_without_count(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.json',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--shard-index', '1'
+            ], 'test-github-token')
+
+    def test_shard_index_out_of_range(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.json',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--shard-index', '3',
+                '--shard-count', '3'
+            ], 'test-github-token')
+
+    @patch('dependabot_access.aio.AsyncApp')
+    @patch('dependabot_access.aio.AsyncDependabot')
+    def test_async_transport(self, async_dependabot, async_app):
+        with patch(
+            'dependabot_access.access.open',
+            mock_open(read_data='[]'),
+            create=True
+        ):
+            with patch.dict(
+                'dependabot_access.access.os.environ',
+                {'GITHUB_TOKEN': 'test-github-token'}
+            ):
+                # when
+                configure_app([
+                    '--org', 'test-org',
+                    '--access', 'test-file.json',
+                    '--dependabot-id', '123456',
+                    '--account-id', '7890',
+                    '--async-transport',
+                    '--max-connections', '4'
+                ], 'test-github-token')
+
+        # then
+        async_app.assert_called_once_with(
+            'test-org', 'test-github-token', '123456', '7890', ANY,
+            async_dependabot.return_value
+        )
+        assert async_app.return_value.max_connections == 4
+        async_app.return_value.configure.assert_called_once_with(
+            [], concurrency=1
+        )
+
+    def test_async_transport_with_plan(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.json',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--async-transport',
+                '--plan', 'plan.json'
+            ], 'test-github-token')
+
+    def test_async_transport_with_cache_dir(self):
+        with self.assertRaises(SystemExit):
+            configure_app([
+                '--org', 'test-org',
+                '--access', 'access.json',
+                '--dependabot-id', '123456',
+                '--account-id', '7890',
+                '--async-transport',
+                '--cache-dir', 'cache'
+            ], 'test-github-token')
+
+    def test_finish_journal(self):
+        # given
+        journal = Mock()
+        deadline = Mock(missed=[])
+
+        # when
+        finish_journal(journal, deadline)
+
+        # then
+        journal.remove.assert_called_once_with()
+
+    def test_finish_journal_keeps_it_after_deadline(self):
+        # given
+        journal = Mock()
+        deadline = Mock(missed=['repo-b'])
+
+        # when
+        finish_journal(journal, deadline)
+
+        # then
+        journal.remove.assert_not_called()
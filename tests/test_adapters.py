@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+from dependabot_access.adapters import WrappingAdapter, wrap_session
+
+
+class TestAdapters(unittest.TestCase):
+
+    def test_wrap_session(self):
+        # given
+        session = requests.Session()
+        adapter = session.get_adapter('https://')
+
+        # when
+        wrap_session(session, WrappingAdapter)
+
+        # then
+        wrapper = session.get_adapter('https://api.github.com/')
+        assert isinstance(wrapper, WrappingAdapter)
+        assert wrapper.adapter is adapter
+
+    def test_wrapping_adapter_delegates(self):
+        # given
+        adapter = Mock()
+        wrapper = WrappingAdapter(adapter)
+        request = Mock()
+
+        # when
+        response = wrapper.send(request, timeout=5)
+        wrapper.close()
+
+        # then
+        adapter.send.assert_called_once_with(request, timeout=5)
+        assert response is adapter.send.return_value
+        adapter.close.assert_called_once_with()
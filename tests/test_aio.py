@@ -0,0 +1,219 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, Mock, patch, ANY
+
+from dependabot_access.aio import (
+    AsyncApp, AsyncDependabot, AsyncResponse, AsyncTransport
+)
+from dependabot_access.client import ClientFactory
+from dependabot_access.metrics import Metrics
+from dependabot_access.ratelimit import RateLimiter
+from dependabot_access.repository import Repository
+from dependabot_access.retry import RetryStats, build_retry
+
+
+def make_response(status_code, body=None, reason_phrase='OK'):
+    response = Mock()
+    response.status_code = status_code
+    response.reason_phrase = reason_phrase
+    response.json.return_value = body
+    response.content = json.dumps(body).encode()
+    return AsyncResponse(response)
+
+
+def make_httpx_response(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.reason_phrase = 'Created' if status_code == 201 else 'OK'
+    response.headers = headers or {}
+    response.content = b''
+    response.text = ''
+    response.from_cache = False
+    return response
+
+
+def make_client_factory(metrics=None):
+    return ClientFactory(
+        build_retry(2, 0, 0, 0, RetryStats()), (10, 60),
+        limiter=RateLimiter(100), metrics=metrics or Metrics()
+    )
+
+
+class TestAio(unittest.TestCase):
+
+    def setUp(self):
+        self._app_id = '12345678'
+        self._org_name = 'fake_org'
+        self._repo = Repository(1, 'repo-a', False, True)
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_enforce_app_access(self):
+        # given
+        dependabot = AsyncDependabot('4444', Mock())
+        dependabot.transport = AsyncMock()
+        dependabot.transport.request.return_value = make_response(
+            201, reason_phrase='Created'
+        )
+        app = AsyncApp(
+            self._org_name, ANY, self._app_id, ANY, Mock(), dependabot
+        )
+        app.transport = AsyncMock()
+        app.transport.request.side_effect = [
+            make_response(200, {
+                'id': 1,
+                'name': 'repo-a',
+                'archived': False,
+                'permissions': {'admin': True}
+            }),
+            make_response(204),
+            make_response(200, [{'name': 'Dockerfile'}])
+        ]
+
+        # when
+        asyncio.run(app.async_enforce_app_access('repo-a'))
+
+        # then
+        assert [
+            call.args for call in app.transport.request.call_args_list
+        ] == [
+            ('GET', f'https://api.github.com/repos/{self._org_name}/repo-a'),
+            (
+                'PUT',
+                f'https://api.github.com/user/installations/{self._app_id}/'
+                'repositories/1'
+            ),
+            (
+                'GET',
+                f'https://api.github.com/repos/{self._org_name}/repo-a'
+                '/contents'
+            )
+        ]
+        dependabot.transport.request.assert_called_once_with(
+            'POST',
+            'https://api.dependabot.com/update_configs',
+            data=json.dumps({
+                'repo-id': 1,
+                'package-manager': 'docker',
+                'update-schedule': 'daily',
+                'directory': '/',
+                'account-id': '4444',
+                'account-type': 'org'
+            })
+        )
+        app.on_error.assert_not_called()
+        dependabot.on_error.assert_not_called()
+
+    def test_remove_app_on_repo_error(self):
+        # given
+        mock_error = Mock()
+        app = AsyncApp(
+            self._org_name, ANY, self._app_id, ANY, mock_error, Mock()
+        )
+        app.transport = AsyncMock()
+        app.transport.request.return_value = make_response(500)
+
+        # when
+        asyncio.run(app.async_remove_app_on_repo(self._app_id, self._repo))
+
+        # then
+        mock_error.assert_called_once_with(
+            'Failed to remove Dependabot app installation from repo repo-a'
+        )
+
+    @patch('dependabot_access.aio.AsyncApp.async_cease_app_access')
+    @patch('dependabot_access.aio.AsyncApp.async_enforce_app_access')
+    @patch('dependabot_access.aio.AsyncApp.open_transports')
+    def test_configure(self, open_transports, enforce, cease):
+        # given
+        app = AsyncApp(
+            self._org_name, ANY, self._app_id, ANY, Mock(), Mock()
+        )
+        app.transport = AsyncMock()
+        app.dependabot.transport = AsyncMock()
+        config = [
+            {'apps': {'dependabot': True}, 'repos': ['repo-a', 'repo-b']},
+            {'repos': ['repo-c']}
+        ]
+
+        # when
+        app.configure(config, concurrency=2)
+
+        # then
+        assert sorted(
+            call.args[0] for call in enforce.call_args_list
+        ) == ['repo-a', 'repo-b']
+        cease.assert_called_once_with('repo-c')
+        app.transport.aclose.assert_called_once_with()
+        app.dependabot.transport.aclose.assert_called_once_with()
+
+    def test_transport(self):
+        # given
+        httpx = Mock()
+        httpx.AsyncClient.return_value.request = AsyncMock(
+            return_value=make_httpx_response(201)
+        )
+        metrics = Metrics()
+
+        # when
+        with patch.dict('sys.modules', {'httpx': httpx}):
+            transport = AsyncTransport(
+                {'Authorization': 'token x'}, 4,
+                make_client_factory(metrics=metrics)
+            )
+            response = asyncio.run(
+                transport.request('POST', 'https://example.com', data='{}')
+            )
+
+        # then
+        httpx.Timeout.assert_called_once_with(60, connect=10)
+        httpx.AsyncHTTPTransport.assert_called_once_with(
+            http2=True, retries=2, limits=httpx.Limits.return_value
+        )
+        httpx.Limits.assert_called_once_with(max_connections=4)
+        httpx.AsyncClient.return_value.request.assert_called_once_with(
+            'POST', 'https://example.com', content='{}'
+        )
+        assert response.reason == 'Created'
+        assert metrics.summary()['requests'] == [{
+            'host': 'example.com', 'method': 'POST', 'endpoint': '',
+            'status': 201, 'count': 1
+        }]
+
+    def test_transport_retries_server_errors(self):
+        # given
+        httpx = Mock()
+        httpx.AsyncClient.return_value.request = AsyncMock(side_effect=[
+            make_httpx_response(502), make_httpx_response(200)
+        ])
+        client_factory = make_client_factory()
+
+        # when
+        with patch.dict('sys.modules', {'httpx': httpx}):
+            transport = AsyncTransport({}, 4, client_factory)
+            response = asyncio.run(
+                transport.request('GET', 'https://example.com/repos/o/r')
+            )
+
+        # then
+        assert response.status_code == 200
+        assert client_factory.retry.stats.count == 1
+
+    def test_transport_waits_out_rate_limits(self):
+        # given
+        httpx = Mock()
+        httpx.AsyncClient.return_value.request = AsyncMock(side_effect=[
+            make_httpx_response(403, {'Retry-After': '0'}),
+            make_httpx_response(200)
+        ])
+
+        # when
+        with patch.dict('sys.modules', {'httpx': httpx}):
+            transport = AsyncTransport({}, 4, make_client_factory())
+            response = asyncio.run(
+                transport.request('GET', 'https://example.com/repos/o/r')
+            )
+
+        # then
+        assert response.status_code == 200
+        assert httpx.AsyncClient.return_value.request.call_count == 2
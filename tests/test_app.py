@@ -1,7 +1,14 @@
+import json
+import os
+import tempfile
 import unittest
-from unittest.mock import Mock, patch, ANY
+from unittest.mock import Mock, patch, ANY, call
 
-from dependabot_access.access import App
+from dependabot_access.access import App, PlanningApp
+from dependabot_access.repository import Repository
+from dependabot_access.scheduler import Deadline
+from dependabot_access.state import State
+from dependabot_access.tree import TreeScan
 
 
 class TestApp(unittest.TestCase):
@@ -194,6 +201,51 @@ class TestApp(unittest.TestCase):
         app.cease_app_access.assert_called_with('mock_repo_name')
         app.enforce_app_access.assert_not_called()
 
+    @patch('dependabot_access.access.App.enforce_app_access')
+    @patch('dependabot_access.access.App.cease_app_access')
+    def test_app_configure_concurrently(
+        self, cease_app_access, enforce_app_access
+    ):
+        #  given
+        config = [
+            {
+                'apps': {
+                    'dependabot': True
+                },
+                'repos': [
+                    'repo-a', 'repo-b', 'repo-c'
+                ]
+            },
+            {
+                'repos': [
+                    'repo-d'
+                ]
+            }
+        ]
+
+        # when
+        app = App(ANY, ANY, self._app_id, ANY, ANY, Mock())
+        app.configure(config, concurrency=4)
+
+        # then
+        assert sorted(
+            call.args[0] for call in enforce_app_access.call_args_list
+        ) == ['repo-a', 'repo-b', 'repo-c']
+        cease_app_access.assert_called_once_with('repo-d')
+
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_app_configure_concurrently_propagates_errors(
+        self, get_github_repo
+    ):
+        #  given
+        get_github_repo.side_effect = Exception('boom')
+        config = [{'repos': ['repo-a', 'repo-b']}]
+
+        # when then
+        app = App(ANY, ANY, self._app_id, ANY, ANY, Mock())
+        with self.assertRaises(Exception):
+            app.configure(config, concurrency=2)
+
     @patch('dependabot_access.access.App.enforce_app_access')
     def test_app_configure_no_repos(
         self, enforce_app_access
@@ -243,14 +295,14 @@ class TestApp(unittest.TestCase):
     @patch('dependabot_access.access.requests.Session')
     def test_get_github_repo(self, session):
         # given
-        session.return_value.request.return_value.json.return_value = {
+        session.return_value.request.return_value.content = json.dumps({
             'id': 1,
             'name': 'mock-repo-name',
             'archived': False,
             'permissions': {
                 'admin': True
             }
-        }
+        }).encode()
 
         # when
         app = App(self._org_name, ANY, self._app_id, ANY, ANY, Mock())
@@ -308,6 +360,8 @@ class TestApp(unittest.TestCase):
     def test_get_repo_contents(self, request):
         # given
         repo_name = 'repo-name'
+        request.return_value.status_code = 200
+        request.return_value.content = b'[]'
         app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
 
         # when
@@ -336,6 +390,40 @@ class TestApp(unittest.TestCase):
         # then
         assert result == []
 
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    def test_get_repo_contents_failure(self, request):
+        # given
+        on_error = Mock()
+        app = App(self._org_name, ANY, self._app_id, ANY, on_error, Mock())
+        request.return_value.status_code = 502
+
+        # when
+        result = app.get_repo_contents('repo-name')
+
+        # then
+        assert result is None
+        on_error.assert_called_once_with(
+            'Failed to list contents of repo repo-name: 502'
+        )
+
+    @patch('dependabot_access.access.App.get_repo_contents')
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_enforce_app_access_skips_configs_without_contents(
+        self, get_github_repo, install_app_on_repo, get_repo_contents
+    ):
+        # given
+        get_github_repo.return_value = Mock(archived=False, admin=True)
+        get_repo_contents.return_value = None
+        dependabot = Mock()
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), dependabot)
+
+        # when
+        app.enforce_app_access('mock-repo-name')
+
+        # then
+        dependabot.add_configs_to_dependabot.assert_not_called()
+
     def test_headers(self):
         # given
         github_token = 'abcdef'
@@ -437,3 +525,483 @@ class TestApp(unittest.TestCase):
                 'Failed to remove Dependabot app installation from '
                 'repo test-mock-repo'
             )
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_load_installed_repos(self, request):
+        # given
+        first_page = Mock()
+        first_page.json.return_value = {
+            'repositories': [{'id': 1}, {'id': 2}]
+        }
+        first_page.links = {'next': {'url': 'https://next-page'}}
+        second_page = Mock()
+        second_page.json.return_value = {'repositories': [{'id': 3}]}
+        second_page.links = {}
+        request.side_effect = [first_page, second_page]
+
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+
+        # when
+        app.load_installed_repos()
+
+        # then
+        assert app.installed_repo_ids == {1, 2, 3}
+        request.assert_any_call(
+            'GET',
+            f'https://api.github.com/user/installations/{self._app_id}/'
+            'repositories?per_page=100'
+        )
+        request.assert_called_with('GET', 'https://next-page')
+
+    def test_install_app_on_repo_already_installed(self):
+        mock_repo = Mock()
+        mock_repo.id = 12345
+
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.installed_repo_ids = {12345}
+        with patch(
+            'dependabot_access.access.requests.Session.request'
+        ) as request:
+            app.install_app_on_repo(self._app_id, mock_repo)
+            request.assert_not_called()
+
+    def test_remove_app_on_repo_not_installed(self):
+        mock_repo = Mock()
+        mock_repo.id = 12345
+
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.installed_repo_ids = {54321}
+        with patch(
+            'dependabot_access.access.requests.Session.request'
+        ) as request:
+            app.remove_app_on_repo(self._app_id, mock_repo)
+            request.assert_not_called()
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_load_org_repos(self, request):
+        # given
+        response = Mock()
+        response.json.return_value = [
+            {
+                'id': 1,
+                'name': 'Repo-A',
+                'archived': False,
+                'permissions': {'admin': True}
+            }
+        ]
+        response.links = {}
+        request.return_value = response
+
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+
+        # when
+        app.load_org_repos()
+        repo = app.get_github_repo('repo-a')
+
+        # then
+        request.assert_called_once_with(
+            'GET',
+            f'https://api.github.com/orgs/{self._org_name}/repos?per_page=100'
+        )
+        assert repo.id == 1
+        assert repo.name == 'Repo-A'
+        assert not repo.archived
+        assert repo.admin
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_get_github_repo_falls_back_on_index_miss(self, request):
+        # given
+        request.return_value.content = json.dumps({
+            'id': 2,
+            'name': 'Repo-B',
+            'archived': True,
+            'permissions': {'admin': False}
+        }).encode()
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+
+        # when
+        repo = app.get_github_repo('Repo-B')
+
+        # then
+        request.assert_called_once_with(
+            'GET', f'https://api.github.com/repos/{self._org_name}/Repo-B'
+        )
+        assert repo.id == 2
+
+    @patch('dependabot_access.access.GraphQL')
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_load_repos_with_graphql(self, request, graphql):
+        # given
+        repo = Repository(
+            1, 'Repo-A', False, True, '2021-01-01T00:00:00Z', 'main'
+        )
+        graphql.return_value.get_repos.return_value = [
+            (repo, ['package.json'])
+        ]
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+
+        # when
+        app.load_repos_with_graphql(['Repo-A'], 25)
+
+        # then
+        graphql.assert_called_once_with(
+            self._org_name, app.github_request_session, 25,
+            'https://api.github.com/graphql'
+        )
+        assert app.get_github_repo('Repo-A') == repo
+        assert app.get_repo_contents('Repo-A') == ['package.json']
+        request.assert_not_called()
+
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_enforce_app_access_skips_unchanged_repo(
+        self, get_github_repo, install_app_on_repo
+    ):
+        #  given
+        mock_repo = Mock()
+        mock_repo.name = 'mock-repo-name'
+        mock_repo.archived = False
+        mock_repo.admin = True
+        get_github_repo.return_value = mock_repo
+
+        app = App(ANY, ANY, self._app_id, ANY, ANY, Mock())
+        app.state = Mock()
+        app.state.is_current.return_value = True
+
+        # when
+        app.enforce_app_access('mock-repo-name')
+
+        # then
+        app.state.is_current.assert_called_once_with(
+            'mock-repo-name', mock_repo, True
+        )
+        install_app_on_repo.assert_not_called()
+
+    @patch('dependabot_access.access.App.get_repo_contents')
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_enforce_app_access_records_state(
+        self, get_github_repo, install_app_on_repo, get_repo_contents
+    ):
+        #  given
+        mock_repo = Mock()
+        mock_repo.archived = False
+        mock_repo.admin = True
+        get_github_repo.return_value = mock_repo
+        dependabot = Mock()
+        dependabot.add_configs_to_dependabot.return_value = {('pip', '/')}
+
+        app = App(ANY, ANY, self._app_id, ANY, ANY, dependabot)
+        app.state = Mock()
+        app.state.is_current.return_value = False
+
+        # when
+        app.enforce_app_access('mock-repo-name')
+
+        # then
+        app.state.record.assert_called_once_with(
+            'mock-repo-name', mock_repo, True, {('pip', '/')}
+        )
+
+    @patch('dependabot_access.access.App.get_repo_contents')
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_enforce_app_access_times_phases(
+        self, get_github_repo, install_app_on_repo, get_repo_contents
+    ):
+        #  given
+        mock_repo = Mock()
+        mock_repo.archived = False
+        mock_repo.admin = True
+        get_github_repo.return_value = mock_repo
+        dependabot = Mock()
+        dependabot.add_configs_to_dependabot.return_value = set()
+
+        app = App(ANY, ANY, self._app_id, ANY, ANY, dependabot)
+
+        # when
+        app.enforce_app_access('mock-repo-name')
+
+        # then
+        assert sorted(app.metrics.summary()['phases']) == [
+            'contents', 'dependabot', 'install', 'lookup'
+        ]
+
+    @patch('dependabot_access.access.App.remove_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_cease_app_access_records_state(
+        self, get_github_repo, remove_app_on_repo
+    ):
+        #  given
+        mock_repo = Mock()
+        mock_repo.archived = False
+        mock_repo.admin = True
+        get_github_repo.return_value = mock_repo
+
+        app = App(ANY, ANY, self._app_id, ANY, ANY, Mock())
+        app.state = Mock()
+        app.state.is_current.return_value = False
+
+        # when
+        app.cease_app_access('mock-repo-name')
+
+        # then
+        app.state.record.assert_called_once_with(
+            'mock-repo-name', mock_repo, False
+        )
+
+    def test_planning_app_records_installation_changes(self):
+        # given
+        app = PlanningApp(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.plan = Mock()
+        app.installed_repo_ids = {1}
+        installed = Repository(1, 'repo-a', False, True)
+        not_installed = Repository(2, 'repo-b', False, True)
+
+        # when
+        app.install_app_on_repo(self._app_id, installed)
+        app.install_app_on_repo(self._app_id, not_installed)
+        app.remove_app_on_repo(self._app_id, installed)
+        app.remove_app_on_repo(self._app_id, not_installed)
+
+        # then
+        assert app.plan.add.call_args_list == [
+            call('install', not_installed), call('remove', installed)
+        ]
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_get_repo_tree(self, request):
+        # given
+        request.return_value.status_code = 200
+        request.return_value.json.return_value = {
+            'tree': [
+                {'path': 'Dockerfile', 'type': 'blob'},
+                {'path': 'backend', 'type': 'tree'},
+                {'path': 'backend/setup.py', 'type': 'blob'}
+            ],
+            'truncated': False
+        }
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+        repo = Repository(1, 'repo-a', False, True, None, 'main')
+
+        # when
+        paths = app.get_repo_tree(repo)
+
+        # then
+        request.assert_called_once_with(
+            'GET',
+            f'https://api.github.com/repos/{self._org_name}/repo-a/'
+            'git/trees/main?recursive=1'
+        )
+        assert paths == ['Dockerfile', 'backend/setup.py']
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_get_repo_tree_empty_repo(self, request):
+        # given
+        request.return_value.status_code = 409
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+
+        # when then
+        assert app.get_repo_tree(Repository(1, 'repo-a', False, True)) == []
+
+    @patch('dependabot_access.access.requests.Session.request')
+    def test_get_repo_tree_failure(self, request):
+        # given
+        request.return_value.status_code = 404
+        on_error = Mock()
+        app = App(self._org_name, ANY, self._app_id, ANY, on_error, Mock())
+        app.tree_scan = TreeScan(5)
+        repo = Repository(1, 'repo-a', False, True, None, 'gone')
+
+        # when
+        repo_files = app.get_repo_files('repo-a', repo)
+
+        # then
+        assert repo_files is None
+        on_error.assert_called_once_with(
+            'Failed to read tree gone of repo repo-a: 404'
+        )
+
+    @patch('dependabot_access.access.App.get_tree')
+    def test_walk_tree_failure_fails_the_whole_tree(self, get_tree):
+        # given
+        get_tree.side_effect = [
+            {'tree': [], 'truncated': True},
+            {
+                'tree': [
+                    {'path': 'Dockerfile', 'type': 'blob', 'sha': '1'},
+                    {'path': 'web', 'type': 'tree', 'sha': '2'}
+                ]
+            },
+            None
+        ]
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+        app.tree_scan = TreeScan(5)
+
+        # when
+        paths = app.get_repo_tree(Repository(1, 'repo-a', False, True))
+
+        # then
+        assert paths is None
+
+    @patch('dependabot_access.access.App.get_tree')
+    def test_get_repo_tree_truncated(self, get_tree):
+        # given
+        get_tree.side_effect = [
+            {'tree': [], 'truncated': True},
+            {
+                'tree': [
+                    {'path': 'Dockerfile', 'type': 'blob', 'sha': '1'},
+                    {'path': 'web', 'type': 'tree', 'sha': '2'},
+                    {'path': 'node_modules', 'type': 'tree', 'sha': '3'}
+                ]
+            },
+            {'tree': [{'path': 'package.json', 'type': 'blob', 'sha': '4'}]}
+        ]
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+        app.tree_scan = TreeScan(5, ['node_modules'])
+        repo = Repository(1, 'repo-a', False, True)
+
+        # when
+        paths = app.get_repo_tree(repo)
+
+        # then
+        assert paths == ['Dockerfile', 'web/package.json']
+        assert get_tree.call_args_list == [
+            call(repo, 'HEAD', recursive=True),
+            call(repo, 'HEAD'),
+            call(repo, '2')
+        ]
+
+    @patch('dependabot_access.access.App.get_repo_tree')
+    def test_get_repo_files_with_tree_scan(self, get_repo_tree):
+        # given
+        get_repo_tree.return_value = ['Dockerfile', 'web/package.json']
+        app = App(self._org_name, ANY, self._app_id, ANY, Mock(), Mock())
+        app.tree_scan = TreeScan(5)
+
+        # when
+        repo_files = app.get_repo_files(
+            'repo-a', Repository(1, 'repo-a', False, True)
+        )
+
+        # then
+        assert repo_files == {
+            '/': ['Dockerfile'], '/web': ['package.json']
+        }
+
+    @patch('dependabot_access.access.App.enforce_app_access')
+    @patch('dependabot_access.access.App.cease_app_access')
+    def test_app_configure_conflicting_blocks(
+        self, cease_app_access, enforce_app_access
+    ):
+        #  given
+        config = [
+            {'apps': {'dependabot': True}, 'repos': ['repo-a', 'repo-b']},
+            {'repos': ['repo-a']}
+        ]
+        mock_error = Mock()
+
+        # when
+        app = App(ANY, ANY, self._app_id, ANY, mock_error, Mock())
+        app.configure(config)
+
+        # then
+        mock_error.assert_called_once_with(
+            'Repo repo-a is listed both with and without dependabot, '
+            'skipping it'
+        )
+        enforce_app_access.assert_called_once_with('repo-b')
+        cease_app_access.assert_not_called()
+
+    @patch('dependabot_access.access.App.enforce_app_access')
+    def test_app_configure_resumes_from_journal(self, enforce_app_access):
+        #  given
+        config = [
+            {'apps': {'dependabot': True}, 'repos': ['repo-a', 'repo-b']}
+        ]
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.journal = Mock()
+        app.journal.is_done.side_effect = lambda repo_name, dependabot: (
+            repo_name == 'repo-a'
+        )
+        app.state = Mock()
+        app.state.has_failed.return_value = False
+
+        # when
+        app.configure(config)
+
+        # then
+        enforce_app_access.assert_called_once_with('repo-b')
+        app.journal.record.assert_called_once_with('repo-b', True)
+
+    @patch('dependabot_access.access.App.enforce_app_access')
+    def test_app_configure_does_not_journal_failed_repos(
+        self, enforce_app_access
+    ):
+        #  given
+        config = [{'apps': {'dependabot': True}, 'repos': ['repo-a']}]
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.journal = Mock()
+        app.journal.is_done.return_value = False
+        app.state = Mock()
+        app.state.has_failed.return_value = True
+
+        # when
+        app.configure(config)
+
+        # then
+        enforce_app_access.assert_called_once_with('repo-a')
+        app.journal.record.assert_not_called()
+
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_missed_mark_cleared_when_next_run_finds_repo_unchanged(
+        self, get_github_repo, install_app_on_repo
+    ):
+        # given
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'state.json')
+        repo = Repository(1, 'repo-a', False, True, '2021-01-01T00:00:00Z')
+        get_github_repo.return_value = repo
+        config = [{'apps': {'dependabot': False}, 'repos': ['repo-a']}]
+        state = State(path)
+        state.record('repo-a', repo, False)
+        state.save()
+
+        missed_run = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        missed_run.state = State(path)
+        missed_run.deadline = Deadline(0)
+        missed_run.configure(config)
+        missed_run.state.save()
+
+        # when
+        next_run = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        next_run.state = State(path)
+        next_run.configure(config)
+        next_run.state.save()
+
+        # then
+        assert missed_run.state.repos['repo-a']['missed']
+        assert 'missed' not in State(path).repos['repo-a']
+
+    @patch('dependabot_access.access.App.enforce_app_access')
+    def test_app_configure_stops_at_deadline(self, enforce_app_access):
+        #  given
+        config = [
+            {'apps': {'dependabot': True}, 'repos': ['repo-a', 'repo-b']}
+        ]
+        app = App(ANY, ANY, self._app_id, ANY, Mock(), Mock())
+        app.deadline = Mock()
+        app.deadline.expired.side_effect = [False, True]
+        app.state = Mock()
+
+        # when
+        app.configure(config)
+
+        # then
+        enforce_app_access.assert_called_once_with('repo-a')
+        app.deadline.miss.assert_called_once_with('repo-b')
+        app.state.record_missed.assert_called_once_with('repo-b')
+        app.deadline.report.assert_called_once_with()
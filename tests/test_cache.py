@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+from dependabot_access.cache import CachingAdapter, ResponseCache
+from dependabot_access.metrics import Metrics, MetricsAdapter
+
+
+def make_request(url='https://api.github.com/repos/org/repo', method='GET'):
+    return requests.Request(
+        method, url, headers={'Authorization': 'token abc'}
+    ).prepare()
+
+
+def make_response(status_code, headers=None, content=b''):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_stores_and_revalidates(self):
+        # given
+        adapter = Mock()
+        adapter.send.side_effect = [
+            make_response(200, {'ETag': '"v1"'}, b'{"id": 1}'),
+            make_response(304, {'ETag': '"v1"'})
+        ]
+        caching_adapter = CachingAdapter(
+            adapter, ResponseCache(self._directory.name, 1024)
+        )
+
+        # when
+        first = caching_adapter.send(make_request())
+        second_request = make_request()
+        second = caching_adapter.send(second_request)
+
+        # then
+        assert first.json() == {'id': 1}
+        assert second_request.headers['If-None-Match'] == '"v1"'
+        assert second.status_code == 200
+        assert second.json() == {'id': 1}
+
+    def test_cache_hits_are_measured_as_not_modified(self):
+        # given
+        adapter = Mock()
+        adapter.send.side_effect = [
+            make_response(200, {
+                'ETag': '"v1"', 'X-RateLimit-Remaining': '4999'
+            }, b'{"id": 1}'),
+            make_response(304, {
+                'ETag': '"v1"', 'X-RateLimit-Remaining': '4999'
+            })
+        ]
+        metrics = Metrics()
+        metrics_adapter = MetricsAdapter(CachingAdapter(
+            adapter, ResponseCache(self._directory.name, 1024)
+        ), metrics)
+
+        # when
+        metrics_adapter.send(make_request())
+        metrics_adapter.send(make_request())
+
+        # then
+        summary = metrics.summary()
+        assert [
+            (entry['status'], entry['count']) for entry in summary['requests']
+        ] == [(200, 1), (304, 1)]
+        assert summary['rate_limit']['api.github.com']['consumed'] == 1
+
+    def test_reads_entries_written_by_another_cache(self):
+        # given
+        writer = ResponseCache(self._directory.name, 1024)
+        reader = ResponseCache(self._directory.name, 1024)
+        writer.put(make_request(), make_response(
+            200, {'ETag': '"v1"'}, b'{"id": 1}'
+        ))
+
+        # when
+        entry = reader.get(make_request())
+
+        # then
+        assert entry['headers'] == {'ETag': '"v1"'}
+        assert list(reader.sizes) == list(writer.sizes)
+        assert reader.total_bytes == writer.total_bytes
+
+    def test_ignores_non_get_requests(self):
+        # given
+        adapter = Mock()
+        adapter.send.return_value = make_response(204, {'ETag': '"v1"'})
+        cache = ResponseCache(self._directory.name, 1024)
+        caching_adapter = CachingAdapter(adapter, cache)
+
+        # when
+        request = make_request(method='PUT')
+        caching_adapter.send(request)
+
+        # then
+        assert 'If-None-Match' not in request.headers
+        assert os.listdir(self._directory.name) == []
+
+    def test_keys_by_token(self):
+        # given
+        cache = ResponseCache(self._directory.name, 1024)
+        other_token = make_request()
+        other_token.headers['Authorization'] = 'token xyz'
+
+        # when
+        cache.put(make_request(), make_response(200, {'ETag': '"v1"'}))
+
+        # then
+        assert cache.get(make_request()) is not None
+        assert cache.get(other_token) is None
+
+    def test_evicts_least_recently_used(self):
+        # given
+        cache = ResponseCache(self._directory.name, 450)
+        response = make_response(200, {'ETag': '"v1"'}, b'x' * 100)
+        first = make_request('https://api.github.com/first')
+        second = make_request('https://api.github.com/second')
+        third = make_request('https://api.github.com/third')
+
+        # when
+        cache.put(first, response)
+        cache.put(second, response)
+        cache.get(first)
+        cache.put(third, response)
+
+        # then
+        assert cache.get(first) is not None
+        assert cache.get(second) is None
+        assert cache.get(third) is not None
+        assert cache.total_bytes <= 450
+
+    def test_reloads_index_from_disk(self):
+        # given
+        cache = ResponseCache(self._directory.name, 1024)
+        cache.put(make_request(), make_response(200, {'ETag': '"v1"'}))
+
+        # when
+        reloaded = ResponseCache(self._directory.name, 1024)
+
+        # then
+        assert reloaded.total_bytes == cache.total_bytes
+        assert reloaded.get(make_request())['headers'] == {'ETag': '"v1"'}
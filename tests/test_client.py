@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dependabot_access.client import (
+    ClientFactory, PooledHTTPAdapter, PoolStats
+)
+from dependabot_access.ratelimit import RateLimitAdapter
+
+
+class TestClient(unittest.TestCase):
+
+    def test_configure_mounts_pooled_adapter_in_layers(self):
+        # given
+        session = requests.Session()
+        client_factory = ClientFactory(
+            None, (1, 2), pool_block=True, limiter=Mock()
+        )
+
+        # when
+        client_factory.configure(session, 'https://api.github.com', 7)
+
+        # then
+        adapter = session.get_adapter('https://api.github.com/repos')
+        assert isinstance(adapter, RateLimitAdapter)
+        assert isinstance(adapter.adapter, PooledHTTPAdapter)
+        assert adapter.adapter.timeout == (1, 2)
+        assert adapter.adapter._pool_maxsize == 7
+        assert adapter.adapter._pool_block
+        assert 'api.github.com' in client_factory.pool_stats
+
+    def test_configure_without_keep_alive(self):
+        # given
+        session = requests.Session()
+        client_factory = ClientFactory(None, 5, keep_alive=False)
+
+        # when
+        client_factory.configure(session, 'https://api.dependabot.com', 1)
+
+        # then
+        assert session.headers['Connection'] == 'close'
+
+    @patch.object(HTTPAdapter, 'send')
+    def test_applies_default_timeout(self, send):
+        # given
+        adapter = PooledHTTPAdapter(PoolStats(), (1, 2))
+        request = Mock()
+
+        # when
+        adapter.send(request)
+        adapter.send(request, timeout=9)
+
+        # then
+        assert send.call_args_list[0][1]['timeout'] == (1, 2)
+        assert send.call_args_list[1][1]['timeout'] == 9
+
+    def test_pool_records_stats(self):
+        # given
+        stats = PoolStats()
+        adapter = PooledHTTPAdapter(stats, 5, pool_maxsize=1)
+        pool = adapter.poolmanager.connection_from_url('https://example.com')
+
+        # when
+        conn = pool._get_conn()
+        pool._put_conn(conn)
+        pool._get_conn()
+
+        # then
+        assert stats.as_dict() == {
+            'hits': 1, 'new_connections': 1, 'waits': 0
+        }
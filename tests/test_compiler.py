@@ -0,0 +1,86 @@
+import unittest
+
+from dependabot_access.compiler import (
+    Shard, compile_access, shard_access, shard_of
+)
+
+
+class TestCompiler(unittest.TestCase):
+
+    def test_deduplicates_repos(self):
+        # given
+        config = [
+            {'repos': ['repo-a', 'repo-b'], 'apps': {'dependabot': True}},
+            {'repos': ['Repo-A'], 'apps': {'dependabot': True}},
+            {'teams': {'team-a': 'pull'}},
+            {'repos': ['repo-c']}
+        ]
+
+        # when
+        access = compile_access(config)
+
+        # then
+        assert access.work == [
+            ('repo-a', True), ('repo-b', True), ('repo-c', False)
+        ]
+        assert access.conflicts == []
+
+    def test_reports_conflicts(self):
+        # given
+        config = [
+            {'repos': ['repo-a', 'repo-b'], 'apps': {'dependabot': True}},
+            {'repos': ['repo-b'], 'apps': {}},
+            {'repos': ['REPO-B', 'repo-c'], 'apps': {'dependabot': True}}
+        ]
+
+        # when
+        access = compile_access(config)
+
+        # then
+        assert access.work == [('repo-a', True), ('repo-c', True)]
+        assert access.conflicts == ['repo-b']
+
+    def test_shards_partition_work(self):
+        # given
+        repo_names = [f'repo-{index}' for index in range(200)]
+        access = compile_access([
+            {'repos': repo_names, 'apps': {'dependabot': True}}
+        ])
+
+        # when
+        shards = [shard_access(access, Shard(index, 3)) for index in range(3)]
+
+        # then
+        assert sorted(
+            repo_name for shard in shards for repo_name, _ in shard.work
+        ) == sorted(repo_names)
+        assert all(len(shard.work) > 40 for shard in shards)
+
+    def test_shard_is_stable(self):
+        # given
+        shard = shard_of('Repo-A', 8)
+
+        # when
+        access = compile_access([
+            {'repos': ['repo-a', 'repo-new'], 'apps': {'dependabot': True}}
+        ])
+
+        # then
+        assert shard_of('repo-a', 8) == shard
+        assert ('repo-a', True) in shard_access(access, Shard(shard, 8)).work
+
+    def test_conflicts_are_reported_by_one_shard(self):
+        # given
+        access = compile_access([
+            {'repos': ['repo-b'], 'apps': {'dependabot': True}},
+            {'repos': ['repo-b'], 'apps': {}}
+        ])
+
+        # when
+        conflicts = [
+            shard_access(access, Shard(index, 4)).conflicts
+            for index in range(4)
+        ]
+
+        # then
+        assert sum(conflicts, []) == ['repo-b']
@@ -0,0 +1,70 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from dependabot_access import decode
+from dependabot_access.decode import decode_file_names, decode_repository
+
+REPO = {
+    'id': 1,
+    'name': 'repo-name',
+    'full_name': 'org/repo-name',
+    'archived': False,
+    'permissions': {'admin': True},
+    'pushed_at': '2024-01-02T03:04:05Z',
+    'default_branch': 'main',
+    'owner': {'login': 'org'}
+}
+
+
+class TestDecode(unittest.TestCase):
+
+    def test_decode_repository(self):
+        # when
+        repo = decode_repository(json.dumps(REPO).encode())
+
+        # then
+        assert repo.id == 1
+        assert repo.name == 'repo-name'
+        assert not repo.archived
+        assert repo.admin
+        assert repo.default_branch == 'main'
+
+    def test_decode_repository_without_orjson(self):
+        # given
+        with patch.object(decode, 'orjson', None):
+
+            # when
+            repo = decode_repository(json.dumps(REPO).encode())
+
+        # then
+        assert repo == decode_repository(json.dumps(REPO).encode())
+
+    def test_decode_file_names_keeps_only_names(self):
+        # given
+        content = json.dumps([
+            {'name': 'package.json', 'sha': 'abc', 'type': 'file'},
+            {'name': 'src', 'sha': 'def', 'type': 'dir'}
+        ]).encode()
+
+        # when
+        names = decode_file_names(content)
+
+        # then
+        assert names == ['package.json', 'src']
+
+    def test_decode_file_names_ignores_non_list_body(self):
+        # given
+        content = json.dumps({'message': 'This repository is empty.'})
+
+        # when
+        names = decode_file_names(content.encode())
+
+        # then
+        assert names == []
+
+    def test_invalid_body_raises_value_error(self):
+        for orjson in (decode.orjson, None):
+            with patch.object(decode, 'orjson', orjson):
+                with self.assertRaises(ValueError):
+                    decode.loads(b'<html>')
@@ -2,7 +2,7 @@ import json
 import unittest
 
 from dependabot_access.dependabot import Dependabot
-from unittest.mock import patch, Mock, ANY
+from unittest.mock import patch, Mock, ANY, call
 
 
 class TestDependabot(unittest.TestCase):
@@ -318,3 +318,205 @@ class TestDependabot(unittest.TestCase):
             'Cache-Control': 'no-cache',
             'Content-Type': 'application/json'
         }
+
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_load_update_configs(self, request):
+        # given
+        first_page = Mock()
+        first_page.json.return_value = {
+            'data': [
+                {
+                    'id': '11',
+                    'attributes': {
+                        'repo-id': 1234,
+                        'package-manager': 'pip',
+                        'directory': '/'
+                    }
+                }
+            ],
+            'links': {'next': 'https://api.dependabot.com/next-page'}
+        }
+        second_page = Mock()
+        second_page.json.return_value = {
+            'data': [
+                {
+                    'id': '12',
+                    'attributes': {
+                        'repo-id': 1234,
+                        'package-manager': 'docker',
+                        'directory': '/'
+                    }
+                }
+            ]
+        }
+        request.side_effect = [first_page, second_page]
+        dependabot = Dependabot('4444', Mock())
+        mock_repo = Mock()
+        mock_repo.id = 1234
+
+        # when
+        dependabot.load_update_configs()
+
+        # then
+        request.assert_any_call(
+            'GET',
+            'https://api.dependabot.com/update_configs'
+            '?account-id=4444&account-type=org'
+        )
+        assert dependabot.get_update_configs(mock_repo) == {
+            ('pip', '/'): '11',
+            ('docker', '/'): '12'
+        }
+
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_add_configs_skips_existing_configs(self, request):
+        # given
+        mock_repo = Mock()
+        mock_repo.name = self._repo_name
+        mock_repo.id = 1234
+        dependabot = Dependabot('4444', Mock())
+        dependabot.update_configs = {1234: {('docker', '/'): '11'}}
+        request.return_value.status_code = 201
+        request.return_value.reason = 'Created'
+
+        # when
+        dependabot.add_configs_to_dependabot(
+            mock_repo, ['Dockerfile', 'Pipfile']
+        )
+
+        # then
+        request.assert_called_once_with(
+            'POST',
+            'https://api.dependabot.com/update_configs',
+            data=json.dumps(
+                {
+                    'repo-id': 1234,
+                    'package-manager': 'pip',
+                    'update-schedule': 'daily',
+                    'directory': '/',
+                    'account-id': '4444',
+                    'account-type': 'org',
+                }
+            )
+        )
+
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_add_configs_prunes_stale_configs(self, request):
+        # given
+        mock_repo = Mock()
+        mock_repo.name = self._repo_name
+        mock_repo.id = 1234
+        dependabot = Dependabot('4444', Mock())
+        dependabot.prune = True
+        dependabot.update_configs = {
+            1234: {
+                ('docker', '/'): '11',
+                ('npm_and_yarn', '/'): '12',
+                ('pip', '/backend'): '13'
+            }
+        }
+        request.return_value.status_code = 204
+
+        # when
+        dependabot.add_configs_to_dependabot(mock_repo, ['Dockerfile'])
+
+        # then
+        request.assert_called_once_with(
+            'DELETE', 'https://api.dependabot.com/update_configs/12'
+        )
+
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_remove_config_error(self, request):
+        # given
+        mock_repo = Mock()
+        mock_repo.name = self._repo_name
+        mock_on_error = Mock()
+        dependabot = Dependabot('4444', mock_on_error)
+        request.return_value.status_code = 500
+        request.return_value.text = 'There\'s been an error!'
+
+        # when
+        dependabot.remove_config(mock_repo, 'pip', '11')
+
+        # then
+        mock_on_error.assert_called_once_with(
+            "Failed to remove config for repo repo-name. "
+            "Dependabot Package Manager: pip failed. "
+            "(Status Code: 500: There's been an error!)"
+        )
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_get_gemspec_package_manager(self):
+        # given
+        dependabot = Dependabot(ANY, ANY)
+
+        # when
+        package_managers = dependabot.get_package_managers(
+            ['dependabot-access.gemspec']
+        )
+
+        # then
+        assert package_managers == set(['bundler'])
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_add_rules(self):
+        # given
+        dependabot = Dependabot(ANY, ANY)
+
+        # when
+        dependabot.add_rules([('*.csproj', 'nuget')])
+
+        # then
+        assert dependabot.get_package_managers(
+            [{'name': 'App.csproj'}, {'name': 'Dockerfile'}]
+        ) == set(['nuget', 'docker'])
+
+    @patch('dependabot_access.dependabot.requests.Session.request')
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_add_configs_per_directory(self, request):
+        # given
+        mock_repo = Mock()
+        mock_repo.name = self._repo_name
+        mock_repo.id = 1234
+        dependabot = Dependabot('4444', Mock())
+        dependabot.prune = True
+        dependabot.update_configs = {
+            1234: {
+                ('docker', '/'): '11',
+                ('pip', '/old'): '12',
+                ('pip', '/unscanned'): '13'
+            }
+        }
+        request.return_value.status_code = 201
+        request.return_value.reason = 'Created'
+
+        # when
+        configs = dependabot.add_configs_to_dependabot(mock_repo, {
+            '/': ['Dockerfile'],
+            '/web': ['package.json'],
+            '/old': ['README.md']
+        })
+
+        # then
+        assert configs == {('docker', '/'), ('npm_and_yarn', '/web')}
+        assert request.call_args_list == [
+            call(
+                'POST',
+                'https://api.dependabot.com/update_configs',
+                data=json.dumps(
+                    {
+                        'repo-id': 1234,
+                        'package-manager': 'npm_and_yarn',
+                        'update-schedule': 'daily',
+                        'directory': '/web',
+                        'account-id': '4444',
+                        'account-type': 'org',
+                    }
+                )
+            ),
+            call('DELETE', 'https://api.dependabot.com/update_configs/12')
+        ]
@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from dependabot_access.graphql import GraphQL
+
+
+class TestGraphQL(unittest.TestCase):
+
+    def setUp(self):
+        self._org_name = 'fake_org'
+
+    def test_build_query(self):
+        # given
+        graphql = GraphQL(self._org_name, Mock(), 10)
+
+        # when
+        query = graphql.build_query(['repo-a', 'repo-b'])
+
+        # then
+        assert (
+            'r0: repository(owner: "fake_org", name: "repo-a") '
+            '{ ...RepoFields }'
+        ) in query
+        assert (
+            'r1: repository(owner: "fake_org", name: "repo-b") '
+            '{ ...RepoFields }'
+        ) in query
+        assert 'fragment RepoFields on Repository' in query
+
+    def test_get_repos(self):
+        # given
+        session = Mock()
+        session.request.return_value.json.side_effect = [
+            {
+                'data': {
+                    'r0': {
+                        'databaseId': 1,
+                        'name': 'repo-a',
+                        'isArchived': False,
+                        'viewerPermission': 'ADMIN',
+                        'object': {
+                            'entries': [
+                                {'name': 'Dockerfile'},
+                                {'name': 'setup.py'}
+                            ]
+                        }
+                    },
+                    'r1': None
+                }
+            },
+            {
+                'data': {
+                    'r0': {
+                        'databaseId': 3,
+                        'name': 'repo-c',
+                        'isArchived': True,
+                        'viewerPermission': 'WRITE',
+                        'object': None
+                    }
+                }
+            }
+        ]
+        graphql = GraphQL(self._org_name, session, 2)
+
+        # when
+        repos = list(graphql.get_repos(['repo-a', 'repo-b', 'repo-c']))
+
+        # then
+        assert session.request.call_count == 2
+        method, url = session.request.call_args.args
+        assert (method, url) == ('POST', 'https://api.github.com/graphql')
+        assert 'name: "repo-c"' in json.loads(
+            session.request.call_args.kwargs['data']
+        )['query']
+
+        (repo_a, repo_a_files), (repo_c, repo_c_files) = repos
+        assert repo_a.id == 1
+        assert repo_a.admin
+        assert not repo_a.archived
+        assert repo_a_files == ['Dockerfile', 'setup.py']
+        assert repo_c.archived
+        assert not repo_c.admin
+        assert repo_c_files == []
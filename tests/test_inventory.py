@@ -0,0 +1,71 @@
+import sys
+import unittest
+
+from dependabot_access.inventory import Inventory, encode_time
+from dependabot_access.repository import Repository
+
+
+class TestInventory(unittest.TestCase):
+
+    def setUp(self):
+        self._inventory = Inventory()
+        self._repo = Repository(
+            1234, 'Repo-A', False, True, '2021-03-04T05:06:07Z', 'main'
+        )
+
+    def test_get_by_name(self):
+        # when
+        self._inventory.add(self._repo, ['package.json'])
+
+        # then
+        assert len(self._inventory) == 1
+        assert self._inventory.get('REPO-A') == self._repo
+        assert self._inventory.get_files('repo-a') == ['package.json']
+        assert self._inventory.get('repo-b') is None
+        assert self._inventory.get_files('repo-b') is None
+
+    def test_add_replaces_row(self):
+        # given
+        self._inventory.add(self._repo, ['package.json'])
+        archived = Repository(1234, 'Repo-A', True, True, None, 'main')
+
+        # when
+        self._inventory.add(archived)
+
+        # then
+        assert len(self._inventory) == 1
+        assert self._inventory.get('repo-a') == archived
+        assert self._inventory.get_files('repo-a') is None
+
+    def test_keeps_unusual_push_times(self):
+        # given
+        repo = Repository(1, 'repo-b', True, False, '2021-01-01')
+
+        # when
+        self._inventory.add(repo)
+
+        # then
+        assert self._inventory.get('repo-b') == repo
+
+    def test_encode_time(self):
+        assert encode_time('1970-01-02T00:00:00Z') == 86400
+        assert encode_time('2021-13-01T00:00:00Z') is None
+        assert encode_time('2021-01-01T00:00:00.5Z') is None
+        assert encode_time(None) is None
+
+    def test_shares_strings(self):
+        # given
+        files = [''.join(['package', '.json'])]
+
+        # when
+        self._inventory.add(Repository(
+            1234, 'Repo-A', False, True, None, ''.join(['ma', 'in'])
+        ), files)
+        self._inventory.add(Repository(2, 'repo-b', False, True), files)
+
+        # then
+        assert self._inventory.get('repo-a').default_branch is sys.intern(
+            'main'
+        )
+        assert self._inventory.files[0] is self._inventory.files[1]
+        assert self._inventory.files[0][0] is sys.intern('package.json')
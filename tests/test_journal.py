@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dependabot_access.journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'journal.jsonl')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_resume_skips_recorded_repos(self):
+        # given
+        journal = Journal(self._path)
+        journal.record('Repo-A', True)
+        journal.record('repo-b', False)
+        journal.close()
+
+        # when
+        resumed = Journal(self._path, resume=True)
+
+        # then
+        assert resumed.is_done('repo-a', True)
+        assert resumed.is_done('repo-b', False)
+        assert not resumed.is_done('repo-b', True)
+        assert not resumed.is_done('repo-c', True)
+
+    def test_resume_appends(self):
+        # given
+        journal = Journal(self._path)
+        journal.record('repo-a', True)
+        journal.close()
+
+        # when
+        resumed = Journal(self._path, resume=True)
+        resumed.record('repo-b', True)
+        resumed.close()
+
+        # then
+        assert Journal(self._path, resume=True).done == {
+            ('repo-a', True), ('repo-b', True)
+        }
+
+    def test_ignores_torn_lines(self):
+        # given
+        with open(self._path, 'w') as f:
+            f.write('{"repo": "repo-a", "dependabot": true}\n{"repo": "re')
+
+        # when
+        journal = Journal(self._path, resume=True)
+
+        # then
+        assert journal.done == {('repo-a', True)}
+
+    def test_records_after_torn_line_on_resume(self):
+        # given
+        with open(self._path, 'w') as f:
+            f.write('{"repo": "repo-a", "dependabot": true}\n{"repo": "re')
+
+        # when
+        journal = Journal(self._path, resume=True)
+        journal.record('repo-b', False)
+        journal.close()
+
+        # then
+        assert Journal(self._path, resume=True).done == {
+            ('repo-a', True), ('repo-b', False)
+        }
+
+    def test_without_resume_starts_over(self):
+        # given
+        journal = Journal(self._path)
+        journal.record('repo-a', True)
+        journal.close()
+
+        # when
+        journal = Journal(self._path)
+        journal.record('repo-b', True)
+        journal.close()
+
+        # then
+        assert Journal(self._path, resume=True).done == {('repo-b', True)}
+
+    @patch('dependabot_access.journal.os.fsync')
+    def test_syncs_in_batches(self, fsync):
+        # given
+        journal = Journal(self._path, sync_every=2)
+
+        # when
+        for repo_name in ('repo-a', 'repo-b', 'repo-c'):
+            journal.record(repo_name, True)
+        synced = fsync.call_count
+        journal.close()
+
+        # then
+        assert synced == 1
+        assert fsync.call_count == 2
+
+    def test_remove(self):
+        # given
+        journal = Journal(self._path)
+        journal.record('repo-a', True)
+
+        # when
+        journal.remove()
+
+        # then
+        assert not os.path.exists(self._path)
+
+    def test_without_path(self):
+        # given
+        journal = Journal()
+
+        # when
+        journal.record('repo-a', True)
+        journal.remove()
+
+        # then
+        assert not journal.is_done('repo-a', True)
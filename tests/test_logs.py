@@ -0,0 +1,58 @@
+import logging
+import unittest
+from unittest.mock import Mock
+
+from dependabot_access.logs import (
+    ErrorTracker, RepoFilter, current_repo, repo_context
+)
+
+
+class TestLogs(unittest.TestCase):
+
+    def test_repo_filter_outside_repo(self):
+        # given
+        record = logging.makeLogRecord({'msg': 'hello'})
+
+        # when
+        RepoFilter().filter(record)
+
+        # then
+        assert record.repo == '-'
+
+    def test_repo_filter_inside_repo(self):
+        # given
+        record = logging.makeLogRecord({'msg': 'hello'})
+
+        # when
+        with repo_context('repo-a'):
+            RepoFilter().filter(record)
+
+        # then
+        assert record.repo == 'repo-a'
+        assert current_repo.get() == '-'
+
+    def test_error_tracker(self):
+        # given
+        on_error = Mock()
+        errors = ErrorTracker(on_error)
+
+        # when
+        with repo_context('repo-a'):
+            errors('An error!')
+
+        # then
+        on_error.assert_called_once_with('An error!')
+        assert errors.has_failed('repo-a')
+        assert not errors.has_failed('repo-b')
+
+    def test_error_tracker_reset(self):
+        # given
+        errors = ErrorTracker(Mock())
+        with repo_context('repo-a'):
+            errors('An error!')
+
+        # when
+        errors.reset('repo-a')
+
+        # then
+        assert not errors.has_failed('repo-a')
@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from dependabot_access.metrics import (
+    Metrics, MetricsAdapter, endpoint_template
+)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self._now = [0.0]
+        self._metrics = Metrics(clock=lambda: self._now[0])
+
+    def request(self, method, url, body=None):
+        request = Mock()
+        request.method = method
+        request.url = url
+        request.body = body
+        return request
+
+    def response(self, status_code, content=b'', headers=None, retries=0):
+        response = Mock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers or {}
+        response.raw.retries.history = [Mock()] * retries
+        response.from_cache = False
+        return response
+
+    def test_endpoint_template(self):
+        assert endpoint_template(
+            'https://api.github.com/repos/org/repo/contents'
+        ) == '/repos/{owner}/{repo}/contents'
+        assert endpoint_template(
+            'https://api.github.com/user/installations/1/repositories/2'
+        ) == '/user/installations/{app}/repositories/{repo}'
+        assert endpoint_template(
+            'https://api.dependabot.com/update_configs/7'
+        ) == '/update_configs/{config}'
+        assert endpoint_template(
+            'https://api.github.com/graphql'
+        ) == '/graphql'
+
+    def test_adapter_records_requests(self):
+        # given
+        adapter = Mock()
+
+        def send(request, **kwargs):
+            self._now[0] += 0.2
+            return self.response(
+                200, b'{"id": 1}', {'X-RateLimit-Remaining': '4999'}, 1
+            )
+
+        adapter.send.side_effect = send
+        metrics_adapter = MetricsAdapter(adapter, self._metrics)
+
+        # when
+        metrics_adapter.send(
+            self.request('GET', 'https://api.github.com/repos/org/a')
+        )
+        metrics_adapter.send(
+            self.request('GET', 'https://api.github.com/repos/org/b')
+        )
+
+        # then
+        summary = self._metrics.summary()
+        assert summary['requests'] == [{
+            'host': 'api.github.com', 'method': 'GET',
+            'endpoint': '/repos/{owner}/{repo}', 'status': 200, 'count': 2
+        }]
+        endpoint = summary['endpoints'][0]
+        assert endpoint['count'] == 2
+        assert endpoint['latency_buckets']['0.1'] == 0
+        assert endpoint['latency_buckets']['0.25'] == 2
+        assert endpoint['bytes_received'] == 18
+        assert endpoint['retries'] == 2
+        assert summary['rate_limit'] == {
+            'api.github.com': {'consumed': 2, 'remaining': 4999}
+        }
+
+    def test_not_modified_responses_do_not_consume_rate_limit(self):
+        # when
+        self._metrics.observe_request(
+            self.request('GET', 'https://api.github.com/repos/org/a'),
+            self.response(304, headers={'X-RateLimit-Remaining': '10'}),
+            0.01
+        )
+
+        # then
+        assert self._metrics.summary()['rate_limit'] == {
+            'api.github.com': {'consumed': 0, 'remaining': 10}
+        }
+
+    def test_phase_timings(self):
+        # when
+        with self._metrics.phase('lookup'):
+            self._now[0] += 1.5
+        with self._metrics.phase('lookup'):
+            self._now[0] += 0.5
+
+        # then
+        assert self._metrics.summary()['phases'] == {
+            'lookup': {'count': 2, 'seconds': 2.0}
+        }
+
+    def test_save_prometheus_and_json(self):
+        # given
+        self._metrics.observe_request(
+            self.request('PUT', 'https://api.github.com/orgs/org/repos', b'x'),
+            self.response(204), 0.3
+        )
+        with self._metrics.phase('install'):
+            self._now[0] += 1
+
+        with tempfile.TemporaryDirectory() as directory:
+            prometheus_path = os.path.join(directory, 'metrics.prom')
+            json_path = os.path.join(directory, 'metrics.json')
+
+            # when
+            self._metrics.save(prometheus_path, json_path)
+
+            # then
+            with open(prometheus_path) as f:
+                prometheus = f.read()
+            with open(json_path) as f:
+                summary = json.load(f)
+
+        labels = (
+            'host="api.github.com",method="PUT",endpoint="/orgs/{org}/repos"'
+        )
+        assert '# TYPE dependabot_access_requests_total counter\n' in (
+            prometheus
+        )
+        assert (
+            f'dependabot_access_requests_total{{{labels},status="204"}} 1\n'
+        ) in prometheus
+        assert (
+            '# TYPE dependabot_access_request_duration_seconds histogram\n'
+        ) in prometheus
+        assert (
+            'dependabot_access_request_duration_seconds_bucket'
+            f'{{{labels},le="+Inf"}} 1\n'
+        ) in prometheus
+        assert (
+            'dependabot_access_phase_seconds_total{phase="install"} 1.0\n'
+        ) in prometheus
+        assert prometheus.count('# TYPE dependabot_access_request_bytes') == 1
+        assert summary['phases'] == {'install': {'count': 1, 'seconds': 1}}
@@ -0,0 +1,183 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, ANY, patch
+
+from dependabot_access.plan import (
+    Plan, PlanningDependabot, apply_plan, rate_limit_wait
+)
+from dependabot_access.repository import Repository
+
+
+class TestPlan(unittest.TestCase):
+
+    def setUp(self):
+        self._repo = Repository(1, 'repo-a', False, True)
+        self._rate_limit = {'limit': 5000, 'remaining': 5000, 'reset': 0}
+
+    def test_estimate(self):
+        # given
+        plan = Plan('test-org')
+        plan.add('install', self._repo)
+        plan.add(
+            'add_config', self._repo,
+            package_manager='pip', directory='/'
+        )
+
+        # when
+        estimate = plan.estimate(self._rate_limit, 0.5, 1)
+
+        # then
+        assert estimate['requests'] == {
+            'github': 1, 'dependabot': 1, 'total': 2
+        }
+        assert estimate['seconds'] == 1
+
+    def test_rate_limit_wait(self):
+        rate_limit = {'limit': 5000, 'remaining': 100, 'reset': 1600}
+        assert rate_limit_wait(100, rate_limit, 1000) == 0
+        assert rate_limit_wait(101, rate_limit, 1000) == 600
+        assert rate_limit_wait(5100, rate_limit, 1000) == 600
+        assert rate_limit_wait(5101, rate_limit, 1000) == 4200
+
+    def test_save_and_load(self):
+        # given
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'plan.json')
+        plan = Plan('test-org')
+        plan.add('remove', Repository(2, 'repo-b', False, True))
+        plan.add('install', self._repo)
+
+        # when
+        plan.save(path, plan.estimate(self._rate_limit, 0.5, 1))
+        loaded = Plan.load(path)
+
+        # then
+        assert loaded.org_name == 'test-org'
+        assert [action['repo_name'] for action in loaded.actions] == [
+            'repo-a', 'repo-b'
+        ]
+        with open(path) as f:
+            assert json.load(f)['estimate']['requests']['total'] == 2
+
+    def test_save_orders_actions_per_repo(self):
+        # given
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'plan.json')
+        repo_b = Repository(2, 'repo-b', False, True)
+        plan = Plan('test-org')
+        plan.add('remove_config', repo_b, package_manager='pip', config_id=1)
+        plan.add('remove', repo_b)
+        plan.add('add_config', self._repo, package_manager='pip')
+        plan.add('add_config', self._repo, package_manager='docker')
+        plan.add('install', self._repo)
+
+        # when
+        plan.save(path, plan.estimate(self._rate_limit, 0.5, 1))
+
+        # then
+        assert [
+            (action['repo_name'], action['action'],
+             action.get('package_manager'))
+            for action in Plan.load(path).actions
+        ] == [
+            ('repo-a', 'install', None),
+            ('repo-a', 'add_config', 'pip'),
+            ('repo-a', 'add_config', 'docker'),
+            ('repo-b', 'remove_config', 'pip'),
+            ('repo-b', 'remove', None)
+        ]
+
+    @patch.dict('os.environ', {'GITHUB_TOKEN': 'abcdef'})
+    def test_planning_dependabot_records_configs(self):
+        # given
+        dependabot = PlanningDependabot('4444', Mock())
+        dependabot.plan = Plan('test-org')
+
+        # when
+        dependabot.add_configs_to_dependabot(self._repo, ['Dockerfile'])
+
+        # then
+        assert dependabot.plan.actions == [
+            {
+                'action': 'add_config',
+                'repo_id': 1,
+                'repo_name': 'repo-a',
+                'package_manager': 'docker',
+                'directory': '/'
+            }
+        ]
+
+    def test_apply_plan(self):
+        # given
+        app = Mock()
+        app.org_name = 'test-org'
+        app.app_id = '123'
+        plan = Plan('test-org')
+        plan.add('install', self._repo)
+        plan.add('remove', self._repo)
+        plan.add(
+            'add_config', self._repo,
+            package_manager='pip', directory='/'
+        )
+        plan.add(
+            'remove_config', self._repo,
+            package_manager='npm_and_yarn', config_id='11'
+        )
+
+        # when
+        apply_plan(app, plan, 1)
+
+        # then
+        app.install_app_on_repo.assert_called_once_with('123', self._repo)
+        app.remove_app_on_repo.assert_called_once_with('123', self._repo)
+        app.dependabot.add_config.assert_called_once_with(
+            self._repo, 'pip', '/'
+        )
+        app.dependabot.remove_config.assert_called_once_with(
+            ANY, 'npm_and_yarn', '11'
+        )
+
+    def test_apply_plan_runs_each_repos_actions_in_order(self):
+        # given
+        calls = []
+        app = Mock()
+        app.org_name = 'test-org'
+        app.install_app_on_repo.side_effect = (
+            lambda app_id, repo: calls.append((repo.name, 'install'))
+        )
+        app.dependabot.add_config.side_effect = (
+            lambda repo, *args: calls.append((repo.name, 'add_config'))
+        )
+        plan = Plan('test-org')
+        for repo in (self._repo, Repository(2, 'repo-b', False, True)):
+            plan.add('add_config', repo, package_manager='pip', directory='/')
+            plan.add('install', repo)
+
+        # when
+        apply_plan(app, plan, 4)
+
+        # then
+        for repo_name in ('repo-a', 'repo-b'):
+            assert [
+                action for name, action in calls if name == repo_name
+            ] == ['install', 'add_config']
+
+    def test_apply_plan_for_other_org(self):
+        # given
+        app = Mock()
+        app.org_name = 'test-org'
+        plan = Plan('other-org')
+        plan.add('install', self._repo)
+
+        # when
+        apply_plan(app, plan, 1)
+
+        # then
+        app.on_error.assert_called_once_with(
+            'Plan is for org other-org, not test-org'
+        )
+        app.install_app_on_repo.assert_not_called()
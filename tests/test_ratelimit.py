@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+from dependabot_access.ratelimit import RateLimitAdapter, RateLimiter
+
+
+def make_request(url='https://api.github.com/repos/org/repo'):
+    return requests.Request(
+        'GET', url, headers={'Authorization': 'token abc'}
+    ).prepare()
+
+
+def make_response(status_code, headers=None, text=''):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = text.encode()
+    return response
+
+
+class TestRateLimit(unittest.TestCase):
+
+    def setUp(self):
+        self._sleep = Mock()
+        self._limiter = RateLimiter(
+            100, clock=lambda: 1000, sleep=self._sleep
+        )
+
+    def test_does_not_pace_with_budget_left(self):
+        # given
+        self._limiter.update(make_request(), make_response(200, {
+            'X-RateLimit-Remaining': '4000',
+            'X-RateLimit-Reset': '2000'
+        }))
+
+        # when
+        self._limiter.wait(make_request())
+
+        # then
+        self._sleep.assert_not_called()
+
+    def test_paces_when_budget_low(self):
+        # given
+        self._limiter.update(make_request(), make_response(200, {
+            'X-RateLimit-Remaining': '10',
+            'X-RateLimit-Reset': '2000'
+        }))
+
+        # when
+        self._limiter.wait(make_request())
+
+        # then
+        self._sleep.assert_called_once_with(100)
+
+    def test_concurrent_callers_reserve_successive_slots(self):
+        # given
+        self._limiter.update(make_request(), make_response(200, {
+            'X-RateLimit-Remaining': '10',
+            'X-RateLimit-Reset': '2000'
+        }))
+
+        # when
+        self._limiter.wait(make_request())
+        self._limiter.wait(make_request())
+
+        # then
+        delays = [c.args[0] for c in self._sleep.call_args_list]
+        assert delays[0] == 100
+        self.assertAlmostEqual(delays[1], 100 + 1000 / 9)
+
+    def test_new_budget_window_clears_reserved_slots(self):
+        # given
+        for _ in range(2):
+            self._limiter.update(make_request(), make_response(200, {
+                'X-RateLimit-Remaining': '10',
+                'X-RateLimit-Reset': '2000'
+            }))
+            self._limiter.wait(make_request())
+        self._limiter.update(make_request(), make_response(200, {
+            'X-RateLimit-Remaining': '10',
+            'X-RateLimit-Reset': '3000'
+        }))
+
+        # when
+        self._limiter.wait(make_request())
+
+        # then
+        assert self._sleep.call_args.args[0] == 200
+
+    def test_budgets_are_per_host(self):
+        # given
+        self._limiter.update(make_request(), make_response(200, {
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': '2000'
+        }))
+
+        # when
+        self._limiter.wait(
+            make_request('https://api.dependabot.com/update_configs')
+        )
+
+        # then
+        self._sleep.assert_not_called()
+
+    def test_retry_delay(self):
+        assert self._limiter.retry_delay(make_response(200)) is None
+        assert self._limiter.retry_delay(make_response(403)) is None
+        assert self._limiter.retry_delay(
+            make_response(429, {'Retry-After': '30'})
+        ) == 30
+        assert self._limiter.retry_delay(make_response(403, {
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': '1500'
+        })) == 501
+        assert self._limiter.retry_delay(make_response(
+            403, text='You have exceeded a secondary rate limit'
+        )) == 60
+
+    def test_adapter_waits_and_resends(self):
+        # given
+        adapter = Mock()
+        adapter.send.side_effect = [
+            make_response(403, {'Retry-After': '5'}),
+            make_response(200)
+        ]
+        rate_limit_adapter = RateLimitAdapter(adapter, self._limiter)
+
+        # when
+        response = rate_limit_adapter.send(make_request())
+
+        # then
+        assert response.status_code == 200
+        assert adapter.send.call_count == 2
+        self._sleep.assert_called_once_with(5)
+
+    def test_adapter_gives_up_after_max_waits(self):
+        # given
+        adapter = Mock()
+        adapter.send.return_value = make_response(429, {'Retry-After': '1'})
+        rate_limit_adapter = RateLimitAdapter(
+            adapter, self._limiter, max_waits=2
+        )
+
+        # when
+        response = rate_limit_adapter.send(make_request())
+
+        # then
+        assert response.status_code == 429
+        assert adapter.send.call_count == 3
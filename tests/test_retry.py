@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+
+from urllib3.exceptions import MaxRetryError
+from urllib3.response import HTTPResponse
+
+from dependabot_access.retry import RetryStats, build_retry
+
+
+class TestRetry(unittest.TestCase):
+
+    def setUp(self):
+        self._stats = RetryStats()
+        self._retry = build_retry(2, 0.5, 30, 0.5, self._stats)
+
+    def test_retries_transient_statuses(self):
+        assert self._retry.is_retry('GET', 503)
+        assert self._retry.is_retry('PUT', 502)
+        assert self._retry.is_retry('DELETE', 500)
+        assert self._retry.is_retry('POST', 429)
+        assert not self._retry.is_retry('GET', 404)
+
+    @patch('dependabot_access.retry.logger')
+    def test_counts_and_logs_retries(self, logger):
+        # given
+        response = HTTPResponse(status=503)
+
+        # when
+        retry = self._retry.increment(
+            'GET', '/repos/org/repo', response=response
+        )
+        retry = retry.increment('GET', '/repos/org/repo', response=response)
+
+        # then
+        assert self._stats.count == 2
+        assert retry.stats is self._stats
+        logger.warning.assert_called_with(
+            'Retrying GET /repos/org/repo after status 503 (attempt 3)'
+        )
+
+    def test_does_not_count_exhausted_retries(self):
+        # given
+        response = HTTPResponse(status=503)
+        retry = self._retry.increment('GET', '/', response=response)
+        retry = retry.increment('GET', '/', response=response)
+
+        # when then
+        with self.assertRaises(MaxRetryError):
+            retry.increment('GET', '/', response=response)
+        assert self._stats.count == 2
+
+    def test_backoff_is_capped(self):
+        # given
+        retry = build_retry(10, 1, 4, 0, self._stats)
+        response = HTTPResponse(status=503)
+
+        # when
+        for _ in range(5):
+            retry = retry.increment('GET', '/', response=response)
+
+        # then
+        assert retry.get_backoff_time() == 4
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+
+from dependabot_access.rules import PackageManagerRules, load_rules
+
+
+class TestRules(unittest.TestCase):
+
+    def setUp(self):
+        self._rules = PackageManagerRules([
+            ('Dockerfile', 'docker'),
+            ('*.gemspec', 'bundler'),
+            ('*.csproj', 'nuget'),
+            ('Dockerfile.*', 'docker'),
+            ('requirements-*.txt', 'pip')
+        ])
+
+    def test_exact_match(self):
+        assert self._rules.classify(['Dockerfile', 'README.md']) == {
+            'docker'
+        }
+
+    def test_suffix_match(self):
+        assert self._rules.classify(['foo.gemspec', 'Bar.csproj']) == {
+            'bundler', 'nuget'
+        }
+
+    def test_glob_match(self):
+        assert self._rules.classify(
+            ['Dockerfile.test', 'requirements-dev.txt']
+        ) == {'docker', 'pip'}
+
+    def test_no_match(self):
+        assert self._rules.classify(['gemspec', 'requirements.txt']) == set()
+        assert PackageManagerRules([]).classify(['Dockerfile']) == set()
+
+    def test_load_rules(self):
+        # given
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'rules.json')
+        with open(path, 'w') as f:
+            json.dump([{'pattern': '*.csproj', 'package-manager': 'nuget'}], f)
+
+        # when then
+        assert load_rules(path) == [('*.csproj', 'nuget')]
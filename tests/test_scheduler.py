@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+
+from dependabot_access.repository import Repository
+from dependabot_access.scheduler import Deadline, prioritize
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_prioritize(self):
+        # given
+        work = [
+            ('fine', True), ('pushed', True), ('changed', True),
+            ('failed', True), ('new', True), ('fine-too', True)
+        ]
+        state_repos = {
+            'fine': {'dependabot': True, 'pushed_at': 't1'},
+            'fine-too': {'dependabot': True, 'pushed_at': 't1'},
+            'pushed': {'dependabot': True, 'pushed_at': 't1'},
+            'changed': {'dependabot': False, 'pushed_at': 't1'},
+            'failed': {'dependabot': True, 'pushed_at': 't1', 'failed': True}
+        }
+        repos = {
+            'pushed': Repository(1, 'pushed', False, True, 't2'),
+            'fine': Repository(2, 'fine', False, True, 't1')
+        }
+
+        # when
+        ordered = prioritize(work, state_repos, repos)
+
+        # then
+        assert [repo_name for repo_name, _ in ordered] == [
+            'new', 'failed', 'changed', 'pushed', 'fine', 'fine-too'
+        ]
+
+    def test_prioritize_missed_repos(self):
+        # given
+        work = [('done', True), ('changed', True), ('missed', True)]
+        state_repos = {
+            'done': {'dependabot': True, 'pushed_at': 't1'},
+            'changed': {'dependabot': False, 'pushed_at': 't1'},
+            'missed': {'dependabot': True, 'pushed_at': 't1', 'missed': True}
+        }
+
+        # when
+        ordered = prioritize(work, state_repos, {})
+
+        # then
+        assert [repo_name for repo_name, _ in ordered] == [
+            'missed', 'changed', 'done'
+        ]
+
+    def test_prioritize_keeps_order_without_state(self):
+        # given
+        work = [('repo-b', True), ('repo-a', False), ('repo-c', True)]
+
+        # when
+        ordered = prioritize(work, {}, {})
+
+        # then
+        assert ordered == work
+
+    def test_prioritize_prefers_recent_pushes(self):
+        # given
+        work = [('repo-a', True), ('repo-b', True)]
+        repos = {
+            'repo-a': Repository(1, 'repo-a', False, True,
+                                 '2020-01-01T00:00:00Z'),
+            'repo-b': Repository(2, 'repo-b', False, True,
+                                 '2021-01-01T00:00:00Z')
+        }
+
+        # when
+        ordered = prioritize(work, {}, repos)
+
+        # then
+        assert ordered == [('repo-b', True), ('repo-a', True)]
+
+    def test_deadline(self):
+        # given
+        now = [100.0]
+        deadline = Deadline(10, clock=lambda: now[0])
+        unlimited = Deadline()
+
+        # when
+        before = deadline.expired()
+        now[0] = 110
+        after = deadline.expired()
+
+        # then
+        assert not before
+        assert after
+        assert not unlimited.expired()
+
+    @patch('dependabot_access.scheduler.logger')
+    def test_deadline_reports_missed_repos(self, logger):
+        # given
+        deadline = Deadline(0)
+
+        # when
+        deadline.miss('repo-a')
+        deadline.miss('repo-b')
+        deadline.report()
+
+        # then
+        logger.warning.assert_called_once_with(
+            'Deadline reached, 2 repos were not reconciled'
+        )
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from dependabot_access.repository import Repository
+from dependabot_access.state import State
+
+
+class TestState(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._path = os.path.join(directory.name, 'state.json')
+        self._repo = Repository(1, 'Repo-A', False, True, '2021-01-01')
+
+    def test_unknown_repo_is_not_current(self):
+        assert not State(self._path).is_current('Repo-A', self._repo, True)
+
+    def test_recorded_repo_is_current_after_reload(self):
+        # given
+        state = State(self._path)
+        state.record('Repo-A', self._repo, True, {'pip', 'docker'})
+
+        # when
+        state.save()
+        reloaded = State(self._path)
+
+        # then
+        assert reloaded.is_current('repo-a', self._repo, True)
+        assert reloaded.repos['repo-a']['package_managers'] == [
+            'docker', 'pip'
+        ]
+
+    def test_changes_are_not_current(self):
+        # given
+        state = State(self._path)
+        state.record('Repo-A', self._repo, True)
+
+        # when then
+        assert not state.is_current('Repo-A', self._repo, False)
+        assert not state.is_current(
+            'Repo-A', Repository(1, 'Repo-A', False, True, '2021-02-01'), True
+        )
+        assert not state.is_current(
+            'Repo-A', Repository(1, 'Repo-A', False, True), True
+        )
+
+    def test_full_run_is_never_current(self):
+        # given
+        state = State(self._path, full=True)
+        state.record('Repo-A', self._repo, True)
+
+        # when then
+        assert not state.is_current('Repo-A', self._repo, True)
+
+    def test_failed_repo_is_not_current(self):
+        # given
+        errors = Mock()
+        errors.has_failed.return_value = True
+        state = State(self._path, errors=errors)
+        state.record('Repo-A', self._repo, True)
+
+        # when then
+        errors.has_failed.assert_called_once_with('Repo-A')
+        assert not state.is_current('Repo-A', self._repo, True)
+
+    def test_record_missed(self):
+        # given
+        state = State(self._path)
+        state.record('Repo-A', self._repo, True)
+
+        # when
+        state.record_missed('repo-a')
+        state.record_missed('repo-b')
+
+        # then
+        assert state.repos['repo-a']['missed']
+        assert 'repo-b' not in state.repos
+        state.record('Repo-A', self._repo, True)
+        assert 'missed' not in state.repos['repo-a']
+
+    def test_forgotten_repo_is_not_current(self):
+        # given
+        state = State(self._path)
+        state.record('Repo-A', self._repo, True)
+
+        # when
+        state.forget('repo-a')
+
+        # then
+        assert not state.is_current('Repo-A', self._repo, True)
+
+    def test_without_path_nothing_is_recorded(self):
+        # given
+        state = State()
+
+        # when
+        state.record('Repo-A', self._repo, True)
+        state.save()
+
+        # then
+        assert state.repos == {}
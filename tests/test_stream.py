@@ -0,0 +1,86 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from dependabot_access.stream import JSONArrayReader, stream_access
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self._config = [
+            {'repos': ['repo-a', 'repo-b'], 'apps': {'dependabot': True}},
+            {'repos': ['repo-c'], 'description': 'a [tricky], "string"'},
+            12345,
+            []
+        ]
+
+    def test_reads_items_across_chunk_boundaries(self):
+        for chunk_size in (1, 2, 7, 1024):
+            reader = JSONArrayReader(
+                io.StringIO(json.dumps(self._config, indent=2)), chunk_size
+            )
+            assert list(reader) == self._config
+
+    def test_reads_items_lazily(self):
+        # given
+        f = io.StringIO(json.dumps(self._config))
+        reader = iter(JSONArrayReader(f, 16))
+
+        # when
+        first = next(reader)
+
+        # then
+        assert first == self._config[0]
+        assert f.tell() < len(json.dumps(self._config))
+
+    def test_large_value_is_decoded_a_few_times(self):
+        # given
+        value = {'repos': [f'repo-{index:06d}' for index in range(20000)]}
+        reader = JSONArrayReader(io.StringIO(json.dumps([value])), 1024)
+        decode = reader.decode
+        decodes = []
+
+        def counting_decode():
+            decodes.append(len(reader.buffer))
+            return decode()
+
+        reader.decode = counting_decode
+
+        # when
+        values = list(reader)
+
+        # then
+        assert values == [value]
+        assert len(decodes) < 20
+
+    def test_empty_array(self):
+        assert list(JSONArrayReader(io.StringIO(' [ ] '))) == []
+
+    def test_invalid_json(self):
+        with self.assertRaises(ValueError):
+            list(JSONArrayReader(io.StringIO('{"repos": []}')))
+        with self.assertRaises(ValueError):
+            list(JSONArrayReader(io.StringIO('[{"repos": [}]')))
+        with self.assertRaises(ValueError):
+            list(JSONArrayReader(io.StringIO('[{"repos": []}')))
+
+    def test_stream_access_json_lines(self):
+        # given
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'access.jsonl')
+        with open(path, 'w') as f:
+            f.write('{"repos": ["repo-a"]}\n\n{"repos": ["repo-b"]}\n')
+
+        # when then
+        assert list(stream_access(path)) == [
+            {'repos': ['repo-a']}, {'repos': ['repo-b']}
+        ]
+
+    def test_stream_access_json(self):
+        assert list(
+            stream_access(f'{os.getcwd()}/tests/fixtures/access.json')
+        )[0]['repos'] == ['Repo-A', 'Repo-B', 'Repo-C']
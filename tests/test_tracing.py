@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from dependabot_access.access import App
+from dependabot_access.dependabot import Dependabot
+from dependabot_access.logs import repo_context
+from dependabot_access.repository import Repository
+from dependabot_access.tracing import (
+    NOOP_SPAN, JSONLinesExporter, OTLPExporter, Tracer, TracingAdapter
+)
+
+
+class TestTracing(unittest.TestCase):
+
+    def test_disabled_tracer_returns_noop_span(self):
+        # given
+        tracer = Tracer()
+
+        # when
+        with tracer.span('enforce_app_access') as span:
+            span.set_attribute('package_managers', {'pip'})
+
+        # then
+        assert span is NOOP_SPAN
+
+    def test_nested_spans_share_trace(self):
+        # given
+        exporter = Mock()
+        tracer = Tracer(exporter)
+
+        # when
+        with repo_context('repo-a'):
+            with tracer.span('enforce_app_access') as parent:
+                with tracer.span('add_config', package_manager='pip'):
+                    pass
+
+        # then
+        child = exporter.export.call_args_list[0][0][0]
+        assert exporter.export.call_args_list[1][0][0] is parent
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert parent.parent_id is None
+        assert child.attributes == {
+            'package_manager': 'pip', 'repo': 'repo-a'
+        }
+        assert parent.end_time >= parent.start_time
+
+    def test_span_records_errors(self):
+        # given
+        exporter = Mock()
+        tracer = Tracer(exporter)
+
+        # when
+        with self.assertRaises(ValueError):
+            with tracer.span('enforce_app_access'):
+                raise ValueError('boom')
+
+        # then
+        span = exporter.export.call_args[0][0]
+        assert span.error == 'ValueError: boom'
+
+    def test_tracing_adapter_records_status(self):
+        # given
+        exporter = Mock()
+        adapter = Mock()
+        adapter.send.return_value.status_code = 204
+        request = Mock()
+        request.method = 'PUT'
+        request.url = (
+            'https://api.github.com/user/installations/1/repositories/2'
+        )
+
+        # when
+        TracingAdapter(adapter, Tracer(exporter)).send(request)
+
+        # then
+        span = exporter.export.call_args[0][0]
+        assert span.name == 'PUT /user/installations/{app}/repositories/{repo}'
+        assert span.attributes['http.status_code'] == 204
+
+    def test_json_lines_exporter(self):
+        # given
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.jsonl')
+            tracer = Tracer(JSONLinesExporter(path))
+
+            # when
+            with tracer.span('cease_app_access', repo='repo-a'):
+                pass
+            tracer.shutdown()
+
+            # then
+            with open(path) as f:
+                spans = [json.loads(line) for line in f]
+        assert len(spans) == 1
+        assert spans[0]['name'] == 'cease_app_access'
+        assert spans[0]['attributes'] == {'repo': 'repo-a'}
+
+    @patch('dependabot_access.dependabot.Dependabot.add_config')
+    @patch('dependabot_access.access.App.get_repo_contents')
+    @patch('dependabot_access.access.App.install_app_on_repo')
+    @patch('dependabot_access.access.App.get_github_repo')
+    def test_enforce_span_exported_as_json_lines(
+        self, get_github_repo, install_app_on_repo, get_repo_contents,
+        add_config
+    ):
+        # given
+        get_github_repo.return_value = Repository(1, 'repo-a', False, True)
+        get_repo_contents.return_value = ['package.json', 'requirements.txt']
+        dependabot = Dependabot('1', Mock(), 'token')
+        app = App('org', 'token', '1', '1', Mock(), dependabot)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.jsonl')
+            app.tracer = dependabot.tracer = Tracer(JSONLinesExporter(path))
+
+            # when
+            app.enforce_app_access('repo-a')
+            app.tracer.shutdown()
+
+            # then
+            with open(path) as f:
+                spans = [json.loads(line) for line in f]
+        assert spans[-1]['name'] == 'enforce_app_access'
+        assert spans[-1]['attributes']['package_managers'] == [
+            'npm_and_yarn:/', 'pip:/'
+        ]
+
+    def test_otlp_exporter_sends_batches(self):
+        # given
+        session = Mock()
+        exporter = OTLPExporter(
+            'http://collector:4318/', batch_size=2, session=session
+        )
+        tracer = Tracer(exporter)
+
+        # when
+        for package_managers in ({'pip'}, {'npm_and_yarn'}, set()):
+            with tracer.span('enforce_app_access') as span:
+                span.set_attribute('package_managers', package_managers)
+        tracer.shutdown()
+
+        # then
+        assert session.post.call_count == 2
+        url = session.post.call_args_list[0][0][0]
+        payload = session.post.call_args_list[0][1]['json']
+        spans = payload['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert url == 'http://collector:4318/v1/traces'
+        assert len(spans) == 2
+        assert {
+            'key': 'package_managers',
+            'value': {'arrayValue': {'values': [{'stringValue': 'pip'}]}}
+        } in spans[0]['attributes']
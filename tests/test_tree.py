@@ -0,0 +1,38 @@
+import unittest
+
+from dependabot_access.tree import TreeScan
+
+
+class TestTree(unittest.TestCase):
+
+    def test_group(self):
+        # given
+        tree_scan = TreeScan(2)
+
+        # when
+        files_by_directory = tree_scan.group([
+            'Dockerfile',
+            'backend/requirements.txt',
+            'backend/setup.py',
+            'frontend/app/package.json',
+            'a/b/c/pom.xml'
+        ])
+
+        # then
+        assert files_by_directory == {
+            '/': ['Dockerfile'],
+            '/backend': ['requirements.txt', 'setup.py'],
+            '/frontend/app': ['package.json']
+        }
+
+    def test_excludes_directories_and_their_children(self):
+        # given
+        tree_scan = TreeScan(5, ['node_modules', 'docs/*'])
+
+        # then
+        assert tree_scan.includes_directory('')
+        assert tree_scan.includes_directory('web')
+        assert not tree_scan.includes_directory('node_modules')
+        assert not tree_scan.includes_directory('web/node_modules/left-pad')
+        assert not tree_scan.includes_directory('docs/examples')
+        assert tree_scan.includes_directory('docs')
@@ -0,0 +1,270 @@
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest.mock import Mock
+
+import requests
+
+from dependabot_access.compiler import compile_access
+from dependabot_access.dependabot import Dependabot
+from dependabot_access.webhook import (
+    Debouncer, WebhookDaemon, WebhookHandler, verify_signature
+)
+
+
+def sign(secret, body):
+    return 'sha256=' + hmac.new(
+        secret.encode(), body, hashlib.sha256
+    ).hexdigest()
+
+
+class TestWebhook(unittest.TestCase):
+
+    def setUp(self):
+        self._now = [0.0]
+        self._app = Mock()
+        self._app.dependabot = Dependabot(None, None, 'token')
+        self._app.tree_scan = None
+        self._app.compile.side_effect = compile_access
+        self._access = [
+            {'repos': ['Repo-A'], 'apps': {'dependabot': True}},
+            {'repos': ['repo-b'], 'apps': {}}
+        ]
+        self._directory = tempfile.TemporaryDirectory()
+        self._access_path = os.path.join(self._directory.name, 'access.json')
+        self.write_access()
+        self._daemon = WebhookDaemon(
+            self._app, lambda: self._access, self._access_path, 'secret',
+            Debouncer(5, clock=lambda: self._now[0])
+        )
+        self._daemon.reload_access()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def write_access(self):
+        with open(self._access_path, 'w') as f:
+            json.dump(self._access, f)
+
+    def test_verify_signature(self):
+        assert verify_signature('secret', b'{}', sign('secret', b'{}'))
+        assert not verify_signature('secret', b'{}', sign('other', b'{}'))
+        assert not verify_signature('secret', b'{}', None)
+
+    def test_repository_created(self):
+        # when
+        repo_names = self._daemon.handle_delivery('repository', {
+            'action': 'created', 'repository': {'name': 'Repo-A'}
+        })
+
+        # then
+        assert repo_names == ['Repo-A']
+
+    def test_push_touching_manifests_on_default_branch(self):
+        # given
+        payload = {
+            'ref': 'refs/heads/main',
+            'repository': {'name': 'repo-a', 'default_branch': 'main'},
+            'commits': [{'added': ['package.json'], 'modified': ['a.py']}]
+        }
+
+        # when
+        repo_names = self._daemon.handle_delivery('push', payload)
+
+        # then
+        assert repo_names == ['repo-a']
+
+    def test_push_ignored(self):
+        # given
+        repository = {'name': 'repo-a', 'default_branch': 'main'}
+
+        # when
+        other_branch = self._daemon.handle_delivery('push', {
+            'ref': 'refs/heads/feature', 'repository': repository,
+            'commits': [{'added': ['package.json']}]
+        })
+        no_manifests = self._daemon.handle_delivery('push', {
+            'ref': 'refs/heads/main', 'repository': repository,
+            'commits': [{'modified': ['README.md', 'app/package.json']}]
+        })
+
+        # then
+        assert other_branch == []
+        assert no_manifests == []
+
+    def test_installation_repositories(self):
+        # when
+        repo_names = self._daemon.handle_delivery(
+            'installation_repositories', {
+                'repositories_added': [{'name': 'repo-a'}],
+                'repositories_removed': [{'name': 'repo-b'}]
+            }
+        )
+
+        # then
+        assert repo_names == ['repo-a', 'repo-b']
+
+    def test_debounces_bursts(self):
+        # given
+        debouncer = Debouncer(5, 12, clock=lambda: self._now[0])
+
+        # when
+        debouncer.add('repo-a')
+        self._now[0] = 4
+        debouncer.add('repo-a')
+        due_early = debouncer.pop_due()
+        self._now[0] = 9
+        due = debouncer.pop_due()
+        debouncer.add('repo-b')
+        for now in (13, 17, 21):
+            self._now[0] = now
+            debouncer.add('repo-b')
+        due_capped = debouncer.pop_due()
+
+        # then
+        assert due_early == []
+        assert due == ['repo-a']
+        assert due_capped == ['repo-b']
+
+    def test_tick_reconciles_due_repos_in_access_file(self):
+        # given
+        self._daemon.handle_delivery('installation_repositories', {
+            'repositories_removed': [{'name': 'repo-a'}, {'name': 'repo-c'}]
+        })
+
+        # when
+        self._daemon.tick()
+        self._now[0] = 6
+        self._daemon.tick()
+
+        # then
+        self._app.reconcile.assert_called_once_with('Repo-A', True)
+        self._app.state.save.assert_called_once_with()
+
+    def test_reconcile_bypasses_state_and_earlier_failures(self):
+        # given
+        self._daemon.handle_delivery('installation_repositories', {
+            'repositories_removed': [{'name': 'repo-a'}]
+        })
+
+        # when
+        self._now[0] = 6
+        self._daemon.tick()
+
+        # then
+        self._app.state.forget.assert_called_once_with('Repo-A')
+        self._app.on_error.reset.assert_called_once_with('Repo-A')
+        self._app.reconcile.assert_called_once_with('Repo-A', True)
+
+    def test_tick_reports_unexpected_reconcile_errors(self):
+        # given
+        self._app.reconcile.side_effect = KeyError('permissions')
+        self._daemon.handle_delivery('repository', {
+            'action': 'created', 'repository': {'name': 'repo-a'}
+        })
+
+        # when
+        self._now[0] = 6
+        self._daemon.tick()
+
+        # then
+        self._app.on_error.assert_called_once_with(
+            "Failed to reconcile Repo-A: 'permissions'"
+        )
+        self._app.state.save.assert_called_once_with()
+
+    def test_tick_keeps_access_when_reload_fails(self):
+        # given
+        with open(self._access_path, 'w') as f:
+            f.write('[{"repos": [')
+        os.utime(self._access_path, (0, 0))
+
+        def load_access():
+            with open(self._access_path) as f:
+                return json.load(f)
+
+        self._daemon.load_access = load_access
+        desired = self._daemon.desired
+
+        # when
+        self._daemon.tick()
+
+        # then
+        assert self._daemon.desired == desired
+
+    def test_tick_reconciles_repos_changed_in_access_file(self):
+        # given
+        self._access = [
+            {'repos': ['Repo-A', 'repo-b'], 'apps': {'dependabot': True}}
+        ]
+        self.write_access()
+        os.utime(self._access_path, (0, 0))
+
+        # when
+        self._now[0] = 6
+        self._daemon.tick()
+        self._now[0] = 12
+        self._daemon.tick()
+
+        # then
+        self._app.reconcile.assert_called_once_with('repo-b', True)
+
+    def test_handler_checks_signature(self):
+        # given
+        server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+        server.webhooks = self._daemon
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/'
+        body = json.dumps({
+            'action': 'unarchived', 'repository': {'name': 'repo-a'}
+        }).encode()
+
+        # when
+        try:
+            rejected = requests.post(url, data=body, headers={
+                'X-GitHub-Event': 'repository',
+                'X-Hub-Signature-256': sign('other', body)
+            })
+            accepted = requests.post(url, data=body, headers={
+                'X-GitHub-Event': 'repository',
+                'X-Hub-Signature-256': sign('secret', body)
+            })
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # then
+        assert rejected.status_code == 401
+        assert accepted.status_code == 202
+        assert self._daemon.debouncer.pending == {'repo-a': (0.0, 0.0)}
+
+    def test_handler_rejects_bad_bodies(self):
+        # given
+        server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+        server.webhooks = self._daemon
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/'
+
+        def post(body):
+            return requests.post(url, data=body, headers={
+                'X-GitHub-Event': 'repository',
+                'X-Hub-Signature-256': sign('secret', body)
+            })
+
+        # when
+        try:
+            invalid = post(b'{"action": ')
+            unexpected = post(json.dumps({'action': 'created'}).encode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # then
+        assert invalid.status_code == 400
+        assert unexpected.status_code == 400
+        assert self._daemon.debouncer.pending == {}
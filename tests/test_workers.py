@@ -0,0 +1,66 @@
+import threading
+import unittest
+
+from dependabot_access.workers import run_bounded
+
+
+class TestWorkers(unittest.TestCase):
+
+    def test_calls_function_for_every_item(self):
+        # given
+        results = []
+
+        # when
+        run_bounded(results.append, range(10), 3)
+
+        # then
+        assert sorted(results) == list(range(10))
+
+    def test_pulls_items_lazily(self):
+        # given
+        done = []
+        in_flight = []
+
+        def items():
+            for item in range(20):
+                in_flight.append(item - len(done))
+                yield item
+
+        # when
+        run_bounded(done.append, items(), 2)
+
+        # then
+        assert len(done) == 20
+        assert max(in_flight) <= 5
+
+    def test_raises_first_error_and_stops(self):
+        # given
+        calls = []
+
+        def fail(item):
+            calls.append(item)
+            raise ValueError(item)
+
+        # when then
+        with self.assertRaises(ValueError):
+            run_bounded(fail, range(100), 1)
+        assert len(calls) < 100
+
+    def test_slow_item_does_not_hold_up_the_rest(self):
+        # given
+        others_done = threading.Event()
+        done = []
+
+        def work(item):
+            if item == 0:
+                others_done.wait(5)
+            done.append(item)
+            if len(done) == 19:
+                others_done.set()
+
+        # when
+        run_bounded(work, range(20), 2)
+
+        # then
+        assert done[-1] == 0
+        assert others_done.is_set()